@@ -1,4 +1,4 @@
-import requests
+from src.http_cache import openalex_cache
 import json
 
 ids = "S204847658|S37844757|S93121129|S55737203|S32061424|S70708404|S137773608|S183584863|S64187185|S48977010|S4210188283|S4387286383|S196734849|S141808269|S17729819|S80591372|S86852077"
@@ -12,7 +12,7 @@ print(f"Resolving {len(id_list)} journals by ID and {len(issns)} by ISSN...")
 for source_id in id_list:
     url = f"https://api.openalex.org/sources/{source_id}"
     try:
-        response = requests.get(url)
+        response = openalex_cache.get(url)
         if response.status_code == 200:
             data = response.json()
             print(f"- {data.get('display_name')} ({source_id})")
@@ -24,7 +24,7 @@ for source_id in id_list:
 for issn in issns:
     url = f"https://api.openalex.org/sources/issn:{issn}"
     try:
-        response = requests.get(url)
+        response = openalex_cache.get(url)
         if response.status_code == 200:
             data = response.json()
             print(f"- {data.get('display_name')} (ISSN: {issn})")
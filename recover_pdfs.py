@@ -31,6 +31,8 @@ def recover_missing_elsevier_pdfs():
     
     recovered_count = 0
     synthesized_count = 0
+    # (paper, pdf_path) to re-synthesize; their texts are extracted in bulk afterwards
+    to_synthesize = []
     
     for row in rows:
         doi = row['doi']
@@ -82,13 +84,18 @@ def recover_missing_elsevier_pdfs():
                 logger.warning(f"Could not fetch metadata for {doi}. Using database fields.")
                 paper = temp_paper
 
+            to_synthesize.append((paper, pdf_path))
+
+    # Extraction is spread across processes (and reuses cached texts); each summary is
+    # synthesized as soon as its text is ready
+    texts = extractor.extract_many(pdf_path for _, pdf_path in to_synthesize)
+    for (paper, _), (pdf_path, full_text) in zip(to_synthesize, texts):
+        if full_text:
             logger.info(f"Synthesizing full-text summary for: {paper.title}")
-            full_text = extractor._extract_text(pdf_path)
-            if full_text:
-                if synthesizer.synthesize(paper, full_text, is_full_text=True):
-                    synthesized_count += 1
-            else:
-                logger.warning(f"Could not extract text from recovered PDF: {pdf_path}")
+            if synthesizer.synthesize(paper, full_text, is_full_text=True):
+                synthesized_count += 1
+        else:
+            logger.warning(f"Could not extract text from recovered PDF: {pdf_path}")
 
     logger.info(f"Recovery complete. Recovered {recovered_count} PDFs, regenerated {synthesized_count} summaries.")
     
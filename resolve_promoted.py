@@ -1,4 +1,4 @@
-import requests
+from src.http_cache import openalex_cache
 import sqlite3
 
 DB_PATH = "data/db.sqlite3"
@@ -6,7 +6,7 @@ DB_PATH = "data/db.sqlite3"
 def resolve_id(entity_type, entity_id):
     url = f"https://api.openalex.org/{entity_type}/{entity_id}"
     try:
-        response = requests.get(url)
+        response = openalex_cache.get(url)
         if response.status_code == 200:
             return response.json().get('display_name')
     except:
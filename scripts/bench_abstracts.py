@@ -0,0 +1,68 @@
+"""
+Micro-benchmark: abstract reconstruction from OpenAlex inverted indexes, the former
+sort-based implementation vs the position-indexed list (per work and per page).
+
+The indexes are shaped like real abstracts: 120-350 words drawn from a Zipf-distributed
+vocabulary, so frequent words ("the", "of", ...) have many positions and most have one.
+
+Usage: uv run scripts/bench_abstracts.py [--works 5000] [--page 200]
+"""
+import argparse
+import random
+import sys
+import timeit
+from pathlib import Path
+
+# Add project root to sys.path to allow imports from src
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from src.discovery import reconstruct_abstract, reconstruct_abstracts
+
+def make_indexes(count: int, seed: int = 1) -> list[dict]:
+    rng = random.Random(seed)
+    vocabulary = [f"word{i}" for i in range(5000)]
+    weights = [1 / (rank + 1) for rank in range(len(vocabulary))]
+    indexes = []
+    for _ in range(count):
+        index = {}
+        for pos, word in enumerate(rng.choices(vocabulary, weights, k=rng.randint(120, 350))):
+            index.setdefault(word, []).append(pos)
+        indexes.append(index)
+    return indexes
+
+def sort_based(inverted_index: dict) -> str:
+    """The former Discovery._reconstruct_abstract."""
+    if not inverted_index:
+        return ""
+    word_positions = []
+    for word, positions in inverted_index.items():
+        for pos in positions:
+            word_positions.append((pos, word))
+    word_positions.sort()
+    return " ".join([wp[1] for wp in word_positions])
+
+def main():
+    parser = argparse.ArgumentParser(description="Abstract reconstruction micro-benchmark")
+    parser.add_argument("--works", type=int, default=5000)
+    parser.add_argument("--page", type=int, default=200, help="Works per results page for the bulk variant")
+    args = parser.parse_args()
+
+    indexes = make_indexes(args.works)
+    pages = [indexes[i:i + args.page] for i in range(0, len(indexes), args.page)]
+    if [sort_based(index) for index in indexes] != [abstract for page in pages for abstract in reconstruct_abstracts(page)]:
+        print("WARNING: the reconstructed abstracts differ.")
+        sys.exit(1)
+
+    runs = {
+        "sort-based": lambda: [sort_based(index) for index in indexes],
+        "position-indexed": lambda: [reconstruct_abstract(index) for index in indexes],
+        "position-indexed, per page": lambda: [reconstruct_abstracts(page) for page in pages],
+    }
+    timings = {name: min(timeit.repeat(run, number=1, repeat=5)) for name, run in runs.items()}
+    baseline = timings["sort-based"]
+    print(f"{args.works} abstracts ({sum(map(len, indexes)) / len(indexes):.0f} distinct words on average)")
+    for name, seconds in timings.items():
+        print(f"{name:28s} {seconds * 1000:8.1f} ms  {seconds / args.works * 1e6:6.1f} us/work  {baseline / seconds:5.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Micro-benchmark: per-query overhead of the 'per-call' and 'persistent' Database modes.
+
+Times is_seen, add_seen and add_event on a temporary database for each mode.
+
+Usage: uv run scripts/bench_db.py [--ops 2000]
+"""
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add project root to sys.path to allow imports from src
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from src.db import Database
+
+def bench_mode(mode: str, ops: int, tmp: Path) -> dict:
+    db = Database(tmp / f"{mode}.sqlite3", mode=mode)
+    timings = {}
+
+    start = time.perf_counter()
+    for i in range(ops):
+        db.add_seen(f"https://doi.org/10.1/{i}", f"Paper {i}", doi=f"10.1/{i}", source_id="S1", author_ids=["A1", "A2"])
+    timings["add_seen"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for i in range(ops):
+        db.is_seen(f"https://doi.org/10.1/{i * 2}", f"10.1/{i * 2}")
+    timings["is_seen"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for i in range(ops):
+        db.add_event("BENCH", f"Event {i}")
+    timings["add_event"] = time.perf_counter() - start
+
+    timings["connections"] = db.connections_opened
+    db.close()
+    return timings
+
+def main():
+    parser = argparse.ArgumentParser(description="Database connection mode micro-benchmark")
+    parser.add_argument("--ops", type=int, default=2000, help="Calls per method")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        results = {mode: bench_mode(mode, args.ops, Path(tmp)) for mode in ("per-call", "persistent")}
+
+    print(f"{'method':<12}{'per-call (us/op)':>20}{'persistent (us/op)':>22}{'speed-up':>10}")
+    for method in ("is_seen", "add_seen", "add_event"):
+        per_call = results["per-call"][method] / args.ops * 1e6
+        persistent = results["persistent"][method] / args.ops * 1e6
+        print(f"{method:<12}{per_call:>20.1f}{persistent:>22.1f}{per_call / persistent:>9.1f}x")
+    print(f"Connections opened: per-call={results['per-call']['connections']}, persistent={results['persistent']['connections']}")
+
+if __name__ == "__main__":
+    main()
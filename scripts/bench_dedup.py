@@ -0,0 +1,68 @@
+"""
+Benchmark: per-paper Database.is_seen vs bulk Database.filter_unseen.
+
+Simulates one discovery page of works going through the dedup point of a run
+(_fetch_openalex checks every page against seen_papers) and reports SQLite connections
+opened and wall-clock time for each approach. Uses a temporary database.
+
+Usage: uv run scripts/bench_dedup.py [--works 200] [--seen 5000]
+"""
+import argparse
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+# Add project root to sys.path to allow imports from src
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from src.db import Database
+from src.models import Paper
+
+DEDUP_POINTS = 1 # _fetch_openalex
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-paper vs bulk dedup benchmark")
+    parser.add_argument("--works", type=int, default=200, help="Works on the discovery page")
+    parser.add_argument("--seen", type=int, default=5000, help="Rows already in seen_papers")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(Path(tmp) / "bench.sqlite3")
+        with db._get_conn() as conn:
+            conn.executemany(
+                "INSERT INTO seen_papers (link, doi, title) VALUES (?, ?, ?)",
+                [(f"https://doi.org/10.1/{i}", f"10.1/{i}", f"Seen {i}") for i in range(args.seen)]
+            )
+            conn.commit()
+
+        # Half of the page is already known
+        papers = [
+            Paper(title=f"Work {i}", link=f"https://doi.org/10.1/{i * 2}", published=datetime.now(), source="Bench", doi=f"10.1/{i * 2}")
+            for i in range(args.works)
+        ]
+
+        db.connections_opened = 0
+        start = time.perf_counter()
+        for _ in range(DEDUP_POINTS):
+            unseen_before = [p for p in papers if not db.is_seen(p.link, p.doi)]
+        before_time = time.perf_counter() - start
+        before_conns = db.connections_opened
+
+        db.connections_opened = 0
+        start = time.perf_counter()
+        for _ in range(DEDUP_POINTS):
+            unseen_after = db.filter_unseen(papers)
+        after_time = time.perf_counter() - start
+        after_conns = db.connections_opened
+
+    print(f"Page of {args.works} works, {args.seen} rows in seen_papers, {DEDUP_POINTS} dedup points per run")
+    print(f"is_seen per paper:  {before_conns:5d} connections, {before_time * 1000:8.1f} ms")
+    print(f"filter_unseen bulk: {after_conns:5d} connections, {after_time * 1000:8.1f} ms")
+    if [p.link for p in unseen_before] != [p.link for p in unseen_after]:
+        print("WARNING: results differ between the two approaches.")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+Benchmark: serial vs concurrent Discovery.run_all_tasks against a local mock OpenAlex.
+
+Usage: uv run scripts/bench_discovery.py [--workers 4] [--rate 8] [--latency 0.05]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add project root to sys.path to allow imports from src
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from mock_openalex import MockOpenAlex
+from src.discovery import Discovery
+from src.http_client import http_client
+from src.utils import RateLimiter
+
+def run(workers: int, rate: float, latency: float) -> tuple[float, int, int]:
+    with MockOpenAlex(latency=latency) as mock:
+        discovery = Discovery(from_date="2026-01-01", to_date="2026-02-01", max_workers=workers, rate_limiter=RateLimiter(rate))
+        discovery.base_url = mock.base_url
+        start = time.perf_counter()
+        papers = discovery.run_all_tasks()
+        elapsed = time.perf_counter() - start
+        return elapsed, len(papers), mock.requests
+
+def main():
+    parser = argparse.ArgumentParser(description="Serial vs concurrent discovery benchmark")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--rate", type=float, default=8.0, help="Global OpenAlex budget (requests/second)")
+    parser.add_argument("--latency", type=float, default=0.3, help="Simulated server latency per request (s)")
+    args = parser.parse_args()
+
+    serial_time, serial_count, requests_made = run(1, args.rate, args.latency)
+    parallel_time, parallel_count, _ = run(args.workers, args.rate, args.latency)
+
+    print(f"Requests per run: {requests_made} (budget {args.rate:.1f} req/s, latency {args.latency * 1000:.0f} ms)")
+    print(f"Serial     (1 worker):  {serial_time:7.2f} s, {serial_count} papers")
+    print(f"Concurrent ({args.workers} workers): {parallel_time:7.2f} s, {parallel_count} papers")
+    print(f"Speed-up: {serial_time / parallel_time:.2f}x")
+    for host, s in http_client.stats().items():
+        print(f"Connections to {host}: {s['connections']} opened for {s['requests']} requests ({s['reused']} reused)")
+    if serial_count != parallel_count:
+        print("WARNING: result counts differ between serial and concurrent runs.")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Benchmark: list-based vs streamed discovery against a local mock OpenAlex.
+
+run_all_tasks returns once every page of every task is downloaded; iter_all_tasks yields
+papers as their pages arrive. Reports the time until the first paper is available, the
+total time, and the peak Python memory of each. Checks that both find the same papers.
+Pages are parsed incrementally when ijson is installed (reported below).
+
+Usage: uv run scripts/bench_discovery_stream.py [--pages 2] [--latency 0.2] [--workers 4]
+"""
+import argparse
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+# Add project root to sys.path to allow imports from src
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from mock_openalex import MockOpenAlex
+from src import discovery as discovery_module
+from src.discovery import Discovery
+from src.utils import RateLimiter
+
+def run(streamed: bool, pages: int, latency: float, workers: int) -> tuple:
+    with MockOpenAlex(pages=pages, per_page=100, latency=latency) as mock:
+        discovery = Discovery(from_date="2026-01-01", to_date="2026-02-01", max_workers=workers, rate_limiter=RateLimiter(100))
+        discovery.base_url = mock.base_url
+        tracemalloc.start()
+        start = time.perf_counter()
+        first = None
+        keys = []
+        papers = discovery.iter_all_tasks() if streamed else discovery.run_all_tasks()
+        for paper in papers:
+            if first is None:
+                first = time.perf_counter() - start
+            keys.append(paper.doi)
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        return first, elapsed, peak, keys
+
+def main():
+    parser = argparse.ArgumentParser(description="List-based vs streamed discovery benchmark")
+    parser.add_argument("--pages", type=int, default=2, help="Result pages (of 100 works) per query")
+    parser.add_argument("--latency", type=float, default=0.2, help="Simulated server latency per request (s)")
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    print(f"Page parser: {'ijson (incremental)' if discovery_module.ijson else 'json (whole page)'}")
+    results = {"run_all_tasks": run(False, args.pages, args.latency, args.workers),
+               "iter_all_tasks": run(True, args.pages, args.latency, args.workers)}
+    for name, (first, elapsed, peak, keys) in results.items():
+        print(f"{name:15s} {len(keys):5d} papers  first after {first:6.2f} s  total {elapsed:6.2f} s  peak memory {peak / 1024 / 1024:6.1f} MB")
+    if sorted(results["run_all_tasks"][3]) != sorted(results["iter_all_tasks"][3]):
+        print("WARNING: the streamed run found different papers.")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
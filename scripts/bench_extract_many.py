@@ -0,0 +1,56 @@
+"""
+Benchmark: serial PDF text extraction vs Extractor.extract_many, in pages per second.
+
+Runs on a directory of PDFs (--pdf-dir, e.g. data/papers/2026) or on the fixed synthetic
+corpus of bench_text_reducer.py. The text cache is bypassed so both runs really extract,
+and the texts of both runs are checked to be identical.
+
+Usage: uv run scripts/bench_extract_many.py [--pdf-dir DIR | --papers 40] [--jobs N]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import fitz  # PyMuPDF
+
+# Add project root to sys.path to allow imports from src
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from bench_text_reducer import write_corpus
+from src.extractor import Extractor
+
+def main():
+    parser = argparse.ArgumentParser(description="Serial vs process-pool PDF extraction benchmark")
+    parser.add_argument("--pdf-dir", type=Path, help="Directory of PDFs (default: synthetic corpus)")
+    parser.add_argument("--papers", type=int, default=40, help="Synthetic papers to generate")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="Processes for extract_many")
+    args = parser.parse_args()
+
+    extractor = Extractor()
+    with tempfile.TemporaryDirectory() as tmp:
+        pdfs = sorted(args.pdf_dir.glob("*.pdf")) if args.pdf_dir else write_corpus(Path(tmp), args.papers)
+        pages = 0
+        for pdf in pdfs:
+            with fitz.open(pdf) as doc:
+                pages += doc.page_count
+
+        start = time.perf_counter()
+        serial = [extractor._extract_text(pdf) for pdf in pdfs]
+        serial_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        parallel = [text for _, text in extractor.extract_many(pdfs, jobs=args.jobs, use_cache=False)]
+        parallel_time = time.perf_counter() - start
+
+    print(f"{len(pdfs)} PDFs, {pages} pages, {os.cpu_count()} CPUs")
+    print(f"Serial _extract_text:        {serial_time:7.2f} s, {pages / serial_time:8.1f} pages/s")
+    print(f"extract_many ({args.jobs} processes): {parallel_time:7.2f} s, {pages / parallel_time:8.1f} pages/s")
+    if serial != parallel:
+        print("WARNING: texts differ between serial and parallel extraction.")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
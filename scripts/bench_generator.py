@@ -0,0 +1,60 @@
+"""
+Benchmark: serial vs multi-process paper rendering in SiteGenerator.build().
+
+Generates a synthetic corpus of summaries in a temporary directory and runs a full
+rebuild with --jobs 1 and --jobs N, then checks both runs produced identical pages.
+
+Usage: uv run scripts/bench_generator.py [--summaries 10000] [--jobs 4]
+"""
+import argparse
+import filecmp
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add project root to sys.path to allow imports from src
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from synthetic_summaries import write_corpus
+import src.generator as generator
+from src.db import Database
+
+def build(public_dir: Path, jobs: int) -> float:
+    generator.PUBLIC_DIR = public_dir
+    site = generator.SiteGenerator(jobs=jobs)
+    start = time.perf_counter()
+    site.build(full_rebuild=True)
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description="Serial vs parallel site generation benchmark")
+    parser.add_argument("--summaries", type=int, default=10000, help="Synthetic summaries to generate")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="Processes for the parallel run")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        write_corpus(tmp / "summaries", args.summaries)
+        generator.SUMMARIES_DIR = tmp / "summaries"
+        generator.MANIFEST_PATH = tmp / "build_manifest.json"
+        generator.db = Database(tmp / "bench.sqlite3")
+
+        serial_time = build(tmp / "public_serial", 1)
+        parallel_time = build(tmp / "public_parallel", args.jobs)
+
+        pages = sorted((tmp / "public_serial" / "summaries").rglob("*.html"))
+        rel_pages = [p.relative_to(tmp / "public_serial") for p in pages]
+        _, mismatch, errors = filecmp.cmpfiles(tmp / "public_serial", tmp / "public_parallel", rel_pages, shallow=False)
+
+    print(f"Full rebuild of {args.summaries} summaries ({len(pages)} paper pages)")
+    print(f"Serial   (--jobs 1): {serial_time:7.2f} s")
+    print(f"Parallel (--jobs {args.jobs}): {parallel_time:7.2f} s")
+    print(f"Speed-up: {serial_time / parallel_time:.2f}x")
+    if mismatch or errors:
+        print(f"WARNING: {len(mismatch) + len(errors)} paper pages differ between serial and parallel runs.")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
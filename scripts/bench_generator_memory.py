@@ -0,0 +1,60 @@
+"""
+Benchmark: peak RSS of a full SiteGenerator build on a synthetic archive.
+
+Each build runs in a fresh child process so ru_maxrss only reflects that build.
+Reports the RSS after imports (baseline) and the peak during build(full_rebuild=True).
+
+Usage: uv run scripts/bench_generator_memory.py [--summaries 20000]
+"""
+import argparse
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add project root to sys.path to allow imports from src
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def build(root: Path):
+    """Child process: builds the site for the corpus under root and prints its memory figures."""
+    import src.generator as generator
+    from src.db import Database
+    generator.SUMMARIES_DIR = root / "summaries"
+    generator.PUBLIC_DIR = root / "public"
+    generator.MANIFEST_PATH = root / "build_manifest.json"
+    generator.db = Database(root / "bench.sqlite3")
+    baseline = peak_rss_mb()
+    start = time.perf_counter()
+    generator.SiteGenerator().build(full_rebuild=True)
+    print(f"{baseline:.1f} {peak_rss_mb():.1f} {time.perf_counter() - start:.2f}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Peak memory of a full site build")
+    parser.add_argument("--summaries", type=int, default=20000, help="Synthetic summaries to generate")
+    parser.add_argument("--build", type=Path, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.build:
+        build(args.build)
+        return
+
+    from synthetic_summaries import write_corpus
+    with tempfile.TemporaryDirectory() as tmp:
+        write_corpus(Path(tmp) / "summaries", args.summaries)
+        result = subprocess.run(
+            [sys.executable, __file__, "--build", tmp],
+            capture_output=True, text=True, check=True
+        )
+    baseline, peak, elapsed = result.stdout.split()[-3:]
+    print(f"Full build of {args.summaries} summaries in {elapsed} s")
+    print(f"RSS after imports: {float(baseline):8.1f} MB")
+    print(f"Peak RSS:          {float(peak):8.1f} MB (+{float(peak) - float(baseline):.1f} MB for the build)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+Benchmark: OpenAlex works queries with full objects in pages of 50 (the former requests)
+vs the select= field projection in pages of 200, against a local mock OpenAlex.
+
+Reports requests, response bytes and JSON parse time for the same set of works, and
+checks that both runs build identical papers.
+
+Usage: uv run scripts/bench_openalex_select.py [--works 2000] [--latency 0.05]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add project root to sys.path to allow imports from src
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from mock_openalex import MockOpenAlex
+from src.discovery import Discovery
+from src.utils import RateLimiter
+
+def run(works: int, latency: float, params: dict) -> tuple:
+    with MockOpenAlex(latency=latency, total=works) as mock:
+        discovery = Discovery(from_date="2026-01-01", to_date="2026-02-01", rate_limiter=RateLimiter(1000))
+        discovery.base_url = mock.base_url
+        start = time.perf_counter()
+        papers = list(discovery._fetch_openalex({"filter": "primary_location.source.id:S1", **params}, ignore_seen=True))
+        elapsed = time.perf_counter() - start
+        return elapsed, papers, mock.requests, discovery.response_bytes, discovery.parse_seconds
+
+def main():
+    parser = argparse.ArgumentParser(description="OpenAlex select= projection benchmark")
+    parser.add_argument("--works", type=int, default=2000)
+    parser.add_argument("--latency", type=float, default=0.05, help="Simulated server latency per request (s)")
+    args = parser.parse_args()
+
+    # A None select is dropped by requests, so the first run fetches full work objects
+    runs = {
+        "full objects, 50 per page": run(args.works, args.latency, {"select": None, "per_page": 50}),
+        "select=, 200 per page": run(args.works, args.latency, {}),
+    }
+    print(f"{args.works} works, {args.latency * 1000:.0f} ms latency per request")
+    for name, (elapsed, papers, requests_made, size, parse) in runs.items():
+        print(f"{name:26s} {requests_made:4d} requests  {size / 1024 / 1024:7.2f} MB  parse {parse:6.3f} s  total {elapsed:6.2f} s")
+    (_, full, _, full_size, full_parse), (_, projected, _, size, parse) = runs.values()
+    print(f"Bytes: -{100 * (1 - size / full_size):.0f}%, parse time: -{100 * (1 - parse / full_parse):.0f}%")
+    if [vars(p) for p in full] != [vars(p) for p in projected]:
+        print("WARNING: the projected run built different papers.")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Benchmark: sequential main loop vs PaperPipeline, with simulated stage latencies.
+
+The filter, download, extraction and synthesis steps are replaced by sleeps (LLM and
+network time), so the benchmark measures the overlap between stages and checks that
+outcomes come back in input order. Nothing is written to the summaries or papers dirs.
+
+Usage: uv run scripts/bench_pipeline.py [--papers 20] [--download 0.5] [--extract 0.1] [--synthesis 1.0]
+"""
+import argparse
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+# Add project root to sys.path to allow imports from src
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from src.models import Paper
+from src.pipeline import PaperPipeline, SYNTHESIZED, IRRELEVANT
+
+class SimulatedFilter:
+    batch_size = 10
+
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    def check_relevance_batch(self, papers):
+        time.sleep(self.latency)
+        for paper in papers:
+            paper.is_relevant = int(paper.link.rsplit("/", 1)[1]) % 4 != 0
+        return [paper.is_relevant for paper in papers]
+
+class SimulatedExtractor:
+    def __init__(self, download: float, extract: float):
+        self.download_latency = download
+        self.extract_latency = extract
+
+    def download(self, paper):
+        time.sleep(self.download_latency)
+        return Path("/nonexistent.pdf")
+
+    def extract(self, paper, pdf_path):
+        time.sleep(self.extract_latency)
+        return "text", True
+
+    def process(self, paper):
+        return self.extract(paper, self.download(paper))
+
+class SimulatedSynthesizer:
+    latency = 1.0
+
+    def __init__(self):
+        self.engine = "ollama"
+
+    def synthesize(self, paper, full_text, is_full_text):
+        time.sleep(self.latency)
+        return True
+
+def make_papers(count: int) -> list[Paper]:
+    return [Paper(title=f"Paper {i}", link=f"https://doi.org/10.1/{i}", published=datetime.now(), source="Bench") for i in range(count)]
+
+def run_sequential(papers, relevance_filter, extractor):
+    synthesizer = SimulatedSynthesizer()
+    outcomes = []
+    relevance_filter.check_relevance_batch(papers)
+    for paper in papers:
+        if not paper.is_relevant:
+            outcomes.append((paper.link, IRRELEVANT))
+            continue
+        full_text, is_full_text = extractor.process(paper)
+        synthesizer.synthesize(paper, full_text, is_full_text)
+        outcomes.append((paper.link, SYNTHESIZED))
+    return outcomes
+
+def main():
+    parser = argparse.ArgumentParser(description="Sequential vs pipelined processing benchmark")
+    parser.add_argument("--papers", type=int, default=20)
+    parser.add_argument("--filter", type=float, default=0.3, help="Simulated relevance batch latency (s)")
+    parser.add_argument("--download", type=float, default=0.5, help="Simulated PDF download latency (s)")
+    parser.add_argument("--extract", type=float, default=0.1, help="Simulated text extraction time (s)")
+    parser.add_argument("--synthesis", type=float, default=1.0, help="Simulated synthesis latency (s)")
+    args = parser.parse_args()
+
+    SimulatedSynthesizer.latency = args.synthesis
+    relevance_filter = SimulatedFilter(args.filter)
+    extractor = SimulatedExtractor(args.download, args.extract)
+
+    start = time.perf_counter()
+    sequential = run_sequential(make_papers(args.papers), relevance_filter, extractor)
+    sequential_time = time.perf_counter() - start
+
+    # Ollama engine: one synthesis at a time, as in production
+    pipeline = PaperPipeline(relevance_filter, extractor, "ollama", synthesizer_factory=SimulatedSynthesizer)
+    start = time.perf_counter()
+    pipelined = [(paper.link, outcome) for paper, outcome in pipeline.run(make_papers(args.papers))]
+    pipelined_time = time.perf_counter() - start
+
+    relevant = sum(outcome == SYNTHESIZED for _, outcome in sequential)
+    print(f"{args.papers} papers ({relevant} relevant); filter {args.filter}s/batch, download {args.download}s, extract {args.extract}s, synthesis {args.synthesis}s")
+    print(f"Sequential loop: {sequential_time:6.2f} s")
+    print(f"Pipelined:       {pipelined_time:6.2f} s")
+    print(f"Speed-up: {sequential_time / pipelined_time:.2f}x")
+    if sequential != pipelined:
+        print("WARNING: outcomes or their order differ between the two runs.")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
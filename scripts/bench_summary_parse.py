@@ -0,0 +1,51 @@
+"""
+Benchmark: scraping summary metadata from Markdown vs reading the JSON sidecars.
+
+Writes a synthetic corpus, times parse_markdown over every summary (the legacy path),
+runs the sidecar migration, then times read_sidecar over the same files. Both are cold
+reads with no build manifest, i.e. the cost of a first or --full-rebuild build.
+
+Usage: uv run scripts/bench_summary_parse.py [--summaries 10000]
+"""
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add project root to sys.path to allow imports from src
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from synthetic_summaries import write_corpus
+from migrate_summary_metadata import migrate
+from src.summaries import parse_markdown, read_sidecar
+
+def main():
+    parser = argparse.ArgumentParser(description="Markdown scraping vs JSON sidecar benchmark")
+    parser.add_argument("--summaries", type=int, default=10000, help="Synthetic summaries to generate")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        summaries_dir = Path(tmp) / "summaries"
+        paths = write_corpus(summaries_dir, args.summaries)
+
+        start = time.perf_counter()
+        scraped = [parse_markdown(p.name, p.read_text()) for p in paths]
+        scrape_time = time.perf_counter() - start
+
+        migrate(summaries_dir)
+
+        start = time.perf_counter()
+        sidecars = [read_sidecar(p) for p in paths]
+        sidecar_time = time.perf_counter() - start
+
+    print(f"Metadata for {args.summaries} summaries")
+    print(f"Regex scraping of Markdown: {scrape_time * 1000:8.1f} ms ({scrape_time / args.summaries * 1e6:.1f} µs/summary)")
+    print(f"JSON sidecar read:          {sidecar_time * 1000:8.1f} ms ({sidecar_time / args.summaries * 1e6:.1f} µs/summary)")
+    print(f"Speed-up: {scrape_time / sidecar_time:.2f}x")
+    if any({**s, "version": None} != {**m, "version": None} for s, m in zip(sidecars, scraped)):
+        print("WARNING: sidecar metadata differs from the scraped metadata.")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+Benchmark: PDF text extraction with a cold vs warm extracted-text cache.
+
+Writes the fixed synthetic corpus of bench_text_reducer.py to a temporary directory and
+runs Extractor.extract on every PDF twice: the first pass extracts and writes the
+<name>.txt.gz caches, the second reads them back. Also checks that the texts match.
+
+Usage: uv run scripts/bench_text_cache.py [--papers 20]
+"""
+import argparse
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+# Add project root to sys.path to allow imports from src
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from bench_text_reducer import write_corpus
+from src.extractor import Extractor
+from src.models import Paper
+
+def run(extractor: Extractor, pdfs: list[Path]) -> tuple[float, list[str]]:
+    paper = Paper(title="Bench", link="https://example.org", published=datetime.now(), source="Bench")
+    start = time.perf_counter()
+    texts = [extractor.extract(paper, pdf)[0] for pdf in pdfs]
+    return time.perf_counter() - start, texts
+
+def main():
+    parser = argparse.ArgumentParser(description="Extracted-text cache benchmark")
+    parser.add_argument("--papers", type=int, default=20)
+    args = parser.parse_args()
+
+    extractor = Extractor()
+    with tempfile.TemporaryDirectory() as tmp:
+        pdfs = write_corpus(Path(tmp), args.papers)
+        cold_time, cold_texts = run(extractor, pdfs)
+        warm_time, warm_texts = run(extractor, pdfs)
+        pdf_bytes = sum(p.stat().st_size for p in pdfs)
+        cache_bytes = sum(p.with_suffix(".txt.gz").stat().st_size for p in pdfs)
+
+    print(f"{args.papers} PDFs ({pdf_bytes / 1e6:.1f} MB), text caches {cache_bytes / 1e6:.2f} MB")
+    print(f"Cold (extract + write cache): {cold_time * 1000:8.1f} ms")
+    print(f"Warm (read cache):            {warm_time * 1000:8.1f} ms")
+    print(f"Speed-up: {cold_time / warm_time:.1f}x")
+    if cold_texts != warm_texts:
+        print("WARNING: cached texts differ from the extracted ones.")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
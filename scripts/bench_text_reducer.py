@@ -0,0 +1,134 @@
+"""
+Benchmark: tokens sent to synthesis before and after the text reducer, on a fixed PDF corpus.
+
+By default a deterministic synthetic corpus is written to a temporary directory (running
+headers and footers, page numbers, hyphenated line breaks, acknowledgements, references
+and an appendix). --pdf-dir runs on real PDFs instead (e.g. data/papers/2026).
+
+With --ollama, every paper is also synthesized twice through the local Ollama server (raw
+text vs reduced text) and the synthesis latencies are reported. That needs a running
+Ollama with OLLAMA_MODEL pulled; nothing is written to the summaries directory.
+
+Usage: uv run scripts/bench_text_reducer.py [--papers 10] [--pdf-dir DIR] [--ollama]
+"""
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import fitz  # PyMuPDF
+
+# Add project root to sys.path to allow imports from src
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from src.config import OLLAMA_SYNTHESIS_NUM_CTX, SYNTHESIS_OUTPUT_TOKENS
+from src.extractor import Extractor
+from src.synthesizer import Synthesizer, SYNTHESIS_PROMPT
+from src.text_reducer import fit_to_budget
+from src.utils import estimate_tokens
+
+WORDS = ("runoff precipitation evapotranspiration catchment aquifer recharge soil moisture model "
+         "calibration uncertainty streamflow drought basin simulation observed ensemble climate").split()
+
+def _paragraph(rng: random.Random, sentences: int) -> str:
+    out = []
+    for _ in range(sentences):
+        words = [rng.choice(WORDS) for _ in range(rng.randint(8, 20))]
+        out.append(" ".join(words).capitalize() + ".")
+    return " ".join(out)
+
+def _lines(text: str, width: int = 90) -> list[str]:
+    """Wraps text like a PDF column, hyphenating some of the words split at the line end."""
+    lines, line = [], ""
+    for word in text.split():
+        if len(line) + len(word) + 1 > width:
+            if len(word) > 8 and len(line) + 6 < width:
+                lines.append(f"{line} {word[:5]}-".strip())
+                line = word[5:]
+                continue
+            lines.append(line)
+            line = word
+        else:
+            line = f"{line} {word}".strip()
+    if line:
+        lines.append(line)
+    return lines
+
+def write_corpus(directory: Path, count: int) -> list[Path]:
+    paths = []
+    for index in range(count):
+        rng = random.Random(index)
+        body = ["Abstract", *_lines(_paragraph(rng, 8))]
+        for number, section in enumerate(["Introduction", "Data and methods", "Results", "Discussion", "Conclusions"], 1):
+            body.append(f"{number}. {section}")
+            for _ in range(rng.randint(4, 7)):
+                body.extend(_lines(_paragraph(rng, 10)))
+        body += ["Acknowledgements", *_lines("This work was funded by project PID2024-000" + str(index) + " of the Spanish research agency.")]
+        body.append("References")
+        for ref in range(rng.randint(40, 70)):
+            body.extend(_lines(f"Author{ref}, A., Other, B., {2000 + ref % 25}. {_paragraph(rng, 1)} J. Hydrol. {ref}, {ref * 7}-{ref * 7 + 12}."))
+        body.append("Appendix A. Supplementary data")
+        for _ in range(3):
+            body.extend(_lines(_paragraph(rng, 10)))
+
+        doc = fitz.open()
+        per_page = 48
+        for page_number, start in enumerate(range(0, len(body), per_page), 1):
+            page = doc.new_page()
+            text = "\n".join([f"Journal of Hydrology {600 + index} (2026) 1{page_number:04d}", f"Author{index} et al.", ""]
+                             + body[start:start + per_page] + ["", str(page_number)])
+            page.insert_text((40, 40), text, fontsize=7)
+        path = directory / f"paper{index:03d}.pdf"
+        doc.save(path)
+        doc.close()
+        paths.append(path)
+    return paths
+
+def raw_text(pdf_path: Path) -> str:
+    """What the extractor produced before the reducer: every page joined, whitespace collapsed."""
+    with fitz.open(pdf_path) as doc:
+        return " ".join("".join(page.get_text() for page in doc).split())
+
+def main():
+    parser = argparse.ArgumentParser(description="Text reducer token and latency benchmark")
+    parser.add_argument("--papers", type=int, default=10, help="Synthetic papers to generate")
+    parser.add_argument("--pdf-dir", type=Path, help="Use the PDFs in this directory instead")
+    parser.add_argument("--ollama", action="store_true", help="Also time synthesis of raw vs reduced text on Ollama")
+    args = parser.parse_args()
+
+    budget = OLLAMA_SYNTHESIS_NUM_CTX - estimate_tokens(SYNTHESIS_PROMPT) - SYNTHESIS_OUTPUT_TOKENS
+    extractor = Extractor()
+    synthesizer = Synthesizer()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pdfs = sorted(args.pdf_dir.glob("*.pdf")) if args.pdf_dir else write_corpus(Path(tmp), args.papers)
+        print(f"{'paper':<28} {'raw':>8} {'cleaned':>8} {'fitted':>8} {'saved':>6}" + ("  synth raw / reduced" if args.ollama else ""))
+        totals = [0, 0, 0]
+        latencies = [0.0, 0.0]
+        for pdf in pdfs:
+            raw = raw_text(pdf)
+            cleaned = extractor._extract_text(pdf)
+            fitted = fit_to_budget(cleaned, budget)
+            counts = [estimate_tokens(raw), estimate_tokens(cleaned), estimate_tokens(fitted)]
+            totals = [t + c for t, c in zip(totals, counts)]
+            line = f"{pdf.name[:28]:<28} {counts[0]:8d} {counts[1]:8d} {counts[2]:8d} {1 - counts[2] / counts[0]:6.0%}"
+            if args.ollama:
+                timings = []
+                for text in (raw, fitted):
+                    start = time.perf_counter()
+                    synthesizer._synthesize_ollama(text)
+                    timings.append(time.perf_counter() - start)
+                latencies = [l + t for l, t in zip(latencies, timings)]
+                line += f"  {timings[0]:7.1f} s / {timings[1]:5.1f} s"
+            print(line)
+
+    print(f"\n{len(pdfs)} papers, Ollama text budget {budget} tokens (num_ctx {OLLAMA_SYNTHESIS_NUM_CTX})")
+    print(f"Raw: {totals[0]} tokens, cleaned: {totals[1]} ({1 - totals[1] / totals[0]:.0%} less), "
+          f"fitted: {totals[2]} ({1 - totals[2] / totals[0]:.0%} less)")
+    if args.ollama:
+        print(f"Synthesis: {latencies[0]:.1f} s raw vs {latencies[1]:.1f} s reduced")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""
+Check: Gemini prompt/context caching against a stubbed client that counts prompt tokens.
+
+Runs N syntheses and N relevance checks through Synthesizer/RelevanceFilter with a stub
+genai client (no network, no API key needed), and compares the billed prompt tokens and
+cost with the old behaviour of concatenating the fixed prompt into every request. Usage
+rows go to a temporary database.
+
+Exits with status 1 if a request re-sends the fixed prompt once its cache exists, or if
+the recorded cost does not match the cached-token pricing.
+
+Usage: uv run scripts/check_gemini_caching.py [--papers 20]
+"""
+import argparse
+import os
+import sys
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from types import SimpleNamespace
+
+os.environ.setdefault("GEMINI_API_KEY", "stub")
+
+# Add project root to sys.path to allow imports from src
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+import src.gemini_client
+from src.db import Database
+from src.filter import RelevanceFilter, SYSTEM_PROMPT
+from src.gemini_client import GeminiClient, usage_cost
+from src.models import Paper
+from src.synthesizer import Synthesizer, SYNTHESIS_PROMPT
+from src.utils import estimate_tokens
+
+MIN_CACHE_TOKENS = 1024 # Gemini 2.5 Flash minimum for explicit caching
+COMPLETION_TOKENS = 200
+
+class StubCaches:
+    def __init__(self, min_tokens: int):
+        self.min_tokens = min_tokens
+        self.tokens = {}
+        self.deleted = []
+
+    def create(self, model, config):
+        tokens = estimate_tokens(config["system_instruction"])
+        if tokens < self.min_tokens:
+            raise ValueError(f"cached content is too small: {tokens} < {self.min_tokens} tokens")
+        name = f"cachedContents/{len(self.tokens)}"
+        self.tokens[name] = tokens
+        return SimpleNamespace(name=name, usage_metadata=SimpleNamespace(total_token_count=tokens))
+
+    def delete(self, name):
+        self.deleted.append(name)
+
+class StubModels:
+    def __init__(self, caches: StubCaches):
+        self.caches = caches
+        self.requests = 0
+        self.prompt_tokens = 0
+        self.uncached_tokens = 0
+
+    def generate_content(self, model, contents, config):
+        self.requests += 1
+        cached = self.caches.tokens.get(config.get("cached_content"), 0)
+        prompt = estimate_tokens(contents) + cached
+        if config.get("system_instruction"):
+            prompt += estimate_tokens(config["system_instruction"])
+        self.prompt_tokens += prompt
+        self.uncached_tokens += prompt - cached
+        text = '{"relevant": true, "reason": "stub"}' if config.get("response_mime_type") else "## Research Groups\n- Stub"
+        usage = SimpleNamespace(prompt_token_count=prompt, candidates_token_count=COMPLETION_TOKENS, cached_content_token_count=cached)
+        return SimpleNamespace(text=text, usage_metadata=usage)
+
+class StubClient:
+    def __init__(self, min_cache_tokens: int):
+        self.caches = StubCaches(min_cache_tokens)
+        self.models = StubModels(self.caches)
+
+def legacy_cost(prompt: str, contents: list[str]) -> tuple[int, float]:
+    """Old behaviour: the fixed prompt concatenated into every request, billed at the input rate."""
+    tokens = sum(estimate_tokens(f"{prompt}\n\n{c}") for c in contents)
+    return tokens, usage_cost(tokens, COMPLETION_TOKENS * len(contents))
+
+def main():
+    parser = argparse.ArgumentParser(description="Gemini context caching check with a stub client")
+    parser.add_argument("--papers", type=int, default=20)
+    args = parser.parse_args()
+
+    failures = []
+    paper_text = "Results. " * 6000 # ~13.5k tokens of paper text
+    papers = [
+        Paper(title=f"Paper {i}", link=f"https://doi.org/10.1/{i}", published=datetime.now(), source="Check", abstract="An abstract. " * 40)
+        for i in range(args.papers)
+    ]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        src.gemini_client.db = Database(Path(tmp) / "check.sqlite3")
+
+        # At the real minimum the default prompts may be too short to cache; the second pass
+        # exercises the cached-content path and its pricing regardless
+        for min_cache_tokens in (MIN_CACHE_TOKENS, 0):
+            print(f"--- Stub cache minimum: {min_cache_tokens} tokens")
+            for label, prompt, contents, run in [
+                ("Synthesis", SYNTHESIS_PROMPT, [f"PAPER TEXT:\n{paper_text}"] * args.papers,
+                 lambda gemini: [Synthesizer(gemini=gemini)._synthesize_gemini_api(paper_text) for _ in papers]),
+                ("Relevance", SYSTEM_PROMPT, [f"Title: {p.title}\n\nAbstract: {p.abstract}\n" for p in papers],
+                 lambda gemini: [RelevanceFilter(engine="gemini", model="gemini-flash-latest", gemini=gemini)._check_relevance_gemini(p) for p in papers]),
+            ]:
+                stub = StubClient(min_cache_tokens)
+                gemini = GeminiClient(api_key="stub", client=stub)
+                start_cost = src.gemini_client.db.get_monthly_cost()
+                run(gemini)
+                gemini.close()
+                cost = src.gemini_client.db.get_monthly_cost() - start_cost
+                old_tokens, old_cost = legacy_cost(prompt, contents)
+                prompt_tokens = estimate_tokens(prompt)
+
+                cached = bool(stub.caches.tokens)
+                print(f"{label}: fixed prompt ~{prompt_tokens} tokens, {stub.models.requests} requests, "
+                      f"{'cached content' if cached else 'system instruction (below cache minimum)'}")
+                print(f"  before: {old_tokens:8d} prompt tokens billed at the input rate, cost {old_cost:.5f}")
+                print(f"  after:  {stub.models.uncached_tokens:8d} uncached + {stub.models.prompt_tokens - stub.models.uncached_tokens} cached prompt tokens, "
+                      f"cost {cost:.5f} (incl. cache storage)")
+
+                if cached:
+                    expected_uncached = sum(estimate_tokens(c) for c in contents)
+                    if stub.models.uncached_tokens != expected_uncached:
+                        failures.append(f"{label}: fixed prompt re-sent ({stub.models.uncached_tokens} != {expected_uncached} uncached tokens)")
+                    if stub.caches.deleted != list(stub.caches.tokens):
+                        failures.append(f"{label}: cached content not deleted on close()")
+                expected_cost = usage_cost(stub.models.prompt_tokens, COMPLETION_TOKENS * args.papers, stub.models.prompt_tokens - stub.models.uncached_tokens)
+                storage = sum(stub.caches.tokens.values()) * src.gemini_client.CACHE_STORAGE_PRICE_PER_HOUR * gemini.cache_ttl / 3600 / 1_000_000
+                if abs(cost - expected_cost - storage) > 1e-9:
+                    failures.append(f"{label}: recorded cost {cost:.6f} != expected {expected_cost + storage:.6f}")
+
+        src.gemini_client.db.close()
+
+    if failures:
+        print("\nFailures:")
+        for failure in failures:
+            print(f"- {failure}")
+        sys.exit(1)
+    print("\nFixed prompts are sent once per run and cached tokens are priced at the cached rate.")
+
+if __name__ == "__main__":
+    main()
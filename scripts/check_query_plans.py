@@ -0,0 +1,81 @@
+"""
+Query-plan regression check for the hot Database queries.
+
+Builds a fresh database through the migration chain, runs each Database method while
+capturing the SQL it issues, and checks EXPLAIN QUERY PLAN for the expected indexes.
+Exits with status 1 if any query stops using its index (e.g. after a schema or SQL change).
+
+Usage: uv run scripts/check_query_plans.py
+"""
+import sqlite3
+import sys
+import tempfile
+from pathlib import Path
+
+# Add project root to sys.path to allow imports from src
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from src.db import Database, MIGRATIONS
+
+# Database method -> indexes that must appear in the plan of the SELECTs it issues
+EXPECTED_PLANS = {
+    "get_promotable_journals": ["idx_seen_papers_relevant_source"],
+    "get_promotable_authors": ["idx_seen_papers_relevant_source"],
+    "get_all_journals": ["idx_seen_papers_relevant_source"],
+    "get_all_paper_journals": ["idx_seen_papers_source"],
+    "get_distinct_journal_urls": ["idx_seen_papers_source"],
+    "get_journal_urls": ["idx_seen_papers_source"],
+    "get_all_authors": ["idx_paper_authors_author"],
+    "get_recent_papers_by_days": ["idx_seen_papers_processed_date"],
+    "get_recent_events": ["idx_events_timestamp"],
+    "get_monthly_cost": ["idx_usage_timestamp"],
+}
+
+class TracingDatabase(Database):
+    """Database that records every statement executed on its connections."""
+    def __init__(self, *args, **kwargs):
+        self.statements = []
+        super().__init__(*args, **kwargs)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = super()._connect()
+        conn.set_trace_callback(self.statements.append)
+        return conn
+
+def main():
+    failures = []
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "plans.sqlite3"
+        db = TracingDatabase(db_path, mode="persistent")
+        explain_conn = sqlite3.connect(db_path)
+
+        version = explain_conn.execute("PRAGMA user_version").fetchone()[0]
+        if version != MIGRATIONS[-1][0]:
+            failures.append(f"schema version is {version}, expected {MIGRATIONS[-1][0]}")
+
+        for method, indexes in EXPECTED_PLANS.items():
+            db.statements.clear()
+            getattr(db, method)()
+            selects = [sql for sql in db.statements if sql.lstrip().upper().startswith("SELECT")]
+            plan = []
+            for sql in selects:
+                plan.extend(row[3] for row in explain_conn.execute(f"EXPLAIN QUERY PLAN {sql}"))
+            plan_text = " | ".join(plan)
+            missing = [idx for idx in indexes if idx not in plan_text]
+            status = "FAIL" if missing else "ok"
+            print(f"[{status:>4}] {method}: {plan_text}")
+            if missing:
+                failures.append(f"{method} no longer uses {', '.join(missing)}")
+
+        explain_conn.close()
+        db.close()
+
+    if failures:
+        print("\nQuery plan regressions:")
+        for failure in failures:
+            print(f"- {failure}")
+        sys.exit(1)
+    print("\nAll query plans use their expected indexes.")
+
+if __name__ == "__main__":
+    main()
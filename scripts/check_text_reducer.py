@@ -0,0 +1,80 @@
+"""
+Check: back-matter detection of the text reducer.
+
+Runs DROP_HEADING over heading lines that must start a dropped section and over wrapped
+lines of body prose that only look like one, then cleans a synthetic paper whose Results
+section contains such lines and checks that the body is kept while the references and the
+appendix are dropped (and the acknowledgements kept).
+
+Exits with status 1 on any mismatch.
+
+Usage: uv run scripts/check_text_reducer.py
+"""
+import sys
+from pathlib import Path
+
+# Add project root to sys.path to allow imports from src
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from src.text_reducer import DROP_HEADING, clean_pages
+
+HEADINGS = [
+    "References", "REFERENCES", "5. References", "References:", "Bibliography", "Literature Cited",
+    "Appendix A", "Appendix B1", "Appendix S2:", "Appendices", "A. Appendix",
+    "Appendix A. Supplementary data", "Appendix B: Derivation of the Water Balance",
+    "Appendix C – Model Parameters", "Supplementary Material", "Supporting Information",
+]
+PROSE = [
+    "Appendix A. The calibration parameters are listed in",
+    "Appendix A. The calibration was then repeated for",
+    "references in",
+    "Supplementary Material: the model is run",
+    "Supporting Information. We thank all the",
+    "Appendix B: Derivation of the",
+]
+
+def paper_pages() -> list[str]:
+    """A paper whose Results section wraps sentences right after back-matter keywords."""
+    sentence = "Streamflow was simulated for every catchment and compared with the observed series."
+    results = [
+        "3. Results",
+        sentence,
+        "The model was first calibrated on the wet years, and the parameters were fixed as shown in",
+        "Appendix A. The calibration was then repeated for",
+        "the dry years to test the transferability of the parameters.",
+        "Supplementary Material: the model is run",
+        "with the same forcing for both periods.",
+        "RESULTS_KEPT_MARKER",
+    ]
+    lines = ["Title of the paper", "1. Introduction", *[sentence] * 12, "2. Methods", *[sentence] * 8]
+    lines += results + [sentence] * 10
+    lines += ["4. Conclusions", sentence, "Acknowledgements", "This work was funded by the agency."]
+    lines += ["References", *["Author, A., 2020. A reference. J. Hydrol. 1, 1-12."] * 8]
+    lines += ["Appendix A. Supplementary data", "APPENDIX_DROPPED_MARKER"]
+    return ["\n".join(lines)]
+
+def main():
+    failures = []
+    for line in HEADINGS:
+        if not DROP_HEADING.fullmatch(line):
+            failures.append(f"heading not recognized: {line!r}")
+    for line in PROSE:
+        if DROP_HEADING.fullmatch(line):
+            failures.append(f"prose taken for a heading: {line!r}")
+
+    text = clean_pages(paper_pages())
+    for marker, expected in [("RESULTS_KEPT_MARKER", True), ("the dry years", True), ("funded by the agency", True),
+                             ("A reference.", False), ("APPENDIX_DROPPED_MARKER", False)]:
+        if (marker in text) != expected:
+            failures.append(f"cleaned text {'lost' if expected else 'kept'} {marker!r}")
+
+    print(f"{len(HEADINGS)} headings, {len(PROSE)} prose lines, cleaned paper: {len(text.split())} words")
+    if failures:
+        print("\nText reducer regressions:")
+        for failure in failures:
+            print(f"- {failure}")
+        sys.exit(1)
+    print("Back matter is detected only on heading lines.")
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,5 @@
 import sys
 from pathlib import Path
-import requests
 import sqlite3
 import time
 
@@ -8,6 +7,7 @@ import time
 sys.path.append(str(Path(__file__).resolve().parent.parent))
 from src.config import DB_PATH
 from src.logger import logger
+from src.http_cache import openalex_cache
 
 def migrate():
     logger.info("Starting robust author migration...")
@@ -41,7 +41,7 @@ def migrate():
         url = f"https://api.openalex.org/authors?filter=openalex:{ids_str}&per_page={batch_size}"
         
         try:
-            response = requests.get(url, timeout=30)
+            response = openalex_cache.get(url, timeout=30)
             if response.status_code != 200:
                 logger.error(f"Error {response.status_code} fetching batch: {response.text}")
                 time.sleep(2)
@@ -0,0 +1,35 @@
+"""
+One-shot migration: writes the JSON metadata sidecar (YYYY/<stem>.json) for every existing
+summary that does not have a current one, scraping the fields from the Markdown once.
+
+Usage: uv run scripts/migrate_summary_metadata.py [--force]
+"""
+import argparse
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from src.config import SUMMARIES_DIR
+from src.logger import logger
+from src.summaries import read_sidecar, write_sidecar, parse_markdown
+
+def migrate(summaries_dir: Path = SUMMARIES_DIR, force: bool = False) -> int:
+    logger.info(f"Writing metadata sidecars for summaries in {summaries_dir}...")
+    written = 0
+    skipped = 0
+    for md_file in sorted(summaries_dir.glob("*/*.md")):
+        if not force and read_sidecar(md_file):
+            skipped += 1
+            continue
+        metadata = parse_markdown(md_file.name, md_file.read_text())
+        write_sidecar(md_file, metadata)
+        written += 1
+    logger.info(f"Metadata migration complete: {written} sidecars written, {skipped} already up to date.")
+    return written
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Write JSON metadata sidecars for existing summaries")
+    parser.add_argument("--force", action="store_true", help="Rewrite sidecars that already exist")
+    args = parser.parse_args()
+    migrate(force=args.force)
@@ -0,0 +1,124 @@
+"""
+Minimal local stand-in for the OpenAlex /works endpoint, used by the benchmark scripts.
+
+Every query returns `pages` cursor-paginated pages of synthetic works. Results are
+deterministic per filter, so serial and concurrent runs see exactly the same data.
+"""
+import json
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+WORDS = ("soil moisture drought runoff evapotranspiration groundwater recharge catchment "
+         "model simulation irrigation snow basin streamflow climate change reanalysis").split()
+
+def make_work(key: str, index: int, abstract_words: int = 180) -> dict:
+    """Builds a realistic-looking OpenAlex work object."""
+    wid = f"W{zlib.crc32(f'{key}-{index}'.encode()) % 10**10:010d}"
+    inverted = {}
+    for pos in range(abstract_words):
+        inverted.setdefault(WORDS[(pos * 7 + index) % len(WORDS)], []).append(pos)
+    return {
+        "id": f"https://openalex.org/{wid}",
+        "doi": f"https://doi.org/10.9999/{wid.lower()}",
+        "title": f"Synthetic hydrology study {wid}",
+        "type": "article",
+        "publication_date": "2026-01-15",
+        "primary_location": {
+            "source": {
+                "id": "https://openalex.org/S0000000001",
+                "display_name": "Journal of Mock Hydrology",
+                "homepage_url": "https://example.org/jmh",
+                "summary_stats": {"h_index": 250, "2yr_mean_citedness": 6.5},
+            },
+            "pdf_url": f"https://example.org/pdf/{wid}.pdf",
+        },
+        "best_oa_location": {"pdf_url": f"https://example.org/pdf/{wid}.pdf"},
+        "open_access": {"oa_url": f"https://example.org/pdf/{wid}.pdf"},
+        "locations": [{"pdf_url": f"https://example.org/pdf/{wid}.pdf"}],
+        "abstract_inverted_index": inverted,
+        "authorships": [
+            {"author": {"id": f"https://openalex.org/A{i:09d}", "display_name": f"Author {i}"}}
+            for i in range(index % 5 + 1)
+        ],
+        "topics": [{"display_name": "Hydrology"}, {"display_name": "Soil Moisture"}],
+        "concepts": [{"display_name": "Environmental science", "level": 0}],
+        # Heavy fields the pipeline never reads
+        "referenced_works": [f"https://openalex.org/W{i:010d}" for i in range(40)],
+        "related_works": [f"https://openalex.org/W{i:010d}" for i in range(10)],
+        "counts_by_year": [{"year": 2020 + i, "cited_by_count": i} for i in range(6)],
+        "mesh": [],
+    }
+
+class MockOpenAlex:
+    """
+    Context manager running the mock API on a background thread.
+
+    With `total`, every query has that many works, served in pages of the requested
+    per_page (like OpenAlex) instead of `pages` pages of `per_page` works.
+    """
+    def __init__(self, pages: int = 2, per_page: int = 25, latency: float = 0.05, total: int = None):
+        self.pages = pages
+        self.per_page = per_page
+        self.total = total
+        self.latency = latency
+        self.requests = 0
+        self.bytes_sent = 0
+        self._lock = threading.Lock()
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server.server_address[1]}/works"
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _handler(self):
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                query = {k: v[0] for k, v in parse_qs(urlparse(self.path).query).items()}
+                cursor = query.get("cursor", "*")
+                page = 1 if cursor == "*" else int(cursor)
+                key = query.get("filter", "")
+                if mock.total is None:
+                    per_page, last_page = mock.per_page, mock.pages
+                else:
+                    per_page = int(query.get("per_page", 25))
+                    last_page = -(-mock.total // per_page)
+                first = (page - 1) * per_page
+                count = per_page if mock.total is None else min(per_page, mock.total - first)
+                works = [make_work(key, first + i) for i in range(count)]
+                if "select" in query:
+                    fields = query["select"].split(",")
+                    works = [{f: w.get(f) for f in fields} for w in works]
+                body = json.dumps({
+                    "meta": {"next_cursor": str(page + 1) if page < last_page else None},
+                    "results": works,
+                }).encode()
+                time.sleep(mock.latency)
+                with mock._lock:
+                    mock.requests += 1
+                    mock.bytes_sent += len(body)
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
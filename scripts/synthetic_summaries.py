@@ -0,0 +1,89 @@
+"""
+Synthetic summary corpus used by the site generator benchmarks.
+
+Writes Markdown files shaped like the ones Synthesizer.synthesize produces (title,
+optional abstract-only warning, Identification section, the synthesis sections, BibTeX
+citation and the original_link metadata comment). Output is deterministic per index.
+"""
+from datetime import date, timedelta
+from pathlib import Path
+
+WORDS = ("soil moisture drought runoff evapotranspiration groundwater recharge catchment "
+         "model simulation irrigation snow basin streamflow climate change reanalysis").split()
+JOURNALS = ["Journal of Hydrology", "Water Resources Research", "Hydrology and Earth System Sciences",
+            "Advances in Water Resources", "Journal of Hydrometeorology"]
+
+def _sentence(index: int, length: int) -> str:
+    words = [WORDS[(index * 7 + i * 3) % len(WORDS)] for i in range(length)]
+    return " ".join(words).capitalize() + "."
+
+def make_summary(index: int) -> tuple[str, str]:
+    """Returns (relative path, Markdown content) of synthetic summary number `index`."""
+    published = date(2020, 1, 1) + timedelta(days=index % 2190)
+    authors = [f"Author{(index + k) % 997} Surname{(index * 3 + k) % 1499}" for k in range(1 + index % 6)]
+    journal = JOURNALS[index % len(JOURNALS)]
+    link = f"https://doi.org/10.9999/synthetic.{index}"
+    title = f"Synthetic study {index} of {' '.join(WORDS[index % 5:index % 5 + 3])}"
+    warning = ""
+    if index % 4 == 0:
+        warning = "<!-- warning_start -->\n> ⚠️ **Warning:** This summary was generated from the **abstract only**, as the full text was not available.\n<!-- warning_end -->\n"
+    results = "\n".join(f"- {_sentence(index + k, 25)}" for k in range(6))
+    content = f"""# {authors[0].split()[-1]} et al. ({published.year}) {title}
+
+{warning}## Identification
+- **Journal:** [{journal}](https://example.org/{index % len(JOURNALS)})
+- **Year:** {published.year}
+- **Date:** {published.isoformat()}
+- **Authors:** {", ".join(authors)}
+- **DOI:** [10.9999/synthetic.{index}]({link})
+
+## Research Groups
+- {_sentence(index, 8)}
+
+## Short Summary
+{_sentence(index, 30)}
+
+## Objective
+- {_sentence(index + 1, 20)}
+
+## Study Configuration
+- **Spatial Scale:** {_sentence(index + 2, 10)}
+- **Temporal Scale:** {_sentence(index + 3, 10)}
+
+## Methodology and Data
+- **Models used:** {_sentence(index + 4, 12)}
+- **Data sources:** {_sentence(index + 5, 12)}
+
+## Main Results
+{results}
+
+## Contributions
+- {_sentence(index + 6, 30)}
+
+## Funding
+- {_sentence(index + 7, 10)}
+
+## Citation
+```bibtex
+@article{{synthetic{index},
+  title = {{{title}}},
+  journal = {{{journal}}},
+  year = {{{published.year}}},
+  doi = {{10.9999/synthetic.{index}}}
+}}
+```
+
+<!-- metadata:original_link:{link} -->"""
+    rel_path = f"{published.year}/{published.strftime('%Y%m%d')}_synthetic{index}.md"
+    return rel_path, content
+
+def write_corpus(summaries_dir: Path, count: int) -> list[Path]:
+    """Writes `count` synthetic summaries under summaries_dir/YYYY/ and returns their paths."""
+    paths = []
+    for index in range(count):
+        rel_path, content = make_summary(index)
+        path = summaries_dir / rel_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+        paths.append(path)
+    return paths
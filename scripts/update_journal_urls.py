@@ -1,8 +1,12 @@
 import sqlite3
-import requests
+import sys
 import time
 from pathlib import Path
 
+# Add project root to sys.path to allow imports from src
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from src.http_cache import openalex_cache
+
 DB_PATH = Path("data/db.sqlite3")
 
 def update_journal_urls():
@@ -28,7 +32,7 @@ def update_journal_urls():
         print(f"Fetching metadata for {source_id}...")
         try:
             url = f"https://api.openalex.org/sources/{source_id}"
-            response = requests.get(url, timeout=20)
+            response = openalex_cache.get(url, timeout=20)
             if response.status_code == 200:
                 data = response.json()
                 homepage = data.get("homepage_url")
@@ -0,0 +1,182 @@
+"""
+In-process historical backfill.
+
+The publication dates from the backfill cursor (metadata "backfill_cursor") back to
+BACKFILL_LIMIT_DATE are split into windows of BACKFILL_WINDOW_DAYS. Every invocation plans
+the next windows and processes BACKFILL_WORKERS of them at a time in this process: one
+Discovery and pipeline per window, sharing the OpenAlex rate limiter, the synthesis slots
+and the monthly LLM budget.
+
+Each window is checkpointed in the backfill_windows table (pending -> running -> done or
+failed). Windows left running or failed by an earlier invocation are processed again first,
+and the cursor only moves past windows that are done, so an interrupted backfill resumes
+without gaps. Windows do not share days (the publication date filters include both ends), and
+windows that still overlap (the delayed check) are processed one at a time, so no paper is
+discovered by two pipelines at once. The monthly delayed check (the month three months back, re-scanned once a
+month for late-indexed works) is scheduled as one more window.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from src.config import BACKFILL_LIMIT_DATE, BACKFILL_WINDOW_DAYS, BACKFILL_WORKERS
+from src.db import db
+from src.discovery import Discovery
+from src.extractor import Extractor
+from src.filter import RelevanceFilter
+from src.logger import logger
+from src.main import process_papers, select_engine
+from src.pipeline import PaperPipeline, engine_slots
+
+# Window kinds
+BACKFILL = "backfill"
+DELAYED = "delayed"
+
+@dataclass(frozen=True)
+class Window:
+    kind: str
+    start_date: str
+    end_date: str
+
+def _parse(date_str: str) -> datetime:
+    return datetime.strptime(date_str, "%Y-%m-%d")
+
+def _format(date: datetime) -> str:
+    return date.strftime("%Y-%m-%d")
+
+class BackfillEngine:
+    """
+    Plans, runs and checkpoints backfill windows.
+
+    :param window_days: Length of a backfill window.
+    :param workers: Windows processed at the same time.
+    :param limit_date: Oldest publication date backfilled (YYYY-MM-DD).
+    """
+    def __init__(self, window_days: int = BACKFILL_WINDOW_DAYS, workers: int = BACKFILL_WORKERS,
+                 limit_date: str = BACKFILL_LIMIT_DATE, extractor: Extractor = None):
+        self.window_days = max(1, window_days)
+        self.workers = max(1, workers)
+        self.limit_date = limit_date
+        self.extractor = extractor or Extractor()
+        # One set of synthesis slots for all windows, so together they stay within SYNTHESIS_WORKERS
+        self.slots = engine_slots()
+
+    def plan(self, new_windows: int) -> list[Window]:
+        """
+        Windows to process now: the delayed check if it is due, the unfinished windows of earlier
+        invocations, then up to new_windows windows further back than any planned so far.
+        """
+        windows = []
+        delayed = self.delayed_check_window()
+        if delayed:
+            db.add_backfill_window(delayed.kind, delayed.start_date, delayed.end_date)
+            windows.append(delayed)
+        for row in db.get_backfill_windows(["pending", "running", "failed"]):
+            window = Window(row["kind"], row["start_date"], row["end_date"])
+            if window not in windows:
+                windows.append(window)
+
+        end = self._frontier()
+        limit = _parse(self.limit_date)
+        for _ in range(new_windows):
+            if end < limit:
+                logger.info(f"Backfill reached the limit ({self.limit_date}).")
+                break
+            start = max(end - timedelta(days=self.window_days - 1), limit)
+            window = Window(BACKFILL, _format(start), _format(end))
+            db.add_backfill_window(window.kind, window.start_date, window.end_date)
+            windows.append(window)
+            end = start - timedelta(days=1)
+        return windows
+
+    def run(self, windows: list[Window]) -> bool:
+        """Processes the windows (workers at a time) and moves the cursor. Returns whether all of them succeeded."""
+        if not windows:
+            logger.info("Nothing to backfill.")
+            return True
+        logger.info(f"Backfilling {len(windows)} windows, {min(self.workers, len(windows))} at a time.")
+        # Overlapping windows would filter and synthesize the same papers twice, racing on their rows and files
+        overlapping = [w for w in windows if any(o != w and o.start_date <= w.end_date and w.start_date <= o.end_date for o in windows)]
+        results = [self._run_window(window) for window in overlapping]
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            results += executor.map(self._run_window, [w for w in windows if w not in overlapping])
+        self._advance_cursor()
+        return all(results)
+
+    def delayed_check_window(self) -> Window:
+        """Once a month: the whole month three months back, to catch late-indexed articles (None if already done)."""
+        now = datetime.now()
+        if db.get_metadata("last_delayed_check_month") == now.strftime("%Y-%m"):
+            return None
+        # Example: If today is Feb 13, target is Nov 1 to Nov 30.
+        first_of_this_month = now.replace(day=1)
+        last_of_3_months_ago = (first_of_this_month - timedelta(days=60)).replace(day=1) - timedelta(days=1)
+        first_of_3_months_ago = last_of_3_months_ago.replace(day=1)
+        return Window(DELAYED, _format(first_of_3_months_ago), _format(last_of_3_months_ago))
+
+    def _frontier(self) -> datetime:
+        """End of the next new window: the cursor, or the day before the oldest window planned beyond it."""
+        cursor_str = db.get_metadata("backfill_cursor")
+        if not cursor_str:
+            # First time running: start from 7 days ago (stored, so later windows continue from it)
+            cursor_str = _format(datetime.now() - timedelta(days=7))
+            db.set_metadata("backfill_cursor", cursor_str)
+            logger.info(f"No backfill cursor found. Starting from 7 days ago: {cursor_str}")
+        frontier = _parse(cursor_str)
+        for row in db.get_backfill_windows():
+            if row["kind"] == BACKFILL:
+                frontier = min(frontier, _parse(row["start_date"]) - timedelta(days=1))
+        return frontier
+
+    def _advance_cursor(self):
+        """Moves the cursor (the end of the next window) back over the done windows that continue it without a gap."""
+        cursor_str = db.get_metadata("backfill_cursor")
+        done = {row["end_date"]: row["start_date"] for row in db.get_backfill_windows(["done"]) if row["kind"] == BACKFILL}
+        cursor = cursor_str
+        while cursor in done:
+            cursor = _format(_parse(done[cursor]) - timedelta(days=1))
+        if cursor != cursor_str:
+            db.set_metadata("backfill_cursor", cursor)
+            msg = f"Backfill cursor moved from {cursor_str} to {cursor}."
+            logger.info(msg)
+            db.add_event("BACKFILL_END", msg)
+
+    def _run_window(self, window: Window) -> bool:
+        """Discovers and processes the papers of one window, checkpointing its state."""
+        label = "DELAYED CHECK" if window.kind == DELAYED else "BACKFILL STEP"
+        msg = f"{label}: Processing from {window.start_date} to {window.end_date}"
+        logger.info(f">>> {msg}")
+        db.add_event("BACKFILL_DELAYED_START" if window.kind == DELAYED else "BACKFILL_START", msg)
+        db.set_backfill_window_status(window.kind, window.start_date, window.end_date, "running")
+
+        counts = {}
+        error = None
+        try:
+            discovery = Discovery(from_date=window.start_date, to_date=window.end_date)
+            relevance_filter = RelevanceFilter()
+            pipeline = PaperPipeline(relevance_filter, self.extractor, select_engine(), oa_lookup=discovery.fetch_oa_locations, slots=self.slots)
+            counts = process_papers(pipeline, discovery.iter_all_tasks(), backfill_mode=True)
+            relevance_filter.record_run_stats()
+            discovery.log_stats()
+            # A failed task would leave a hole in the window: it is run again next time
+            if discovery.failed_tasks:
+                error = f"discovery tasks failed: {', '.join(discovery.failed_tasks)}"
+        except Exception as e:
+            error = str(e)
+
+        papers, synthesized = counts.get("discovered", 0), counts.get("synthesized", 0)
+        if error:
+            error_msg = f"Backfill window {window.start_date} to {window.end_date} failed: {error}"
+            logger.error(error_msg)
+            db.add_event("ERROR", error_msg)
+            db.set_backfill_window_status(window.kind, window.start_date, window.end_date, "failed", papers, synthesized, error)
+            return False
+
+        db.set_backfill_window_status(window.kind, window.start_date, window.end_date, "done", papers, synthesized)
+        summary = f"{window.start_date} to {window.end_date}: {papers} papers, {synthesized} synthesized."
+        if window.kind == DELAYED:
+            db.set_metadata("last_delayed_check_month", datetime.now().strftime("%Y-%m"))
+            db.add_event("BACKFILL_DELAYED_END", f"Delayed check for {summary}")
+        else:
+            logger.info(f"Backfill window {summary}")
+        return True
@@ -12,9 +12,20 @@ SUMMARIES_DIR = DATA_DIR / "summaries"
 PAPERS_DIR = DATA_DIR / "papers"
 TEMPLATES_DIR = BASE_DIR / "templates"
 PUBLIC_DIR = BASE_DIR / "public"
+# PDF resolution: candidate sources downloaded at once, and the time budget per paper (seconds)
+PDF_PARALLEL_DOWNLOADS = int(os.getenv("PDF_PARALLEL_DOWNLOADS", "2"))
+PDF_RESOLVE_DEADLINE = float(os.getenv("PDF_RESOLVE_DEADLINE", "120"))
+# A PDF source that failed for a paper is retried after PDF_RETRY_BASE_HOURS, doubling after every
+# further failure up to PDF_RETRY_MAX_DAYS
+PDF_RETRY_BASE_HOURS = int(os.getenv("PDF_RETRY_BASE_HOURS", "24"))
+PDF_RETRY_MAX_DAYS = int(os.getenv("PDF_RETRY_MAX_DAYS", "90"))
+# Extracted texts are cached next to the PDFs; HTML-fallback texts are re-fetched after this many days
+HTML_TEXT_CACHE_TTL_DAYS = int(os.getenv("HTML_TEXT_CACHE_TTL_DAYS", "30"))
 
 # Database (Simple JSON or SQLite path)
 DB_PATH = DATA_DIR / "db.sqlite3"
+# 'per-call' opens a fresh connection per query (safest on NFS); 'persistent' keeps one per thread
+DB_CONNECTION_MODE = os.getenv("DB_CONNECTION_MODE", "per-call")
 
 # Local LLM (Ollama)
 OLLAMA_HOST = os.getenv("OLLAMA_HOST", "http://localhost:11434")
@@ -25,12 +36,28 @@ OLLAMA_MODEL = os.getenv("OLLAMA_MODEL", "gemma4:31b")
 RELEVANCE_ENGINE = os.getenv("RELEVANCE_ENGINE", "gemini")
 RELEVANCE_MODEL = os.getenv("RELEVANCE_MODEL", "gemini-2.5-flash")
 
+# Relevance verdict cache (keyed by title+abstract, system prompt and model)
+RELEVANCE_CACHE_TTL_DAYS = int(os.getenv("RELEVANCE_CACHE_TTL_DAYS", "365"))
+RELEVANCE_CACHE_MAX_ENTRIES = int(os.getenv("RELEVANCE_CACHE_MAX_ENTRIES", "100000"))
+
+# Batched relevance classification: papers per LLM request (1 disables batching) and the
+# Ollama context window used to size batches
+RELEVANCE_BATCH_SIZE = int(os.getenv("RELEVANCE_BATCH_SIZE", "10"))
+RELEVANCE_NUM_CTX = int(os.getenv("RELEVANCE_NUM_CTX", "8192"))
+
 # Synthesis Engine ('gemini-api', 'gemini-cli', or 'ollama')
 SYNTHESIS_ENGINE = os.getenv("SYNTHESIS_ENGINE", "gemini-api")
 
 # Remote LLM (Gemini)
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-2.5-flash")
+# Paper text sent to synthesis is trimmed to the engine's token budget (see src/text_reducer.py):
+# the Ollama context window minus prompt and answer, or a fixed cap for Gemini
+OLLAMA_SYNTHESIS_NUM_CTX = int(os.getenv("OLLAMA_SYNTHESIS_NUM_CTX", "12288"))
+SYNTHESIS_OUTPUT_TOKENS = int(os.getenv("SYNTHESIS_OUTPUT_TOKENS", "2048"))
+GEMINI_SYNTHESIS_TOKEN_BUDGET = int(os.getenv("GEMINI_SYNTHESIS_TOKEN_BUDGET", "100000"))
+# Lifetime of the cached-content objects holding the fixed prompts (0 sends them as a plain system instruction)
+GEMINI_CACHE_TTL_SECONDS = int(os.getenv("GEMINI_CACHE_TTL_SECONDS", "3600"))
 
 # Deployment
 REMOTE_HOST = os.getenv("REMOTE_HOST", "your.server.com")
@@ -39,11 +66,58 @@ REMOTE_PATH = os.getenv("REMOTE_PATH", "/var/www/biblio/")
 SITE_URL = os.getenv("SITE_URL", "https://biblio.quintanasegui.com")
 SITE_TITLE = "Hydrology and Climate Change Article Summaries"
 
+# Shared HTTP client (connection pooling / keep-alive)
+HTTP_POOL_CONNECTIONS = int(os.getenv("HTTP_POOL_CONNECTIONS", "32")) # Hosts kept alive at once
+HTTP_POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", "8")) # Connections per host
+HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", "30"))
+# On-disk cache of OpenAlex entity lookups (src/http_cache.py): freshness in days per endpoint
+# type, after which entries are revalidated (ETag/Last-Modified), and the size limit
+HTTP_CACHE_PATH = DATA_DIR / "http_cache.sqlite3"
+HTTP_CACHE_TTL_DAYS = {
+    "sources": float(os.getenv("HTTP_CACHE_TTL_SOURCES_DAYS", "30")),
+    "authors": float(os.getenv("HTTP_CACHE_TTL_AUTHORS_DAYS", "7")),
+    "works": float(os.getenv("HTTP_CACHE_TTL_WORKS_DAYS", "7")),
+    "default": 1,
+}
+HTTP_CACHE_MAX_MB = int(os.getenv("HTTP_CACHE_MAX_MB", "200"))
+
 # Budget Control
 MAX_MONTHLY_COST = float(os.getenv("MAX_MONTHLY_COST", "10.0"))
 
+# Pipelined processing (src/pipeline.py): worker threads per stage and size of the queues between stages
+PIPELINE_DOWNLOAD_WORKERS = int(os.getenv("PIPELINE_DOWNLOAD_WORKERS", "4"))
+PIPELINE_EXTRACT_WORKERS = int(os.getenv("PIPELINE_EXTRACT_WORKERS", "2"))
+PIPELINE_QUEUE_SIZE = int(os.getenv("PIPELINE_QUEUE_SIZE", "4"))
+# Concurrent syntheses per engine (a local Ollama generates one summary at a time)
+SYNTHESIS_WORKERS = {
+    "ollama": 1,
+    "gemini": 1,
+    "gemini-api": int(os.getenv("GEMINI_SYNTHESIS_WORKERS", "2")),
+}
+
 # OpenAlex Discovery
 OPENALEX_EMAIL = os.getenv("OPENALEX_EMAIL", "your-email@example.com")
+# Optional API key, sent with discovery requests (needed for the watermark filters below)
+OPENALEX_API_KEY = os.getenv("OPENALEX_API_KEY")
+# Concurrency and global request budget for discovery tasks.
+# OPENALEX_RATE_LIMIT is in requests/second; 0 picks a default based on the polite pool.
+OPENALEX_MAX_WORKERS = int(os.getenv("OPENALEX_MAX_WORKERS", "4"))
+OPENALEX_RATE_LIMIT = float(os.getenv("OPENALEX_RATE_LIMIT", "0"))
+# Incremental discovery (requires OPENALEX_API_KEY, since OpenAlex only accepts the
+# from_created_date/from_updated_date filters from entitled keys): once a task has succeeded,
+# later runs only query works created in OpenAlex since then (a per-task watermark in the metadata table), published at most
+# DISCOVERY_MAX_AGE_DAYS ago (also the window of a task's first run).
+# from_updated_date also re-fetches works whose record changed (e.g. an abstract was added),
+# which includes every citation count update; "off" queries the publication date window only.
+DISCOVERY_WATERMARK_FILTER = os.getenv("DISCOVERY_WATERMARK_FILTER", "from_created_date")
+DISCOVERY_MAX_AGE_DAYS = int(os.getenv("DISCOVERY_MAX_AGE_DAYS", "90"))
+# Historical backfill (backfill.py, src/backfill.py): windows of BACKFILL_WINDOW_DAYS, up to
+# BACKFILL_WINDOWS_PER_RUN new ones per invocation, BACKFILL_WORKERS of them processed at a time,
+# going back to BACKFILL_LIMIT_DATE
+BACKFILL_WINDOW_DAYS = int(os.getenv("BACKFILL_WINDOW_DAYS", "7"))
+BACKFILL_WINDOWS_PER_RUN = int(os.getenv("BACKFILL_WINDOWS_PER_RUN", "4"))
+BACKFILL_WORKERS = int(os.getenv("BACKFILL_WORKERS", "2"))
+BACKFILL_LIMIT_DATE = os.getenv("BACKFILL_LIMIT_DATE", "2000-01-01")
 # Journal Quality Defaults (OpenAlex metrics)
 MIN_JOURNAL_H_INDEX = int(os.getenv("MIN_JOURNAL_H_INDEX", "50"))
 MIN_JOURNAL_IMPACT_FACTOR = float(os.getenv("MIN_JOURNAL_IMPACT_FACTOR", "2.0"))
@@ -1,139 +1,319 @@
+import atexit
 import sqlite3
+import threading
 import time
 from pathlib import Path
-from src.config import DB_PATH
+from src.config import DB_PATH, DB_CONNECTION_MODE
 from src.logger import logger
 from typing import Optional, List, Dict
 from contextlib import contextmanager
 
+def _add_missing_columns(cursor, table: str, columns: list[tuple[str, str]]):
+    """Adds columns that databases created by older versions lack."""
+    cursor.execute(f"PRAGMA table_info({table})")
+    existing = [row[1] for row in cursor.fetchall()]
+    for col, col_type in columns:
+        if col not in existing:
+            logger.info(f"Migrating database: adding {col} column to {table}.")
+            cursor.execute(f'ALTER TABLE {table} ADD COLUMN {col} {col_type}')
+
+def _migration_base_schema(cursor):
+    """Creates the original schema (and upgrades pre-versioning databases to it)."""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS seen_papers (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            doi TEXT UNIQUE,
+            link TEXT UNIQUE,
+            title TEXT,
+            processed_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            source_id TEXT,
+            type TEXT,
+            source_url TEXT,
+            is_relevant INTEGER DEFAULT 0,
+            relevance_reason TEXT
+        )
+    ''')
+    _add_missing_columns(cursor, "seen_papers", [
+        ('source_id', 'TEXT'),
+        ('type', 'TEXT'),
+        ('source_url', 'TEXT'),
+        ('is_relevant', 'INTEGER DEFAULT 0'),
+        ('relevance_reason', 'TEXT')
+    ])
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS journals (
+            id TEXT PRIMARY KEY,
+            name TEXT,
+            url TEXT,
+            issn TEXT,
+            h_index INTEGER,
+            impact_factor REAL,
+            added_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    _add_missing_columns(cursor, "journals", [
+        ('url', 'TEXT'),
+        ('issn', 'TEXT'),
+        ('h_index', 'INTEGER'),
+        ('impact_factor', 'REAL'),
+        ('added_date', 'TIMESTAMP DEFAULT CURRENT_TIMESTAMP')
+    ])
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS monitored_journals (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            source_id TEXT UNIQUE,
+            added_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS monitored_authors (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            author_id TEXT UNIQUE,
+            added_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS authors (
+            id TEXT PRIMARY KEY,
+            name TEXT,
+            added_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS paper_authors (
+            paper_id INTEGER,
+            author_id TEXT,
+            PRIMARY KEY (paper_id, author_id),
+            FOREIGN KEY (paper_id) REFERENCES seen_papers(id),
+            FOREIGN KEY (author_id) REFERENCES authors(id)
+        )
+    ''')
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS events (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            event_type TEXT,
+            message TEXT,
+            timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS usage (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            model TEXT,
+            prompt_tokens INTEGER,
+            completion_tokens INTEGER,
+            total_tokens INTEGER,
+            cost REAL,
+            timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS metadata (
+            key TEXT PRIMARY KEY,
+            value TEXT,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+def _migration_query_indexes(cursor):
+    """Indexes for the promotion, budget, audit and site generator queries."""
+    # get_promotable_journals / get_all_journals: filter is_relevant, group by source_id
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_seen_papers_relevant_source ON seen_papers(is_relevant, source_id)')
+    # get_all_paper_journals / get_distinct_journal_urls: covering index for the generator lookups
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_seen_papers_source ON seen_papers(source_id, link, source_url)')
+    # get_recent_papers_by_days: range on processed_date, ordered by it
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_seen_papers_processed_date ON seen_papers(processed_date)')
+    # get_promotable_authors: group by author_id (the primary key starts with paper_id)
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_paper_authors_author ON paper_authors(author_id, paper_id)')
+    # get_monthly_cost: covering index for SUM(cost) over a timestamp range
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_usage_timestamp ON usage(timestamp, cost)')
+    # get_recent_events: ORDER BY timestamp DESC LIMIT n
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_events_timestamp ON events(timestamp)')
+
+def _migration_relevance_cache(cursor):
+    """Cache of LLM relevance verdicts, so re-runs and overlapping backfills do not pay twice."""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS relevance_cache (
+            content_hash TEXT,
+            prompt_hash TEXT,
+            model TEXT,
+            is_relevant INTEGER,
+            reason TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            last_used TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (content_hash, prompt_hash, model)
+        )
+    ''')
+    # prune_relevance_cache: TTL and least-recently-used eviction
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_relevance_cache_last_used ON relevance_cache(last_used)')
+
+def _migration_usage_saved_tokens(cursor):
+    """Prompt tokens avoided by batching (e.g. the relevance system prompt sent once per batch)."""
+    _add_missing_columns(cursor, "usage", [('saved_prompt_tokens', 'INTEGER DEFAULT 0')])
+
+def _migration_usage_cached_tokens(cursor):
+    """Prompt tokens served from the Gemini context cache (billed at the cached-token rate)."""
+    _add_missing_columns(cursor, "usage", [('cached_prompt_tokens', 'INTEGER DEFAULT 0')])
+
+def _migration_pdf_host_stats(cursor):
+    """Per-host PDF download outcomes, used to rank candidate PDF URLs."""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS pdf_host_stats (
+            host TEXT PRIMARY KEY,
+            attempts INTEGER DEFAULT 0,
+            successes INTEGER DEFAULT 0,
+            last_attempt TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+def _migration_pdf_failures(cursor):
+    """Negative-result cache of PDF sources per paper, with exponential retry windows."""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS pdf_failures (
+            doi TEXT,
+            url TEXT,
+            host TEXT,
+            status INTEGER,
+            content_type TEXT,
+            failures INTEGER DEFAULT 1,
+            failed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            retry_after TIMESTAMP,
+            PRIMARY KEY (doi, url)
+        )
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_pdf_failures_host ON pdf_failures(host)')
+    _add_missing_columns(cursor, "pdf_host_stats", [
+        ('last_status', 'INTEGER'),
+        ('last_content_type', 'TEXT'),
+    ])
+
+def _migration_backfill_windows(cursor):
+    """Checkpoints of the backfill engine: one row per discovery window and its state."""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS backfill_windows (
+            kind TEXT,
+            start_date TEXT,
+            end_date TEXT,
+            status TEXT DEFAULT 'pending',
+            papers INTEGER DEFAULT 0,
+            synthesized INTEGER DEFAULT 0,
+            error TEXT,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (kind, start_date, end_date)
+        )
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_backfill_windows_status ON backfill_windows(status)')
+
+# Ordered schema migrations: (version, description, function). PRAGMA user_version stores the
+# last applied version. Append new migrations at the end; never edit or renumber applied ones.
+MIGRATIONS = [
+    (1, "base schema", _migration_base_schema),
+    (2, "indexes for promotion, budget, audit and generator queries", _migration_query_indexes),
+    (3, "relevance verdict cache", _migration_relevance_cache),
+    (4, "usage.saved_prompt_tokens", _migration_usage_saved_tokens),
+    (5, "usage.cached_prompt_tokens", _migration_usage_cached_tokens),
+    (6, "PDF host statistics", _migration_pdf_host_stats),
+    (7, "PDF failure cache", _migration_pdf_failures),
+    (8, "backfill window checkpoints", _migration_backfill_windows),
+]
+
 class Database:
-    def __init__(self, db_path: Path = DB_PATH):
+    """
+    SQLite access layer.
+
+    :param db_path: Path to the SQLite file.
+    :param mode: 'per-call' opens and closes a connection for every method call (safest on NFS);
+                 'persistent' keeps one long-lived connection per thread, so the busy_timeout
+                 pragma is issued once and prepared statements stay in the connection's cache.
+    """
+    def __init__(self, db_path: Path = DB_PATH, mode: str = DB_CONNECTION_MODE):
+        if mode not in ("per-call", "persistent"):
+            raise ValueError(f"Unknown database connection mode: {mode}")
         self.db_path = db_path
+        self.mode = mode
+        self.connections_opened = 0
+        self._local = threading.local()
+        self._persistent_conns = []
+        self._conns_lock = threading.Lock()
+        if mode == "persistent":
+            atexit.register(self.close)
         self._init_db()
 
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=60, cached_statements=256, check_same_thread=self.mode != "persistent")
+        conn.execute('PRAGMA busy_timeout=60000;')
+        self.connections_opened += 1
+        return conn
+
     @contextmanager
     def _get_conn(self):
-        """Context manager for database connections to ensure they are always closed."""
-        conn = sqlite3.connect(self.db_path, timeout=60)
+        """Context manager for database connections to ensure they are always closed (or returned, in persistent mode)."""
+        if self.mode != "persistent":
+            conn = self._connect()
+            try:
+                yield conn
+            finally:
+                conn.close()
+            return
+
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._connect()
+            self._local.conn = conn
+            self._local.depth = 0
+            with self._conns_lock:
+                self._persistent_conns.append(conn)
+
+        self._local.depth += 1
         try:
-            conn.execute('PRAGMA busy_timeout=60000;')
             yield conn
         finally:
-            conn.close()
+            self._local.depth -= 1
+            # Methods commit explicitly. Anything still pending when the outermost caller
+            # exits (an error, or a write without commit) is rolled back, as closing would.
+            if self._local.depth == 0 and conn.in_transaction:
+                conn.rollback()
+
+    def close(self):
+        """Closes all persistent connections. Safe to call more than once (no-op in per-call mode)."""
+        with self._conns_lock:
+            conns, self._persistent_conns = self._persistent_conns, []
+        for conn in conns:
+            try:
+                conn.close()
+            except sqlite3.Error as e:
+                logger.warning(f"Error closing database connection: {e}")
+        self._local = threading.local()
 
     def _init_db(self):
-        """Initialize the database schema and handle migrations."""
+        """Initialize the database schema by applying any pending migrations."""
         with self._get_conn() as conn:
             cursor = conn.cursor()
             # TRUNCATE is safer than WAL on NFS but faster than DELETE
             cursor.execute('PRAGMA journal_mode=TRUNCATE;')
-            cursor.execute('PRAGMA busy_timeout=60000;')
-            
-            # 1. Ensure seen_papers exists
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS seen_papers (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    doi TEXT UNIQUE,
-                    link TEXT UNIQUE,
-                    title TEXT,
-                    processed_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            
-            # 2. Migration: Add columns if they don't exist
-            cursor.execute("PRAGMA table_info(seen_papers)")
-            columns = [row[1] for row in cursor.fetchall()]
-            for col, col_type in [
-                ('source_id', 'TEXT'),
-                ('type', 'TEXT'),
-                ('source_url', 'TEXT'),
-                ('is_relevant', 'INTEGER DEFAULT 0'),
-                ('relevance_reason', 'TEXT')
-            ]:
-                if col not in columns:
-                    logger.info(f"Migrating database: adding {col} column to seen_papers.")
-                    cursor.execute(f'ALTER TABLE seen_papers ADD COLUMN {col} {col_type}')
-
-            # Migration for journals table (checking existence first)
-            cursor.execute("CREATE TABLE IF NOT EXISTS journals (id TEXT PRIMARY KEY, name TEXT)")
-            cursor.execute("PRAGMA table_info(journals)")
-            j_columns = [row[1] for row in cursor.fetchall()]
-            for col, col_type in [
-                ('url', 'TEXT'),
-                ('issn', 'TEXT'),
-                ('h_index', 'INTEGER'),
-                ('impact_factor', 'REAL'),
-                ('added_date', 'TIMESTAMP DEFAULT CURRENT_TIMESTAMP')
-            ]:
-                if col not in j_columns:
-                    logger.info(f"Migrating database: adding {col} column to journals.")
-                    cursor.execute(f'ALTER TABLE journals ADD COLUMN {col} {col_type}')
-
-            # 3. Create Supporting Tables
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS monitored_journals (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    source_id TEXT UNIQUE,
-                    added_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS monitored_authors (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    author_id TEXT UNIQUE,
-                    added_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS authors (
-                    id TEXT PRIMARY KEY,
-                    name TEXT,
-                    added_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS paper_authors (
-                    paper_id INTEGER,
-                    author_id TEXT,
-                    PRIMARY KEY (paper_id, author_id),
-                    FOREIGN KEY (paper_id) REFERENCES seen_papers(id),
-                    FOREIGN KEY (author_id) REFERENCES authors(id)
-                )
-            ''')
-
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS events (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    event_type TEXT,
-                    message TEXT,
-                    timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS usage (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    model TEXT,
-                    prompt_tokens INTEGER,
-                    completion_tokens INTEGER,
-                    total_tokens INTEGER,
-                    cost REAL,
-                    timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS metadata (
-                    key TEXT PRIMARY KEY,
-                    value TEXT,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
             
-            conn.commit()
+            current_version = cursor.execute('PRAGMA user_version').fetchone()[0]
+            for version, description, migrate in MIGRATIONS:
+                if version <= current_version:
+                    continue
+                logger.info(f"Migrating database to schema version {version}: {description}")
+                try:
+                    # Each migration and its version bump are applied atomically
+                    cursor.execute('BEGIN')
+                    migrate(cursor)
+                    cursor.execute(f'PRAGMA user_version = {int(version)}')
+                    conn.commit()
+                except Exception:
+                    conn.rollback()
+                    raise
 
     def get_metadata(self, key: str, default: str = None) -> Optional[str]:
         """Fetch a value from the metadata table."""
@@ -160,6 +340,39 @@ class Database:
         """Returns the date of the last successful pipeline run."""
         return self.get_metadata("last_run_date")
 
+    def add_backfill_window(self, kind: str, start_date: str, end_date: str):
+        """Records a planned backfill window (no-op if it is already known)."""
+        with self._get_conn() as conn:
+            conn.execute(
+                'INSERT OR IGNORE INTO backfill_windows (kind, start_date, end_date) VALUES (?, ?, ?)',
+                (kind, start_date, end_date)
+            )
+            conn.commit()
+
+    def set_backfill_window_status(self, kind: str, start_date: str, end_date: str, status: str,
+                                   papers: int = 0, synthesized: int = 0, error: str = None):
+        """Checkpoints a backfill window: 'running', 'done' or 'failed' (with the counts of its run)."""
+        with self._get_conn() as conn:
+            conn.execute(
+                'UPDATE backfill_windows SET status = ?, papers = ?, synthesized = ?, error = ?, updated_at = CURRENT_TIMESTAMP '
+                'WHERE kind = ? AND start_date = ? AND end_date = ?',
+                (status, papers, synthesized, error, kind, start_date, end_date)
+            )
+            conn.commit()
+
+    def get_backfill_windows(self, statuses: list[str] = None) -> list[dict]:
+        """Backfill windows (optionally only those in the given states), most recent first."""
+        query = 'SELECT kind, start_date, end_date, status, papers, synthesized, error FROM backfill_windows'
+        params = []
+        if statuses:
+            query += f' WHERE status IN ({",".join("?" * len(statuses))})'
+            params = list(statuses)
+        with self._get_conn() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = sqlite3.Row
+            cursor.execute(query + ' ORDER BY end_date DESC', params)
+            return [dict(row) for row in cursor.fetchall()]
+
     def update_last_run_date(self, date_str: str = None):
         """Updates the last run date to today or a specific date."""
         if not date_str:
@@ -178,6 +391,40 @@ class Database:
             result = cursor.fetchone()
             return result is not None
 
+    def filter_unseen(self, papers: list, chunk_size: int = 400) -> list:
+        """
+        Bulk variant of is_seen: returns the papers (in order) whose link and DOI are not yet in seen_papers.
+        Uses a single connection and one IN query per chunk instead of one connection per paper.
+        """
+        if not papers:
+            return []
+
+        seen_links = set()
+        seen_dois = set()
+        with self._get_conn() as conn:
+            cursor = conn.cursor()
+            for i in range(0, len(papers), chunk_size):
+                chunk = papers[i:i + chunk_size]
+                links = [p.link for p in chunk if p.link]
+                dois = [p.doi for p in chunk if p.doi]
+                
+                conditions = []
+                if links:
+                    conditions.append(f"link IN ({','.join('?' * len(links))})")
+                if dois:
+                    conditions.append(f"doi IN ({','.join('?' * len(dois))})")
+                if not conditions:
+                    continue
+                
+                cursor.execute(f"SELECT link, doi FROM seen_papers WHERE {' OR '.join(conditions)}", links + dois)
+                for link, doi in cursor.fetchall():
+                    if link:
+                        seen_links.add(link)
+                    if doi:
+                        seen_dois.add(doi)
+
+        return [p for p in papers if p.link not in seen_links and not (p.doi and p.doi in seen_dois)]
+
     def get_all_processed_dates(self) -> dict:
         """Returns a dictionary mapping link -> processed_date (datetime object)."""
         from datetime import datetime
@@ -276,8 +523,8 @@ class Database:
     def get_recent_papers_by_days(self, days: int = 7) -> list:
         """Returns list of papers processed in the last X days for filter audit."""
         with self._get_conn() as conn:
-            conn.row_factory = sqlite3.Row
             cursor = conn.cursor()
+            cursor.row_factory = sqlite3.Row
             cursor.execute('''
                 SELECT title, link, doi, processed_date, is_relevant, relevance_reason
                 FROM seen_papers
@@ -298,26 +545,169 @@ class Database:
 
     def get_recent_events(self, limit: int = 50) -> list:
         with self._get_conn() as conn:
-            conn.row_factory = sqlite3.Row
             cursor = conn.cursor()
+            cursor.row_factory = sqlite3.Row
             cursor.execute('SELECT event_type, message, timestamp FROM events ORDER BY timestamp DESC LIMIT ?', (limit,))
             rows = cursor.fetchall()
             return [dict(row) for row in rows]
 
-    def add_usage(self, model: str, prompt_tokens: int, completion_tokens: int, cost: float):
-        """Record LLM API usage and cost."""
+    def add_usage(self, model: str, prompt_tokens: int, completion_tokens: int, cost: float, saved_prompt_tokens: int = 0, cached_prompt_tokens: int = 0):
+        """Record LLM API usage and cost (plus the prompt tokens batching avoided and those served from a context cache)."""
         total_tokens = (prompt_tokens or 0) + (completion_tokens or 0)
         try:
             with self._get_conn() as conn:
                 cursor = conn.cursor()
                 cursor.execute(
-                    'INSERT INTO usage (model, prompt_tokens, completion_tokens, total_tokens, cost) VALUES (?, ?, ?, ?, ?)',
-                    (model, prompt_tokens, completion_tokens, total_tokens, cost)
+                    'INSERT INTO usage (model, prompt_tokens, completion_tokens, total_tokens, cost, saved_prompt_tokens, cached_prompt_tokens) VALUES (?, ?, ?, ?, ?, ?, ?)',
+                    (model, prompt_tokens, completion_tokens, total_tokens, cost, saved_prompt_tokens, cached_prompt_tokens)
                 )
                 conn.commit()
         except Exception as e:
             logger.error(f"Error recording usage: {e}")
 
+    def get_cached_verdict(self, content_hash: str, prompt_hash: str, model: str, ttl_days: int) -> Optional[tuple[bool, str]]:
+        """Returns a cached (is_relevant, reason) younger than ttl_days, or None. Hits refresh last_used."""
+        try:
+            with self._get_conn() as conn:
+                cursor = conn.cursor()
+                cursor.execute('''
+                    SELECT is_relevant, reason FROM relevance_cache
+                    WHERE content_hash = ? AND prompt_hash = ? AND model = ? AND created_at >= datetime('now', ?)
+                ''', (content_hash, prompt_hash, model, f'-{int(ttl_days)} days'))
+                row = cursor.fetchone()
+                if row is None:
+                    return None
+                cursor.execute(
+                    'UPDATE relevance_cache SET last_used = CURRENT_TIMESTAMP WHERE content_hash = ? AND prompt_hash = ? AND model = ?',
+                    (content_hash, prompt_hash, model)
+                )
+                conn.commit()
+                return bool(row[0]), row[1]
+        except Exception as e:
+            logger.error(f"Error reading relevance cache: {e}")
+            return None
+
+    def cache_verdict(self, content_hash: str, prompt_hash: str, model: str, is_relevant: bool, reason: str):
+        try:
+            with self._get_conn() as conn:
+                cursor = conn.cursor()
+                cursor.execute('''
+                    INSERT OR REPLACE INTO relevance_cache (content_hash, prompt_hash, model, is_relevant, reason)
+                    VALUES (?, ?, ?, ?, ?)
+                ''', (content_hash, prompt_hash, model, 1 if is_relevant else 0, reason))
+                conn.commit()
+        except Exception as e:
+            logger.error(f"Error writing relevance cache: {e}")
+
+    def prune_relevance_cache(self, prompt_hash: str, ttl_days: int, max_entries: int) -> int:
+        """
+        Evicts verdicts made with another system prompt, older than ttl_days, and the least
+        recently used ones beyond max_entries. Returns the number of rows removed.
+        """
+        try:
+            with self._get_conn() as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    "DELETE FROM relevance_cache WHERE prompt_hash != ? OR created_at < datetime('now', ?)",
+                    (prompt_hash, f'-{int(ttl_days)} days')
+                )
+                removed = cursor.rowcount
+                cursor.execute('''
+                    DELETE FROM relevance_cache WHERE rowid IN (
+                        SELECT rowid FROM relevance_cache ORDER BY last_used DESC LIMIT -1 OFFSET ?
+                    )
+                ''', (int(max_entries),))
+                removed += cursor.rowcount
+                conn.commit()
+                return removed
+        except Exception as e:
+            logger.error(f"Error pruning relevance cache: {e}")
+            return 0
+
+    def record_pdf_attempt(self, host: str, success: bool):
+        """Counts one PDF download attempt (and whether it produced a PDF) for a host."""
+        try:
+            with self._get_conn() as conn:
+                cursor = conn.cursor()
+                cursor.execute('''
+                    INSERT INTO pdf_host_stats (host, attempts, successes) VALUES (?, 1, ?)
+                    ON CONFLICT(host) DO UPDATE SET
+                        attempts = attempts + 1,
+                        successes = successes + excluded.successes,
+                        last_attempt = CURRENT_TIMESTAMP
+                ''', (host, 1 if success else 0))
+                conn.commit()
+        except Exception as e:
+            logger.error(f"Error recording PDF attempt for {host}: {e}")
+
+    def record_pdf_failure(self, doi: str, url: str, host: str, status: Optional[int], content_type: Optional[str],
+                           base_hours: int, max_days: int):
+        """
+        Records a failed PDF source for a paper. It is retried after base_hours, doubling with
+        every further failure up to max_days. Also keeps the host's last failure for diagnosis.
+        """
+        try:
+            with self._get_conn() as conn:
+                cursor = conn.cursor()
+                cursor.execute('''
+                    INSERT INTO pdf_failures (doi, url, host, status, content_type, retry_after)
+                    VALUES (?, ?, ?, ?, ?, datetime('now', '+' || ? || ' hours'))
+                    ON CONFLICT(doi, url) DO UPDATE SET
+                        status = excluded.status,
+                        content_type = excluded.content_type,
+                        failures = failures + 1,
+                        failed_at = CURRENT_TIMESTAMP,
+                        retry_after = datetime('now', '+' || MIN(? * (1 << MIN(failures, 16)), ? * 24) || ' hours')
+                ''', (doi, url, host, status, content_type, int(base_hours), int(base_hours), int(max_days)))
+                cursor.execute(
+                    'UPDATE pdf_host_stats SET last_status = ?, last_content_type = ? WHERE host = ?',
+                    (status, content_type, host)
+                )
+                conn.commit()
+        except Exception as e:
+            logger.error(f"Error recording PDF failure for {url}: {e}")
+
+    def get_blocked_pdf_sources(self, doi: str, urls: list[str]) -> set[str]:
+        """Returns the urls (or source names) of a paper that are still inside their retry window."""
+        urls = [u for u in set(urls) if u]
+        if not urls:
+            return set()
+        try:
+            with self._get_conn() as conn:
+                cursor = conn.cursor()
+                placeholders = ",".join("?" * len(urls))
+                cursor.execute(
+                    f"SELECT url FROM pdf_failures WHERE doi = ? AND url IN ({placeholders}) AND retry_after > datetime('now')",
+                    [doi, *urls]
+                )
+                return {row[0] for row in cursor.fetchall()}
+        except Exception as e:
+            logger.error(f"Error reading PDF failure cache: {e}")
+            return set()
+
+    def clear_pdf_failure(self, doi: str, url: str):
+        try:
+            with self._get_conn() as conn:
+                conn.execute('DELETE FROM pdf_failures WHERE doi = ? AND url = ?', (doi, url))
+                conn.commit()
+        except Exception as e:
+            logger.error(f"Error clearing PDF failure for {url}: {e}")
+
+    def get_pdf_host_stats(self, hosts: list[str]) -> dict[str, tuple[int, int]]:
+        """Returns host -> (attempts, successes) for the given hosts that have been tried before."""
+        hosts = list(set(hosts))
+        if not hosts:
+            return {}
+        try:
+            with self._get_conn() as conn:
+                cursor = conn.cursor()
+                placeholders = ",".join("?" * len(hosts))
+                cursor.execute(f'SELECT host, attempts, successes FROM pdf_host_stats WHERE host IN ({placeholders})', hosts)
+                return {host: (attempts, successes) for host, attempts, successes in cursor.fetchall()}
+        except Exception as e:
+            logger.error(f"Error reading PDF host stats: {e}")
+            return {}
+
     def get_monthly_cost(self) -> float:
         with self._get_conn() as conn:
             cursor = conn.cursor()
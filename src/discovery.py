@@ -1,20 +1,142 @@
+import hashlib
+import io
+import json
+import queue
 import requests
+import threading
 import time
-from datetime import datetime
-from typing import List
-from src.config import OPENALEX_EMAIL, DISCOVERY_TASKS, MIN_JOURNAL_H_INDEX, MIN_JOURNAL_IMPACT_FACTOR
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Iterator, List
+from src.config import OPENALEX_API_KEY, OPENALEX_EMAIL, OPENALEX_MAX_WORKERS, OPENALEX_RATE_LIMIT, DISCOVERY_TASKS, DISCOVERY_MAX_AGE_DAYS, DISCOVERY_WATERMARK_FILTER, MIN_JOURNAL_H_INDEX, MIN_JOURNAL_IMPACT_FACTOR
 from src.models import Paper
 from src.logger import logger
 from src.db import db
-from src.utils import retry
+from src.http_cache import HttpCache, openalex_cache
+from src.http_client import HttpClient, http_client
+from src.utils import retry, RateLimiter
+
+try:
+    import ijson  # Parses result pages incrementally from the response stream (whole pages without it)
+except ImportError:
+    ijson = None
+
+# Root-level work fields read by _fetch_openalex and _oa_pdf_urls, sent as select= so OpenAlex
+# leaves out referenced_works, related_works, counts_by_year, mesh, ... (select only projects top-level fields)
+WORK_FIELDS = [
+    "id", "doi", "title", "type", "publication_date", "primary_location", "abstract_inverted_index",
+    "authorships", "topics", "concepts", "best_oa_location", "locations", "open_access",
+]
+# Largest page OpenAlex serves (with cursor pagination)
+MAX_PER_PAGE = 200
+# Marks the end of a task's papers in the queue of iter_all_tasks
+_TASK_DONE = object()
+# DOIs per batched OpenAlex lookup of open-access locations (OR filters take up to 100 values)
+OA_LOOKUP_BATCH_SIZE = 50
+# After a run with papers left unseen (failed, or without text), watermarks stay at least this
+# far back so those papers are found again
+RETRY_DAYS = 7
+
+def reconstruct_abstract(inverted_index: dict) -> str:
+    """
+    Rebuilds an abstract from the inverted index OpenAlex serves ({word: [positions]}) by
+    writing every word straight into a list indexed by position (no sort).
+    """
+    if not inverted_index:
+        return ""
+    size = max((max(positions) for positions in inverted_index.values() if positions), default=-1) + 1
+    words = [None] * size
+    for word, positions in inverted_index.items():
+        for pos in positions:
+            words[pos] = word
+    # Positions missing from the index are skipped, as by the former sort-based version
+    if None in words:
+        words = [word for word in words if word is not None]
+    return " ".join(words)
+
+def reconstruct_abstracts(inverted_indexes: List[dict]) -> List[str]:
+    """Bulk variant of reconstruct_abstract for the works of a results page."""
+    return [reconstruct_abstract(inverted_index) for inverted_index in inverted_indexes]
+
+def _default_rate_limit(email: str) -> float:
+    """Requests/second budget: OpenAlex allows ~10 req/s, but only the polite pool (mailto) reliably."""
+    if OPENALEX_RATE_LIMIT > 0:
+        return OPENALEX_RATE_LIMIT
+    if email and not email.endswith("@example.com"):
+        return 8.0
+    return 4.0
+
+# Shared by every Discovery instance so concurrent tasks stay within a single global budget
+openalex_limiter = RateLimiter(_default_rate_limit(OPENALEX_EMAIL))
+
+class _PageReader:
+    """
+    File-like view of a response body for ijson: counts the (decoded) bytes read through it
+    and keeps the first chunk, which holds the "meta" object OpenAlex sends before the results.
+    """
+    def __init__(self, response: requests.Response):
+        self.raw = response.raw
+        self.head = None
+        self.bytes = 0
+
+    def read(self, size: int = -1) -> bytes:
+        data = self.raw.read(size, decode_content=True)
+        if self.head is None and data:  # ijson starts with read(0) to check the stream type
+            self.head = data
+        self.bytes += len(data)
+        return data
+
+    def next_cursor(self):
+        """The meta.next_cursor of the page (None on the last page), parsed from the first chunk."""
+        try:
+            for prefix, _, value in ijson.parse(io.BytesIO(self.head or b"")):
+                if prefix == "meta.next_cursor":
+                    return value
+                if prefix == "results":
+                    break
+        except ijson.IncompleteJSONError:
+            pass
+        raise ValueError("no meta.next_cursor before the results")
 
 class Discovery:
-    def __init__(self, email: str = OPENALEX_EMAIL, from_date: str = None, to_date: str = None):
+    """
+    Runs the discovery tasks against the OpenAlex works endpoint.
+
+    With incremental=True (normal daily runs) and an API key (OpenAlex only accepts the
+    created/updated date filters from entitled keys), a task that succeeded before only
+    queries the works created (DISCOVERY_WATERMARK_FILTER) since the day of its last success,
+    within the last DISCOVERY_MAX_AGE_DAYS of publication dates. The watermark of each task
+    that ran without errors is stored by save_watermarks() at the end of the run; tasks
+    without one query the publication date window from_date..to_date.
+    """
+    def __init__(self, email: str = OPENALEX_EMAIL, from_date: str = None, to_date: str = None, max_workers: int = OPENALEX_MAX_WORKERS, rate_limiter: RateLimiter = None, http: HttpClient = None, cache: HttpCache = None, incremental: bool = False, api_key: str = OPENALEX_API_KEY):
         self.base_url = "https://api.openalex.org/works"
         self.params = {"mailto": email} if email else {}
+        if api_key:
+            self.params["api_key"] = api_key
+        self.max_workers = max(1, max_workers)
+        self.rate_limiter = rate_limiter or openalex_limiter
+        self.http = http or http_client
+        # Lookups whose answer rarely changes (DOI -> OpenAlex ID) go through the on-disk cache
+        self.cache = cache or openalex_cache
+        # Response volume and JSON decoding time of all works queries (see log_stats)
+        self._stats_lock = threading.Lock()
+        self.responses = 0
+        self.response_bytes = 0
+        self.parse_seconds = 0.0
+        # Per-task watermarks: only used without date overrides, and with an API key entitled to the filter
+        self.watermark_filter = DISCOVERY_WATERMARK_FILTER if api_key and DISCOVERY_WATERMARK_FILTER != "off" else None
+        self.incremental = incremental and bool(self.watermark_filter) and not from_date and not to_date
+        self.max_age_date = (datetime.now() - timedelta(days=DISCOVERY_MAX_AGE_DAYS)).strftime("%Y-%m-%d")
+        # Watermark, and whether a query failed, of the task running on the current thread
+        self._task_state = threading.local()
+        # Watermark key -> start day (UTC) of the tasks that ran without errors in this run
+        self._succeeded = {}
+        self._succeeded_lock = threading.Lock()
+        # Names of the tasks that hit an error in this run
+        self.failed_tasks = []
         
-        # Determine Start Date: Priority override -> Last run from DB -> fallback to 90 days
-        from datetime import timedelta
+        # Determine Start Date: Priority override -> Last run from DB -> fallback to DISCOVERY_MAX_AGE_DAYS
         if from_date:
             self.from_date = from_date
             logger.info(f"Discovery starting from override date: {self.from_date}")
@@ -26,7 +148,7 @@ class Discovery:
                 self.from_date = (last_run_dt - timedelta(days=7)).strftime("%Y-%m-%d")
                 logger.info(f"Discovery starting from last run date minus 7 days: {self.from_date}")
             else:
-                self.from_date = (datetime.now() - timedelta(days=90)).strftime("%Y-%m-%d")
+                self.from_date = self.max_age_date
                 logger.info(f"First run detected. Discovery starting from fallback date: {self.from_date}")
             
         # Determine End Date: Override -> Today + 7 days (safety margin)
@@ -35,12 +157,72 @@ class Discovery:
             logger.info(f"Discovery ending at override date: {self.to_date}")
         else:
             self.to_date = (datetime.now() + timedelta(days=7)).strftime("%Y-%m-%d")
+        if self.incremental:
+            logger.info(f"Incremental discovery: tasks that succeeded before only query works since their watermark ({self.watermark_filter}).")
 
-    def run_all_tasks(self, ignore_seen: bool = False) -> List[Paper]:
+    def run_all_tasks(self) -> List[Paper]:
         """Executes all discovery tasks defined in config and DB."""
         all_new_papers = []
-        
-        # Merge config tasks with automatically promoted journals/authors from DB
+        tasks = self._all_tasks()
+
+        # Tasks run concurrently; map() keeps results in task order so the merge is deterministic
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            results = list(executor.map(lambda task: list(self._run_task(task)), tasks))
+
+        # Filter duplicates (the same work is often found by several tasks); every page is
+        # already checked against seen_papers by _fetch_openalex
+        seen_keys = set()
+        for papers in results:
+            for paper in papers:
+                key = paper.doi or paper.link
+                if key in seen_keys:
+                    continue
+                seen_keys.add(key)
+                all_new_papers.append(paper)
+
+        logger.info(f"Discovery complete. Found {len(all_new_papers)} potential new papers.")
+        return all_new_papers
+
+    def iter_all_tasks(self) -> Iterator[Paper]:
+        """
+        Streaming variant of run_all_tasks: yields the new papers of all tasks as their result
+        pages arrive, so the caller can start filtering before the last page is downloaded.
+        Duplicates across tasks are dropped (the first task to find a work wins, so the order
+        depends on timing). Every page is already checked against seen_papers by _fetch_openalex.
+        """
+        tasks = self._all_tasks()
+        arrived = queue.Queue()
+
+        def stream(task: dict):
+            try:
+                for paper in self._run_task(task):
+                    arrived.put(paper)
+            finally:
+                arrived.put(_TASK_DONE)
+
+        count = 0
+        seen_keys = set()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for task in tasks:
+                executor.submit(stream, task)
+            running = len(tasks)
+            while running:
+                paper = arrived.get()
+                if paper is _TASK_DONE:
+                    running -= 1
+                    continue
+                key = paper.doi or paper.link
+                if key in seen_keys:
+                    continue
+                seen_keys.add(key)
+                count += 1
+                yield paper
+        logger.info(f"Discovery complete. Found {count} potential new papers.")
+
+    def _all_tasks(self) -> List[dict]:
+        """Tasks from config merged with the journals/authors promoted automatically in the DB."""
+        if self.incremental:
+            self._check_watermark_filter()
         tasks = DISCOVERY_TASKS.copy()
         
         auto_journals = db.get_monitored_journals()
@@ -59,56 +241,218 @@ class Discovery:
                 "type": "author",
                 "id": "|".join(auto_authors)
             })
+        return tasks
 
-        for task in tasks:
-            logger.info(f"Running discovery task: {task['name']} ({task['type']})")
-            papers = []
-            
+    def _run_task(self, task: dict) -> Iterator[Paper]:
+        """
+        Yields the papers of a single discovery task. Errors are contained so one task cannot
+        abort the others; a task is recorded as succeeded (see save_watermarks) only if all of
+        its queries completed.
+        """
+        key = self._watermark_key(task)
+        state = self._task_state
+        state.watermark = db.get_metadata(key) if self.incremental else None
+        state.failed = False
+        started = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+        since = f" (works since {state.watermark})" if state.watermark else ""
+        logger.info(f"Running discovery task: {task['name']} ({task['type']}){since}")
+        try:
             if task['type'] == "search":
-                papers = self.search_by_keywords(
+                yield from self.search_by_keywords(
                     task['query'], 
                     min_impact=task.get('min_impact'), 
                     min_h_index=task.get('min_h_index')
                 )
             elif task['type'] == "author":
-                papers = self.search_by_author(task['id'])
+                yield from self.search_by_author(task['id'])
             elif task['type'] == "citation":
-                papers = self.search_by_doi_citation(task['doi'])
+                yield from self.search_by_doi_citation(task['doi'])
             elif task['type'] == "author_citations":
-                papers = self.search_citations_for_author(task['id'])
+                yield from self.search_citations_for_author(task['id'])
             elif task['type'] == "journal":
-                papers = self.search_by_journal(task['id'])
+                yield from self.search_by_journal(task['id'])
             elif task['type'] == "issn":
-                papers = self.search_by_issn(task['issn'])
-            
-            # Filter duplicates and seen papers
-            for paper in papers:
-                if not ignore_seen and db.is_seen(paper.link, paper.doi):
-                    continue
-                all_new_papers.append(paper)
-        
-        logger.info(f"Discovery complete. Found {len(all_new_papers)} potential new papers.")
-        return all_new_papers
+                yield from self.search_by_issn(task['issn'])
+        except Exception as e:
+            state.failed = True
+            msg = f"Discovery task '{task['name']}' failed: {e}"
+            logger.error(msg)
+            db.add_event("ERROR", msg)
+        with self._succeeded_lock:
+            if state.failed:
+                self.failed_tasks.append(task['name'])
+            else:
+                self._succeeded[key] = started
+
+    @staticmethod
+    def _watermark_key(task: dict) -> str:
+        """Metadata key of a task's watermark, derived from its query (renaming a task keeps it, changing the query resets it)."""
+        query = json.dumps({k: v for k, v in task.items() if k != "name"}, sort_keys=True)
+        return f"discovery_watermark:{task['type']}:{hashlib.sha1(query.encode('utf-8')).hexdigest()[:16]}"
+
+    def _date_filter(self) -> str:
+        """Date filters of the queries of the current task: works since its watermark if it has one, else the publication window."""
+        watermark = getattr(self._task_state, "watermark", None)
+        if watermark and self.watermark_filter:
+            return f"{self.watermark_filter}:{watermark},from_publication_date:{self.max_age_date},to_publication_date:{self.to_date}"
+        return f"from_publication_date:{self.from_date},to_publication_date:{self.to_date}"
+
+    def _check_watermark_filter(self):
+        """
+        Probes the watermark filter with a one-result query. OpenAlex rejects from_created_date/
+        from_updated_date without a key entitled to them; the run then falls back to the
+        publication date window for every task (and stores no watermarks).
+        """
+        params = self.params.copy()
+        params.update({
+            "filter": f"{self.watermark_filter}:{datetime.now(timezone.utc).strftime('%Y-%m-%d')}",
+            "select": "id",
+            "per_page": 1
+        })
+        try:
+            self._get(params, timeout=20)
+        except requests.exceptions.RequestException as e:
+            status = getattr(e.response, "status_code", None)
+            if status not in (400, 401, 403):
+                # Not a verdict on the filter: the tasks' own queries will tell whether they succeed
+                logger.warning(f"Could not probe the OpenAlex {self.watermark_filter} filter: {e}")
+                return
+            msg = f"OpenAlex rejected the {self.watermark_filter} filter ({status}). Discovery uses the publication date window instead."
+            logger.warning(msg)
+            db.add_event("WARNING", msg)
+            self.incremental = False
+            self.watermark_filter = None
+
+    def _query_failed(self):
+        """Marks the current task as failed, so its watermark is not advanced."""
+        self._task_state.failed = True
+
+    def save_watermarks(self, retry_papers: bool = False):
+        """
+        Stores the watermark of every task that ran without errors in this run: the day it
+        started, so works created while it ran are queried again next time.
+
+        :param retry_papers: Some papers of the run failed or had no text, and were not marked
+                             as seen. The watermarks then stay at least RETRY_DAYS back (or
+                             where they were), so those papers are found and retried next run,
+                             as within the former 7-day overlap.
+        """
+        if not self.incremental:
+            return
+        retry_from = (datetime.now(timezone.utc) - timedelta(days=RETRY_DAYS)).strftime("%Y-%m-%d")
+        for key, started in self._succeeded.items():
+            if retry_papers:
+                started = max(min(started, retry_from), db.get_metadata(key) or "")
+            db.set_metadata(key, started)
+        logger.info(f"Saved the discovery watermarks of {len(self._succeeded)} tasks.")
+
+    def _get(self, params: dict, timeout: int = 30, cached: bool = False) -> dict:
+        """Issues a rate-limited GET against the works endpoint (through the HTTP cache if cached) and returns the decoded JSON."""
+        if cached:
+            response = self.cache.get(self.base_url, params=params, timeout=timeout, rate_limiter=self.rate_limiter)
+        else:
+            self.rate_limiter.wait()
+            response = self.http.get(self.base_url, params=params, timeout=timeout)
+        response.raise_for_status()
+        body = response.content
+        start = time.perf_counter()
+        data = json.loads(body)
+        self._record_response(len(body), time.perf_counter() - start, len(data.get("results") or []))
+        return data
+
+    @retry(requests.exceptions.RequestException, tries=3, delay=2)
+    def _open_page(self, params: dict, timeout: int = 30) -> requests.Response:
+        """Issues a rate-limited, streamed GET against the works endpoint (the body is not read yet)."""
+        self.rate_limiter.wait()
+        response = self.http.get(self.base_url, params=params, timeout=timeout, stream=True)
+        try:
+            response.raise_for_status()
+        except requests.exceptions.HTTPError:
+            response.close()
+            raise
+        return response
 
-    def search_citations_for_author(self, author_id: str) -> List[Paper]:
+    def _iter_results(self, params: dict, page: dict) -> Iterator[dict]:
+        """
+        Yields the works of one results page and sets page["next_cursor"]. With ijson the
+        works are parsed one at a time from the response stream, so the page is never held
+        as a whole document tree; without it the page is decoded at once.
+        """
+        response = self._open_page(params)
+        try:
+            if ijson is None:
+                body = response.content
+                start = time.perf_counter()
+                data = json.loads(body)
+                results = data.get("results") or []
+                self._record_response(len(body), time.perf_counter() - start, len(results))
+                meta = data.get("meta") or {}
+                if "next_cursor" in meta:
+                    page["next_cursor"] = meta["next_cursor"]
+                else:
+                    self._cursor_missing("no meta.next_cursor")
+                yield from results
+                return
+
+            # Parse time here includes waiting for the network, since parsing and reading overlap
+            reader = _PageReader(response)
+            count = 0
+            elapsed = 0.0
+            start = time.perf_counter()
+            for work in ijson.items(reader, "results.item", use_float=True):
+                count += 1
+                elapsed += time.perf_counter() - start
+                yield work
+                start = time.perf_counter()
+            try:
+                page["next_cursor"] = reader.next_cursor()
+            except ValueError as e:
+                self._cursor_missing(str(e))
+            self._record_response(reader.bytes, elapsed + time.perf_counter() - start, count)
+        finally:
+            response.close()
+
+    def _cursor_missing(self, reason: str):
+        """
+        Stops pagination at a page whose next_cursor could not be read, and fails the task so
+        its watermark stays where it was and the pages after this one are queried again.
+        """
+        self._query_failed()
+        msg = f"OpenAlex page without a readable next_cursor ({reason}). Stopping pagination; the task is retried next run."
+        logger.warning(msg)
+        db.add_event("WARNING", msg)
+
+    def _record_response(self, size: int, seconds: float, results: int):
+        with self._stats_lock:
+            self.responses += 1
+            self.response_bytes += size
+            self.parse_seconds += seconds
+        logger.debug(f"OpenAlex response: {size / 1024:.0f} KB, parsed in {seconds * 1000:.1f} ms ({results} results)")
+
+    def log_stats(self):
+        """Logs the volume of the OpenAlex responses of this run and the time spent decoding them."""
+        if not self.responses:
+            return
+        logger.info(f"OpenAlex: {self.responses} responses, {self.response_bytes / 1024 / 1024:.1f} MB, "
+                    f"JSON parsing {self.parse_seconds:.2f} s ({self.response_bytes / self.responses / 1024:.0f} KB per response).")
+
+    def search_citations_for_author(self, author_id: str) -> Iterator[Paper]:
         """First gets all works by author, then finds works that cite them."""
-        logger.info(f"Automatically finding citations for author ID: {author_id} (Range: {self.from_date} to {self.to_date})")
+        logger.info(f"Automatically finding citations for author ID: {author_id} ({self._date_filter()})")
         
         # 1. Get all OpenAlex IDs for this author using cursor pagination
         params = self.params.copy()
         params.update({
             "filter": f"author.id:{author_id}",
             "select": "id",
-            "per_page": 200,
+            "per_page": MAX_PER_PAGE,
             "cursor": "*"
         })
         
         ids = []
         try:
             while True:
-                response = requests.get(self.base_url, params=params, timeout=30)
-                response.raise_for_status()
-                data = response.json()
+                data = self._get(params)
                 
                 results = data.get("results", [])
                 if not results:
@@ -120,11 +464,9 @@ class Discovery:
                 if not next_cursor:
                     break
                 params["cursor"] = next_cursor
-                time.sleep(0.2)
             
             logger.info(f"Found {len(ids)} papers for author. Checking their recent citations in batches...")
             
-            all_citing_papers = []
             # 2. Batch search for citations (OpenAlex supports up to 50 IDs per filter with |)
             batch_size = 50
             for i in range(0, len(ids), batch_size):
@@ -132,40 +474,32 @@ class Discovery:
                 logger.info(f"Checking citations for batch {i//batch_size + 1}/{(len(ids)-1)//batch_size + 1}...")
                 
                 batch_filter = "|".join(batch)
-                citing = self.search_by_citing_id(batch_filter)
-                all_citing_papers.extend(citing)
-                
-                # Polite delay
-                time.sleep(0.5)
-            
-            return all_citing_papers
+                yield from self.search_by_citing_id(batch_filter)
             
         except Exception as e:
+            self._query_failed()
             logger.error(f"Error in author citation discovery: {e}")
-            return []
 
-    def search_by_keywords(self, query: str, min_impact: float = None, min_h_index: int = None) -> List[Paper]:
+    def search_by_keywords(self, query: str, min_impact: float = None, min_h_index: int = None) -> Iterator[Paper]:
         params = self.params.copy()
         
         # Use defaults from config if not provided
         impact = min_impact if min_impact is not None else MIN_JOURNAL_IMPACT_FACTOR
         h_index = min_h_index if min_h_index is not None else MIN_JOURNAL_H_INDEX
         
-        filter_str = f"title_and_abstract.search:{query},from_publication_date:{self.from_date},to_publication_date:{self.to_date}"
+        filter_str = f"title_and_abstract.search:{query},{self._date_filter()}"
         
         params.update({
             "filter": filter_str,
             "sort": "publication_date:desc",
-            "per_page": 50,
             "_min_h_index": h_index,
             "_min_impact": impact
         })
         return self._fetch_openalex(params)
 
-    def search_by_author(self, author_id: str) -> List[Paper]:
+    def search_by_author(self, author_id: str) -> Iterator[Paper]:
         """Fetch papers by author ID(s). Supports multiple IDs separated by | with batching."""
         ids = author_id.split("|")
-        all_papers = []
         batch_size = 50
         
         for i in range(0, len(ids), batch_size):
@@ -174,23 +508,15 @@ class Discovery:
             
             params = self.params.copy()
             params.update({
-                "filter": f"author.id:{batch_str},from_publication_date:{self.from_date},to_publication_date:{self.to_date}",
-                "sort": "publication_date:desc",
-                "per_page": min(100, 10 * len(batch)) # Adjust per_page based on batch size
+                "filter": f"author.id:{batch_str},{self._date_filter()}",
+                "sort": "publication_date:desc"
             })
             
-            papers = self._fetch_openalex(params)
-            all_papers.extend(papers)
-            
-            if len(ids) > batch_size:
-                time.sleep(0.5) # Politeness delay for large batches
-                
-        return all_papers
+            yield from self._fetch_openalex(params)
 
-    def search_by_journal(self, source_id: str) -> List[Paper]:
+    def search_by_journal(self, source_id: str) -> Iterator[Paper]:
         """Fetch papers by journal ID(s). Supports multiple IDs separated by | with batching."""
         ids = source_id.split("|")
-        all_papers = []
         batch_size = 50
         
         for i in range(0, len(ids), batch_size):
@@ -199,29 +525,21 @@ class Discovery:
             
             params = self.params.copy()
             params.update({
-                "filter": f"primary_location.source.id:{batch_str},from_publication_date:{self.from_date},to_publication_date:{self.to_date}",
-                "sort": "publication_date:desc",
-                "per_page": 50
+                "filter": f"primary_location.source.id:{batch_str},{self._date_filter()}",
+                "sort": "publication_date:desc"
             })
             
-            papers = self._fetch_openalex(params)
-            all_papers.extend(papers)
-            
-            if len(ids) > batch_size:
-                time.sleep(0.5)
-                
-        return all_papers
+            yield from self._fetch_openalex(params)
 
-    def search_by_issn(self, issn: str) -> List[Paper]:
+    def search_by_issn(self, issn: str) -> Iterator[Paper]:
         params = self.params.copy()
         params.update({
-            "filter": f"primary_location.source.issn:{issn},from_publication_date:{self.from_date},to_publication_date:{self.to_date}",
-            "sort": "publication_date:desc",
-            "per_page": 50
+            "filter": f"primary_location.source.issn:{issn},{self._date_filter()}",
+            "sort": "publication_date:desc"
         })
         return self._fetch_openalex(params)
 
-    def search_by_doi_citation(self, doi: str) -> List[Paper]:
+    def search_by_doi_citation(self, doi: str) -> Iterator[Paper]:
         """Search by DOI: first resolve DOI to OpenAlex ID."""
         logger.info(f"Searching works citing DOI: {doi}")
         params = self.params.copy()
@@ -230,9 +548,7 @@ class Discovery:
             "select": "id"
         })
         try:
-            response = requests.get(self.base_url, params=params, timeout=20)
-            response.raise_for_status()
-            results = response.json().get("results", [])
+            results = self._get(params, timeout=20, cached=True).get("results", [])
             if results:
                 work_id = results[0].get("id").split("/")[-1]
                 return self.search_by_citing_id(work_id)
@@ -240,18 +556,18 @@ class Discovery:
                 logger.warning(f"DOI {doi} not found in OpenAlex.")
                 return []
         except Exception as e:
+            self._query_failed()
             msg = f"Error resolving DOI {doi}: {e}"
             logger.error(msg)
             db.add_event("ERROR", msg)
             return []
 
-    def search_by_citing_id(self, work_id: str) -> List[Paper]:
+    def search_by_citing_id(self, work_id: str) -> Iterator[Paper]:
         """Search for works that cite a specific OpenAlex ID (e.g. W12345)."""
         params = self.params.copy()
         params.update({
-            "filter": f"cites:{work_id},from_publication_date:{self.from_date},to_publication_date:{self.to_date}",
-            "sort": "publication_date:desc",
-            "per_page": 50
+            "filter": f"cites:{work_id},{self._date_filter()}",
+            "sort": "publication_date:desc"
         })
         return self._fetch_openalex(params)
 
@@ -263,11 +579,13 @@ class Discovery:
         params.update({
             "filter": f"doi:{clean_doi}"
         })
-        return self._fetch_openalex(params, ignore_seen=ignore_seen)
+        return list(self._fetch_openalex(params, ignore_seen=ignore_seen))
 
-    @retry(requests.exceptions.RequestException, tries=3, delay=2)
-    def _fetch_openalex(self, params: dict, ignore_seen: bool = False) -> List[Paper]:
-        all_papers = []
+    def _fetch_openalex(self, params: dict, ignore_seen: bool = False) -> Iterator[Paper]:
+        """
+        Yields the papers of a works query page by page, as each page arrives (only the
+        papers not seen yet, unless ignore_seen), following the cursor to the last page.
+        """
         current_params = params.copy()
         current_params["cursor"] = "*"
         
@@ -275,9 +593,9 @@ class Discovery:
         min_h_index = current_params.pop("_min_h_index", 0)
         min_impact = current_params.pop("_min_impact", 0)
         
-        # Ensure per_page is set efficiently
-        if "per_page" not in current_params:
-            current_params["per_page"] = 100
+        # Only the fields we read, in the largest pages OpenAlex serves
+        current_params.setdefault("select", ",".join(WORK_FIELDS))
+        current_params.setdefault("per_page", MAX_PER_PAGE)
             
         page_count = 0
         
@@ -286,15 +604,13 @@ class Discovery:
                 page_count += 1
                 logger.debug(f"Fetching OpenAlex page {page_count}...")
                 
-                response = requests.get(self.base_url, params=current_params, timeout=30)
-                response.raise_for_status()
-                data = response.json()
-                
-                results = data.get("results", [])
-                if not results:
-                    break
-                
-                for work in results:
+                page = {}
+                page_papers = []
+                results = 0
+                # Abstracts (OpenAlex uses an Inverted Index for abstracts) of the page, by paper
+                inverted_indexes = {}
+                for work in self._iter_results(current_params, page):
+                    results += 1
                     # ... (rest of metadata extraction) ...
                     title = work.get("title") or "No Title"
                     
@@ -344,10 +660,6 @@ class Discovery:
                         logger.debug(f"Skipping {title[:30]}... as it is a preprint.")
                         continue
 
-                    # QUICK CHECK: Skip if already in DB
-                    if not ignore_seen and db.is_seen(link, doi):
-                        continue
-                    
                     # Published date
                     pub_date_str = work.get("publication_date")
                     if pub_date_str:
@@ -355,9 +667,6 @@ class Discovery:
                     else:
                         published = datetime.now()
                     
-                    # Abstract (OpenAlex uses an Inverted Index for abstracts)
-                    abstract = self._reconstruct_abstract(work.get("abstract_inverted_index"))
-                    
                     # Authors and Author IDs
                     authors = []
                     author_ids = []
@@ -395,45 +704,85 @@ class Discovery:
                         source=source,
                         source_id=source_id,
                         source_url=source_url,
-                        abstract=abstract,
                         authors=authors,
                         author_ids=author_ids,
                         authors_data=authors_data,
                         doi=doi,
+                        oa_pdf_urls=self._oa_pdf_urls(work),
                         type=work_type,
                         topics=topics,
                         journal_h_index=journal_h_index,
                         journal_impact=journal_impact
                     )
-                    all_papers.append(paper)
+                    page_papers.append(paper)
+                    inverted_indexes[id(paper)] = work.get("abstract_inverted_index")
+                
+                # Skip works already in DB (one query per page)
+                if not ignore_seen:
+                    page_papers = db.filter_unseen(page_papers)
+                # Abstracts are only rebuilt for the papers kept, in one pass over the page
+                abstracts = reconstruct_abstracts([inverted_indexes[id(paper)] for paper in page_papers])
+                for paper, abstract in zip(page_papers, abstracts):
+                    paper.abstract = abstract
+                yield from page_papers
                 
                 # Check for next page
-                next_cursor = data.get("meta", {}).get("next_cursor")
-                if not next_cursor:
+                next_cursor = page.get("next_cursor")
+                if not results or not next_cursor:
                     break
                 
                 current_params["cursor"] = next_cursor
-                time.sleep(0.2) # Polite delay
-                
-            return all_papers
             
         except Exception as e:
+            self._query_failed()
             msg = f"OpenAlex fetch error: {e}"
             logger.error(msg)
             db.add_event("ERROR", msg)
-            return all_papers
 
-    def _reconstruct_abstract(self, inverted_index: dict) -> str:
-        """OpenAlex provides abstracts in an inverted index to avoid copyright issues. We reconstruct it."""
-        if not inverted_index:
-            return ""
-        
-        # Inverted index is { word: [positions] }
-        word_positions = []
-        for word, positions in inverted_index.items():
-            for pos in positions:
-                word_positions.append((pos, word))
-        
-        # Sort by position
-        word_positions.sort()
-        return " ".join([wp[1] for wp in word_positions])
+    def fetch_oa_locations(self, papers: List[Paper]):
+        """
+        Fills in the open-access PDF URLs of papers that were not discovered through OpenAlex,
+        with one request per OA_LOOKUP_BATCH_SIZE DOIs (filter doi:a|b|c) instead of a
+        per-DOI Unpaywall call during the download.
+        """
+        pending = {}
+        for paper in papers:
+            if paper.doi and paper.oa_pdf_urls is None:
+                pending.setdefault(paper.doi.lower(), []).append(paper)
+        dois = list(pending)
+        for i in range(0, len(dois), OA_LOOKUP_BATCH_SIZE):
+            batch = dois[i:i + OA_LOOKUP_BATCH_SIZE]
+            params = self.params.copy()
+            params.update({
+                "filter": f"doi:{'|'.join(batch)}",
+                "select": "doi,best_oa_location,locations,open_access",
+                "per_page": OA_LOOKUP_BATCH_SIZE
+            })
+            try:
+                results = self._get(params).get("results", [])
+            except Exception as e:
+                logger.warning(f"OpenAlex OA location lookup failed for {len(batch)} DOIs: {e}")
+                continue
+            found = {(work.get("doi") or "").replace("https://doi.org/", "").lower(): self._oa_pdf_urls(work) for work in results}
+            for doi in batch:
+                # DOIs unknown to OpenAlex stay None, so the download still asks Unpaywall first
+                if doi in found:
+                    for paper in pending[doi]:
+                        paper.oa_pdf_urls = found[doi]
+        if dois:
+            with_pdf = sum(1 for doi in dois if pending[doi][0].oa_pdf_urls)
+            logger.info(f"OpenAlex OA locations: {with_pdf}/{len(dois)} papers have an open-access PDF URL.")
+
+    @staticmethod
+    def _oa_pdf_urls(work: dict) -> List[str]:
+        """Open-access PDF URLs of a work: the best OA location first, then the other OA locations."""
+        urls = []
+        locations = [work.get("best_oa_location")] + (work.get("locations") or [])
+        for location in locations:
+            if location and location.get("is_oa") is not False and location.get("pdf_url") and location["pdf_url"] not in urls:
+                urls.append(location["pdf_url"])
+        # oa_url is usually one of the PDF URLs above, otherwise often a landing page: kept as the last resort
+        oa_url = (work.get("open_access") or {}).get("oa_url")
+        if oa_url and oa_url not in urls:
+            urls.append(oa_url)
+        return urls
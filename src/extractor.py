@@ -1,10 +1,24 @@
 import requests
 import fitz  # PyMuPDF
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from itertools import islice
 from pathlib import Path
-from src.config import PAPERS_DIR, OPENALEX_EMAIL, CORE_API_KEY, ELSEVIER_API_KEY, ELSEVIER_INST_TOKEN
+from typing import Iterable, Iterator
+from urllib.parse import urlparse
+from src.config import PAPERS_DIR, OPENALEX_EMAIL, CORE_API_KEY, ELSEVIER_API_KEY, ELSEVIER_INST_TOKEN, HTML_TEXT_CACHE_TTL_DAYS, PDF_RESOLVE_DEADLINE, PDF_PARALLEL_DOWNLOADS, PDF_RETRY_BASE_HOURS, PDF_RETRY_MAX_DAYS
+from src.db import db
 from src.models import Paper
 from src.logger import logger
-from src.utils import retry
+from src.http_client import HttpClient, http_client
+from src.text_reducer import clean_pages
+from src.utils import retry, estimate_tokens
 import random
 
 import re
@@ -18,7 +32,27 @@ USER_AGENTS = [
     "Mozilla/5.0 (AppleWebKit/537.36; Chrome/121.0.0.0; Mobile) Safari/537.36",
 ]
 
+# Bump when extraction or cleanup output changes; cached texts of other versions are re-extracted
+EXTRACTOR_VERSION = 1
+# Tie-break between candidate PDF sources with the same host success rate (the former sequential order)
+SOURCE_PRIORITY = ["direct", "elsevier", "openalex", "unpaywall", "core"]
+# A host with this many PDF attempts and no success is only tried when no other source is left
+PDF_DEAD_HOST_ATTEMPTS = 10
+# Hosts of the metadata lookups, for their entries in the PDF failure cache
+LOOKUP_HOSTS = {"unpaywall": "api.unpaywall.org", "core": "api.core.ac.uk"}
+# extract_many splits documents longer than this into page ranges extracted by different processes
+EXTRACT_PAGES_PER_TASK = 40
+
+def _read_pages(pdf_path: str, start: int = 0, stop: int = None) -> list[str]:
+    """Text of pages [start, stop) of a PDF, one string per page (module-level so worker processes can run it)."""
+    with fitz.open(pdf_path) as doc:
+        stop = doc.page_count if stop is None else stop
+        return [doc[i].get_text() for i in range(start, stop)]
+
 class Extractor:
+    def __init__(self, http: HttpClient = None):
+        self.http = http or http_client
+
     def _get_headers(self, referer: str = None) -> dict:
         """Returns a realistic set of browser headers."""
         headers = {
@@ -42,6 +76,13 @@ class Extractor:
         Downloads the PDF (if possible) and extracts text.
         Returns (full_text_content, is_full_text_boolean).
         """
+        return self.extract(paper, self.download(paper))
+
+    def download(self, paper: Paper) -> Path:
+        """
+        Downloads the PDF of the paper unless it is already on disk.
+        Returns the local PDF path (which does not exist if no source had the PDF).
+        """
         # Determine paths
         year = paper.published.strftime("%Y")
         save_dir = PAPERS_DIR / year
@@ -53,7 +94,13 @@ class Extractor:
         # 1. Download PDF if not exists
         if not pdf_path.exists():
             self._download_pdf(paper, pdf_path)
+        return pdf_path
 
+    def extract(self, paper: Paper, pdf_path: Path) -> tuple[str, bool]:
+        """
+        Extracts text from the downloaded PDF, falling back to the article HTML and then the abstract.
+        Returns (full_text_content, is_full_text_boolean).
+        """
         text = ""
         is_full_text = False
 
@@ -61,13 +108,13 @@ class Extractor:
         if pdf_path.exists():
             logger.info(f"Processing PDF: {pdf_path}")
             paper.pdf_link = str(pdf_path) # Store local path
-            text = self._extract_text(pdf_path)
+            text = self._cached_pdf_text(pdf_path)
             if text:
                 is_full_text = True
         
         if not text:
             logger.warning(f"PDF text extraction failed or PDF missing for {paper.title}. Trying HTML fallback.")
-            text = self._extract_from_html(paper)
+            text = self._cached_html_text(paper, pdf_path)
             if text:
                 is_full_text = True
 
@@ -78,6 +125,58 @@ class Extractor:
              
         return text, is_full_text
 
+    def _cached_pdf_text(self, pdf_path: Path) -> str:
+        """
+        Text of the PDF, from the compressed cache next to it (<name>.txt.gz) when it was
+        extracted from the same PDF content by the same extractor version.
+        """
+        digest = hashlib.sha256(pdf_path.read_bytes()).hexdigest()
+        cache_path = pdf_path.with_suffix(".txt.gz")
+        entry = self._read_text_cache(cache_path)
+        if entry and entry.get("sha256") == digest:
+            logger.info(f"Using cached text for {pdf_path.name}")
+            return entry["text"]
+
+        text = self._extract_text(pdf_path)
+        if text:
+            self._write_text_cache(cache_path, {"sha256": digest, "text": text})
+        return text
+
+    def _cached_html_text(self, paper: Paper, pdf_path: Path) -> str:
+        """HTML-fallback text, cached next to where the PDF would be (<name>.html.txt.gz) for HTML_TEXT_CACHE_TTL_DAYS."""
+        cache_path = pdf_path.with_suffix(".html.txt.gz")
+        entry = self._read_text_cache(cache_path)
+        if entry and time.time() - entry.get("fetched_at", 0) < HTML_TEXT_CACHE_TTL_DAYS * 86400:
+            logger.info(f"Using cached HTML text for {paper.title}")
+            return entry["text"]
+
+        text = self._extract_from_html(paper)
+        if text:
+            self._write_text_cache(cache_path, {"url": paper.link, "fetched_at": time.time(), "text": text})
+        return text
+
+    @staticmethod
+    def _read_text_cache(cache_path: Path) -> dict:
+        """Returns a cached text entry, or None if it is missing, unreadable or from another extractor version."""
+        try:
+            with gzip.open(cache_path, "rt", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if entry.get("version") != EXTRACTOR_VERSION or not entry.get("text"):
+            return None
+        return entry
+
+    @staticmethod
+    def _write_text_cache(cache_path: Path, entry: dict):
+        tmp_path = cache_path.with_name(cache_path.name + ".tmp")
+        try:
+            with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+                json.dump({"version": EXTRACTOR_VERSION, **entry}, f, ensure_ascii=False)
+            tmp_path.replace(cache_path)
+        except OSError as e:
+            logger.warning(f"Could not write text cache {cache_path}: {e}")
+
     @retry(requests.exceptions.RequestException, tries=2, delay=5)
     def _extract_from_html(self, paper: Paper, url: str = None) -> str:
         """
@@ -91,7 +190,7 @@ class Extractor:
             headers = self._get_headers(referer=paper.link)
             
             # Disable SSL verification to handle institutional repositories with cert issues
-            response = requests.get(target_url, headers=headers, timeout=30, verify=False)
+            response = self.http.get(target_url, headers=headers, timeout=30, verify=False)
             
             if response.status_code == 200:
                 html = response.text
@@ -146,42 +245,167 @@ class Extractor:
 
     def _download_pdf(self, paper: Paper, save_path: Path) -> bool:
         """
-        Attempts to download the PDF.
-        1. Try direct link (with heuristics).
-        2. If Elsevier, try Elsevier API (ScienceDirect).
-        3. If failed, try Unpaywall API to find OA PDF.
+        Attempts to download the PDF from the best of several candidate sources:
+        the direct link (with publisher heuristics), the Elsevier API (ScienceDirect DOIs),
+        the OA PDF URLs OpenAlex reported at discovery, and those found by Unpaywall and CORE.
+
+        The Unpaywall/CORE lookups run concurrently. Unpaywall (whose data OpenAlex already
+        carries) is only asked once the OpenAlex URLs are exhausted, or when the paper was not
+        looked up in OpenAlex. Known candidates are downloaded in order
+        of their host's past success rate, PDF_PARALLEL_DOWNLOADS at a time; the first valid
+        PDF wins and cancels the others. Gives up after PDF_RESOLVE_DEADLINE seconds.
         """
-        # Strategy 1: Direct Link (Existing Heuristics)
-        if self._try_download_url(paper.link, save_path, paper):
-            return True
-            
-        # Strategy 2: Elsevier API (ScienceDirect)
+        deadline = time.monotonic() + PDF_RESOLVE_DEADLINE
+        cancel = threading.Event()
+        won = threading.Lock()
+
+        # Sources that failed for this paper recently are skipped until their retry window ends
+        key = self._failure_key(paper)
+        oa_urls = paper.oa_pdf_urls or []
+        blocked = db.get_blocked_pdf_sources(key, [paper.link, "elsevier", "unpaywall", "core"] + oa_urls)
+        if blocked:
+            logger.info(f"Skipping {len(blocked)} PDF source(s) that failed recently for {paper.title}.")
+
+        # (source, url): url is None for the Elsevier API, which returns the PDF itself
+        candidates = [] if paper.link in blocked else [("direct", paper.link)]
         if paper.doi and ("10.1016" in paper.doi or "sciencedirect" in paper.link or "elsevier" in paper.link):
-            if self._download_from_elsevier(paper.doi, save_path):
-                return True
+            if ELSEVIER_API_KEY and "elsevier" not in blocked:
+                candidates.append(("elsevier", None))
+        candidates += [("openalex", url) for url in oa_urls if url not in blocked and url != paper.link]
 
-        # Strategy 3: Unpaywall API
+        pool = ThreadPoolExecutor(max_workers=2 + PDF_PARALLEL_DOWNLOADS)
+        lookups = {}
+        deferred = []
         if paper.doi:
-            logger.info(f"Direct download failed. Checking Unpaywall for OA PDF (DOI: {paper.doi})")
-            oa_url = self._get_unpaywall_url(paper.doi)
-            if oa_url:
-                logger.info(f"Unpaywall found PDF URL: {oa_url}")
-                if self._try_download_url(oa_url, save_path, paper):
-                    return True
-            
-            # Strategy 4: CORE API
-            if CORE_API_KEY:
-                logger.info(f"Unpaywall failed. Checking CORE API for OA PDF (DOI: {paper.doi})")
-                core_url = self._get_core_url(paper.doi)
-                if core_url:
-                    logger.info(f"CORE found PDF URL: {core_url}")
-                    if self._try_download_url(core_url, save_path, paper):
-                        return True
-        
-        return False
+            if "unpaywall" not in blocked and paper.oa_pdf_urls is None:
+                lookups[pool.submit(self._get_unpaywall_url, paper.doi)] = "unpaywall"
+            elif "unpaywall" not in blocked:
+                deferred.append(("unpaywall", self._get_unpaywall_url))
+            if CORE_API_KEY and "core" not in blocked:
+                lookups[pool.submit(self._get_core_url, paper.doi)] = "core"
+
+        downloads = {}
+        tried = set(blocked)
+        success = False
+        try:
+            while True:
+                # Start the best untried candidates while download slots are free
+                pending = [c for c in candidates if c[1] not in tried]
+                # Hosts that never serve PDFs wait until nothing better can turn up
+                ranked = self._rank_candidates(pending, hold_dead_hosts=bool(lookups or downloads or deferred))
+                for source, url in ranked[:PDF_PARALLEL_DOWNLOADS - len(downloads)]:
+                    tried.add(url)
+                    part_path = save_path.with_name(f"{save_path.name}.{len(tried)}.part")
+                    downloads[pool.submit(self._download_candidate, paper, source, url, part_path, save_path, cancel, won)] = source
 
-    def _download_from_elsevier(self, doi: str, save_path: Path) -> bool:
-        """Downloads PDF using Elsevier Article Retrieval API."""
+                # Everything known failed: fall back to the per-DOI lookups held back so far
+                if not downloads and not lookups and deferred:
+                    for source, lookup in deferred:
+                        lookups[pool.submit(lookup, paper.doi)] = source
+                    deferred = []
+
+                if not downloads and not lookups:
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    logger.warning(f"PDF resolution deadline ({PDF_RESOLVE_DEADLINE}s) reached for {paper.title}.")
+                    break
+
+                done, _ = wait(list(downloads) + list(lookups), timeout=remaining, return_when=FIRST_COMPLETED)
+                for future in done:
+                    if future in lookups:
+                        source = lookups.pop(future)
+                        url = future.result()
+                        if not url:
+                            db.record_pdf_failure(key, source, LOOKUP_HOSTS[source], None, "no PDF URL", PDF_RETRY_BASE_HOURS, PDF_RETRY_MAX_DAYS)
+                        elif url not in tried and not db.get_blocked_pdf_sources(key, [url]):
+                            logger.info(f"{source.capitalize()} found PDF URL: {url}")
+                            candidates.append((source, url))
+                    else:
+                        source = downloads.pop(future)
+                        try:
+                            success = future.result() or success
+                        except Exception as e:
+                            logger.error(f"Error downloading PDF from {source}: {e}")
+                if success:
+                    break
+        finally:
+            # Losers stop at their next chunk; lookups still queued are dropped
+            cancel.set()
+            pool.shutdown(wait=False, cancel_futures=True)
+        return success
+
+    @staticmethod
+    def _failure_key(paper: Paper) -> str:
+        return paper.doi or paper.link
+
+    @staticmethod
+    def _candidate_host(source: str, url: str) -> str:
+        return "api.elsevier.com" if source == "elsevier" else (urlparse(url).hostname or "")
+
+    def _rank_candidates(self, candidates: list[tuple[str, str]], hold_dead_hosts: bool = False) -> list[tuple[str, str]]:
+        """
+        Orders candidates by the past success rate of their host (Laplace-smoothed), then by source priority.
+        With hold_dead_hosts, hosts with PDF_DEAD_HOST_ATTEMPTS attempts and no success are left out.
+        """
+        stats = db.get_pdf_host_stats([self._candidate_host(source, url) for source, url in candidates])
+        def score(candidate):
+            attempts, successes = stats.get(self._candidate_host(*candidate), (0, 0))
+            return -(successes + 1) / (attempts + 2), SOURCE_PRIORITY.index(candidate[0])
+        def dead(candidate):
+            attempts, successes = stats.get(self._candidate_host(*candidate), (0, 0))
+            return attempts >= PDF_DEAD_HOST_ATTEMPTS and not successes
+        return sorted((c for c in candidates if not (hold_dead_hosts and dead(c))), key=score)
+
+    def _download_candidate(self, paper: Paper, source: str, url: str, part_path: Path, save_path: Path,
+                            cancel: threading.Event, won: threading.Lock) -> bool:
+        """Downloads one candidate to its own .part file; the first valid PDF is moved to save_path."""
+        attempt = {}
+        host = self._candidate_host(source, url)
+        try:
+            if source == "elsevier":
+                ok = self._download_from_elsevier(paper.doi, part_path, cancel, attempt)
+            else:
+                ok = self._try_download_url(url, part_path, paper, cancel, attempt)
+            if not cancel.is_set():
+                db.record_pdf_attempt(host, ok)
+                if ok:
+                    db.clear_pdf_failure(self._failure_key(paper), url or source)
+                else:
+                    db.record_pdf_failure(self._failure_key(paper), url or source, host, attempt.get("status"), attempt.get("content_type"),
+                                          PDF_RETRY_BASE_HOURS, PDF_RETRY_MAX_DAYS)
+            # Once cancelled (another winner, or the deadline) a late PDF is discarded
+            if ok and not cancel.is_set() and won.acquire(blocking=False):
+                cancel.set()
+                part_path.replace(save_path)
+                logger.info(f"Downloaded PDF to {save_path} (source: {source})")
+                return True
+            return False
+        finally:
+            part_path.unlink(missing_ok=True)
+
+    @staticmethod
+    def _save_pdf(response, save_path: Path, cancel: threading.Event = None) -> bool:
+        """Streams a PDF response to save_path. False (and no file) if it is not a PDF or the download is cancelled."""
+        try:
+            with open(save_path, "wb") as f:
+                for i, chunk in enumerate(response.iter_content(chunk_size=8192)):
+                    if cancel is not None and cancel.is_set():
+                        raise InterruptedError("cancelled")
+                    if i == 0 and not chunk.lstrip().startswith(b"%PDF"):
+                        logger.warning("Response is labelled as a PDF but is not one.")
+                        raise ValueError("not a PDF")
+                    f.write(chunk)
+            return True
+        except (InterruptedError, ValueError):
+            save_path.unlink(missing_ok=True)
+            return False
+        finally:
+            response.close()
+
+    def _download_from_elsevier(self, doi: str, save_path: Path, cancel: threading.Event = None, attempt: dict = None) -> bool:
+        """Downloads PDF using Elsevier Article Retrieval API. `attempt` receives the status and content type of a failure."""
+        attempt = {} if attempt is None else attempt
         if not ELSEVIER_API_KEY:
             logger.warning("ELSEVIER_API_KEY not set. Skipping Elsevier API.")
             return False
@@ -198,19 +422,23 @@ class Extractor:
                 headers["X-ELS-Insttoken"] = ELSEVIER_INST_TOKEN
             
             logger.info(f"Requesting Elsevier API: {url}")
-            response = requests.get(url, headers=headers, stream=True, timeout=30)
+            response = self.http.get(url, headers=headers, stream=True, timeout=30)
+            attempt["status"] = response.status_code
+            attempt["content_type"] = response.headers.get("Content-Type", "").lower()
             
             if response.status_code == 200:
-                with open(save_path, "wb") as f:
-                    for chunk in response.iter_content(chunk_size=8192):
-                        f.write(chunk)
+                if not self._save_pdf(response, save_path, cancel):
+                    attempt["content_type"] += " (not a PDF)"
+                    return False
                 logger.info(f"Successfully downloaded Elsevier PDF: {save_path}")
                 return True
             else:
                 logger.warning(f"Elsevier API failed (Status: {response.status_code}): {response.text[:200]}")
+                response.close()
                 return False
         except Exception as e:
             logger.error(f"Elsevier API error: {e}")
+            attempt["content_type"] = type(e).__name__
             return False
 
     def _get_unpaywall_url(self, doi: str) -> str:
@@ -218,7 +446,7 @@ class Extractor:
         try:
             email = OPENALEX_EMAIL or "unpaywall@example.com"
             url = f"https://api.unpaywall.org/v2/{doi}?email={email}"
-            response = requests.get(url, timeout=10)
+            response = self.http.get(url, timeout=10)
             if response.status_code == 200:
                 data = response.json()
                 best_oa = data.get("best_oa_location", {})
@@ -236,7 +464,7 @@ class Extractor:
             headers = {"Authorization": f"Bearer {CORE_API_KEY}"}
             payload = {"q": f"doi:{doi}", "limit": 1}
             
-            response = requests.post(url, headers=headers, json=payload, timeout=15)
+            response = self.http.post(url, headers=headers, json=payload, timeout=15)
             
             if response.status_code == 200:
                 data = response.json()
@@ -257,8 +485,9 @@ class Extractor:
             return ""
 
     @retry(requests.exceptions.RequestException, tries=2, delay=5)
-    def _try_download_url(self, target_url: str, save_path: Path, paper: Paper) -> bool:
-        """Helper to attempt a download from a specific URL."""
+    def _try_download_url(self, target_url: str, save_path: Path, paper: Paper, cancel: threading.Event = None, attempt: dict = None) -> bool:
+        """Helper to attempt a download from a specific URL. `attempt` receives the status and content type of a failure."""
+        attempt = {} if attempt is None else attempt
         # Heuristics for specific publishers
         if "wiley.com" in target_url:
             if "/abs/" in target_url:
@@ -271,8 +500,9 @@ class Extractor:
         if "sciencedirect.com" in target_url or "linkinghub.elsevier.com" in target_url:
              try:
                 if "/pii/" not in target_url:
-                     r = requests.get(target_url, headers=self._get_headers(), verify=False, stream=True)
+                     r = self.http.get(target_url, headers=self._get_headers(), verify=False, stream=True)
                      target_url = r.url
+                     r.close()
              except:
                 pass
              if "/pii/" in target_url:
@@ -289,34 +519,100 @@ class Extractor:
             import urllib3
             urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
             
-            response = requests.get(target_url, headers=headers, stream=True, timeout=45, verify=False)
+            response = self.http.get(target_url, headers=headers, stream=True, timeout=45, verify=False)
             content_type = response.headers.get("Content-Type", "").lower()
+            attempt["status"] = response.status_code
+            attempt["content_type"] = content_type
             
             if response.status_code == 200 and "application/pdf" in content_type:
-                with open(save_path, "wb") as f:
-                    for chunk in response.iter_content(chunk_size=8192):
-                        f.write(chunk)
-                logger.info(f"Downloaded PDF to {save_path}")
-                return True
+                if self._save_pdf(response, save_path, cancel):
+                    return True
+                attempt["content_type"] += " (not a PDF)"
+                return False
             else:
                 logger.warning(f"Failed to download PDF (Status: {response.status_code}, Type: {content_type})")
+                response.close() # Release the connection back to the pool
                 return False
                 
         except Exception as e:
             logger.error(f"Error downloading PDF: {e}")
+            attempt["content_type"] = type(e).__name__
             return False
 
     def _extract_text(self, pdf_path: Path) -> str:
         try:
-            with fitz.open(pdf_path) as doc:
-                text = ""
-                for page in doc:
-                    text += page.get_text()
-
-                # Basic cleanup (remove too much whitespace)
-                return " ".join(text.split())
-
+            return self._clean_text(pdf_path, _read_pages(str(pdf_path)))
         except Exception as e:
             logger.error(f"Error extracting text from {pdf_path}: {e}")
             return ""
 
+    @staticmethod
+    def _clean_text(pdf_path: Path, pages: list[str]) -> str:
+        raw_text = " ".join("".join(pages).split())
+        # Drop running headers/footers and back matter to save synthesis tokens
+        text = clean_pages(pages) or raw_text
+        raw_tokens, tokens = estimate_tokens(raw_text), estimate_tokens(text)
+        logger.info(f"Text cleanup for {pdf_path.name}: {raw_tokens} -> {tokens} tokens ({raw_tokens - tokens} saved).")
+        return text
+
+    def extract_many(self, pdf_paths: Iterable[Path], jobs: int = None, use_cache: bool = True) -> Iterator[tuple[Path, str]]:
+        """
+        Bulk version of the PDF text extraction for re-synthesis and recovery runs.
+        Yields (pdf_path, text) in input order, each as soon as it (and the ones before it) is done.
+
+        Documents, and page ranges of documents longer than EXTRACT_PAGES_PER_TASK pages, are
+        spread across `jobs` processes (default: one per CPU). Cached texts are reused and
+        fresh ones cached, as in extract(), unless use_cache is False.
+        """
+        jobs = jobs or os.cpu_count() or 1
+        pdf_paths = iter(Path(p) for p in pdf_paths)
+        if jobs <= 1:
+            for pdf_path in pdf_paths:
+                try:
+                    text = self._cached_pdf_text(pdf_path) if use_cache else self._extract_text(pdf_path)
+                except Exception as e:
+                    # A missing or unreadable PDF yields "" and the run goes on, as in the pool path
+                    logger.error(f"Error extracting text from {pdf_path}: {e}")
+                    text = ""
+                yield pdf_path, text
+            return
+
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            def submit(pdf_path: Path) -> tuple:
+                """Returns (path, digest, cached text or None, page futures)."""
+                digest = None
+                try:
+                    if use_cache:
+                        digest = hashlib.sha256(pdf_path.read_bytes()).hexdigest()
+                        entry = self._read_text_cache(pdf_path.with_suffix(".txt.gz"))
+                        if entry and entry.get("sha256") == digest:
+                            return pdf_path, digest, entry["text"], []
+                    with fitz.open(pdf_path) as doc:
+                        page_count = doc.page_count
+                except Exception as e:
+                    logger.error(f"Error extracting text from {pdf_path}: {e}")
+                    return pdf_path, digest, "", []
+                futures = [
+                    pool.submit(_read_pages, str(pdf_path), start, min(start + EXTRACT_PAGES_PER_TASK, page_count))
+                    for start in range(0, page_count, EXTRACT_PAGES_PER_TASK)
+                ]
+                return pdf_path, digest, None, futures
+
+            # A bounded window of documents in flight keeps the pool busy without holding every text
+            window = deque(submit(p) for p in islice(pdf_paths, jobs * 4))
+            while window:
+                pdf_path, digest, text, futures = window.popleft()
+                next_path = next(pdf_paths, None)
+                if next_path is not None:
+                    window.append(submit(next_path))
+
+                if text is None:
+                    try:
+                        text = self._clean_text(pdf_path, [page for future in futures for page in future.result()])
+                    except Exception as e:
+                        logger.error(f"Error extracting text from {pdf_path}: {e}")
+                        text = ""
+                    if text and use_cache:
+                        self._write_text_cache(pdf_path.with_suffix(".txt.gz"), {"sha256": digest, "text": text})
+                yield pdf_path, text
+
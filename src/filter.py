@@ -1,11 +1,14 @@
 import requests
+import hashlib
 import json
 import re
-from src.config import OLLAMA_HOST, OLLAMA_FILTER_MODEL, RELEVANCE_ENGINE, RELEVANCE_MODEL, GEMINI_API_KEY
+from src.config import OLLAMA_HOST, OLLAMA_FILTER_MODEL, RELEVANCE_ENGINE, RELEVANCE_MODEL, GEMINI_API_KEY, RELEVANCE_CACHE_TTL_DAYS, RELEVANCE_CACHE_MAX_ENTRIES, RELEVANCE_BATCH_SIZE, RELEVANCE_NUM_CTX
 from src.models import Paper
 from src.logger import logger
 from src.db import db
-from src.utils import retry
+from src.gemini_client import GeminiClient, gemini_client
+from src.http_client import HttpClient, http_client
+from src.utils import retry, estimate_tokens
 
 def load_system_prompt() -> str:
     """Reads the system prompt from RELEVANCE_CONTEXT.md."""
@@ -83,6 +86,23 @@ Return ONLY a valid JSON object.
 }
 """
 
+BATCH_INSTRUCTIONS = """
+**BATCH MODE:** The input contains several papers, each introduced by a line "### Paper <index>".
+Apply the criteria above to each paper independently of the others.
+Instead of a single object, return ONLY a valid JSON object with exactly one entry per paper:
+
+{
+  "results": [
+    {"index": 0, "relevant": true, "reason": "Short explanation linking to specific criteria."}
+  ]
+}
+"""
+
+# Output tokens reserved for each paper's entry in a batch answer
+BATCH_OUTPUT_TOKENS_PER_PAPER = 150
+# Gemini Flash models accept ~1M input tokens; batches there are bounded by the batch size
+GEMINI_CONTEXT_TOKENS = 1_000_000
+
 def load_topic_lists() -> tuple[list[str], list[str]]:
     """Reads topic whitelist and blacklist from RELEVANCE_CONTEXT.md."""
     try:
@@ -133,19 +153,92 @@ def load_journal_blacklist() -> list[str]:
         return []
 
 SYSTEM_PROMPT = load_system_prompt()
+# Part of the verdict cache key: editing RELEVANCE_CONTEXT.md invalidates every cached verdict
+PROMPT_HASH = hashlib.sha256(SYSTEM_PROMPT.encode("utf-8")).hexdigest()
 TOPIC_WHITELIST, TOPIC_BLACKLIST = load_topic_lists()
 JOURNAL_BLACKLIST = load_journal_blacklist()
 
 class RelevanceFilter:
-    def __init__(self, engine: str = RELEVANCE_ENGINE, model: str = RELEVANCE_MODEL):
+    def __init__(self, engine: str = RELEVANCE_ENGINE, model: str = RELEVANCE_MODEL, http: HttpClient = None, batch_size: int = RELEVANCE_BATCH_SIZE, gemini: GeminiClient = None):
         self.engine = engine
         self.model = model
+        self.batch_size = batch_size
+        self.http = http or http_client
+        self.gemini = gemini or gemini_client
         self.ollama_url = f"{OLLAMA_HOST}/api/generate"
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.batch_requests = 0
+        self.batched_papers = 0
+        self.batch_fallbacks = 0
+        self.saved_prompt_tokens = 0
+
+    def _verdict_model(self) -> str:
+        """Engine and model that will actually answer (Gemini falls back to Ollama without an API key)."""
+        if self.engine == "gemini" and GEMINI_API_KEY:
+            return f"gemini:{self.model}"
+        return f"ollama:{self.model if self.engine == 'ollama' else OLLAMA_FILTER_MODEL}"
+
+    @staticmethod
+    def _content_hash(paper: Paper) -> str:
+        return hashlib.sha256(f"{paper.title}\n{paper.abstract}".encode("utf-8")).hexdigest()
+
+    def record_run_stats(self):
+        """
+        Records this run's verdict cache hit/miss counts and batching savings as events,
+        and applies the cache TTL/size eviction.
+        """
+        removed = db.prune_relevance_cache(PROMPT_HASH, RELEVANCE_CACHE_TTL_DAYS, RELEVANCE_CACHE_MAX_ENTRIES)
+        lookups = self.cache_hits + self.cache_misses
+        if lookups or removed:
+            hit_rate = (self.cache_hits / lookups * 100) if lookups else 0.0
+            msg = f"Relevance cache: {self.cache_hits} hits, {self.cache_misses} misses ({hit_rate:.0f}% hit rate), {removed} entries evicted."
+            logger.info(msg)
+            db.add_event("CACHE", msg)
+        if self.batch_requests:
+            msg = (f"Relevance batching: {self.batched_papers} papers in {self.batch_requests} requests, "
+                   f"{self.batch_fallbacks} per-paper fallbacks, ~{self.saved_prompt_tokens} prompt tokens saved.")
+            logger.info(msg)
+            db.add_event("BATCH", msg)
 
     def check_relevance(self, paper: Paper) -> bool:
         title_for_log = (paper.title or "No Title")[:50]
         logger.info(f"Checking relevance for: {title_for_log}... using {self.engine}")
         
+        if not self._prescreen(paper):
+            return False
+
+        # 4. BARRERA 4: LLM FILTER (verdicts are cached per title+abstract, system prompt and model)
+        if self._cached_verdict(paper):
+            return paper.is_relevant
+
+        return self._check_single(paper)
+
+    def check_relevance_batch(self, papers: list[Paper]) -> list[bool]:
+        """
+        Same verdicts as check_relevance, but papers that reach the LLM are classified
+        RELEVANCE_BATCH_SIZE at a time, sending the system prompt once per batch.
+        Returns one verdict per paper, in order (also set on paper.is_relevant).
+        """
+        pending = []
+        for paper in papers:
+            title_for_log = (paper.title or "No Title")[:50]
+            logger.info(f"Checking relevance for: {title_for_log}... using {self.engine}")
+            if self._prescreen(paper) and not self._cached_verdict(paper):
+                pending.append(paper)
+
+        if len(pending) > 1 and self.batch_size > 1:
+            logger.info(f"Classifying {len(pending)} papers in batches of up to {self.batch_size}...")
+            for batch in self._make_batches(pending):
+                self._classify_batch(batch)
+        else:
+            for paper in pending:
+                self._check_single(paper)
+
+        return [paper.is_relevant for paper in papers]
+
+    def _prescreen(self, paper: Paper) -> bool:
+        """Applies the journal and topic lists. Returns False (verdict set) if the paper is rejected."""
         # 1. BARRERA 1: Journal Blacklist (Immediate REJECT)
         if paper.source and JOURNAL_BLACKLIST:
             source_lower = paper.source.lower()
@@ -186,13 +279,157 @@ class RelevanceFilter:
                     paper.relevance_reason = msg
                     return False
 
-        # 4. BARRERA 4: LLM FILTER
+        return True
+
+    def _cached_verdict(self, paper: Paper) -> bool:
+        """Sets a cached verdict on the paper if there is one. Returns whether it was found."""
+        model = self._verdict_model()
+        cached = db.get_cached_verdict(self._content_hash(paper), PROMPT_HASH, model, RELEVANCE_CACHE_TTL_DAYS)
+        if not cached:
+            self.cache_misses += 1
+            return False
+        self.cache_hits += 1
+        paper.is_relevant, paper.relevance_reason = cached
+        logger.info(f"{'✅' if paper.is_relevant else '❌'} Cached verdict ({model}): {paper.relevance_reason}")
+        return True
+
+    def _check_single(self, paper: Paper) -> bool:
+        """One LLM request for one paper."""
+        # The engines only set a reason when they got a verdict; errors return False without one
+        paper.relevance_reason = ""
         if self.engine == "gemini":
-            return self._check_relevance_gemini(paper)
+            is_relevant = self._check_relevance_gemini(paper)
         else:
-            return self._check_relevance_ollama(paper)
+            is_relevant = self._check_relevance_ollama(paper)
+        self._store_verdict(paper)
+        return is_relevant
+
+    def _store_verdict(self, paper: Paper):
+        if paper.relevance_reason:
+            db.cache_verdict(self._content_hash(paper), PROMPT_HASH, self._verdict_model(), paper.is_relevant, paper.relevance_reason)
+
+    @staticmethod
+    def _paper_prompt(paper: Paper) -> str:
+        return f"Title: {paper.title}\n\nAbstract: {paper.abstract}\n"
+
+    def _make_batches(self, papers: list[Paper]) -> list[list[Paper]]:
+        """Groups papers into batches of at most batch_size whose prompt and answer fit the model's context."""
+        context_tokens = GEMINI_CONTEXT_TOKENS if self._verdict_model().startswith("gemini:") else RELEVANCE_NUM_CTX
+        budget = context_tokens - estimate_tokens(SYSTEM_PROMPT + BATCH_INSTRUCTIONS)
+        batches, batch, used = [], [], 0
+        for paper in papers:
+            cost = estimate_tokens(self._paper_prompt(paper)) + BATCH_OUTPUT_TOKENS_PER_PAPER
+            if batch and (len(batch) >= self.batch_size or used + cost > budget):
+                batches.append(batch)
+                batch, used = [], 0
+            batch.append(paper)
+            used += cost
+        if batch:
+            batches.append(batch)
+        return batches
+
+    def _classify_batch(self, batch: list[Paper]):
+        """Classifies a batch in one request; papers missing from a malformed answer are checked one by one."""
+        if len(batch) == 1:
+            self._check_single(batch[0])
+            return
+
+        prompt = "\n".join(f"### Paper {i}\n{self._paper_prompt(paper)}" for i, paper in enumerate(batch))
+        model = self._verdict_model()
+        verdicts = {}
+        try:
+            if model.startswith("gemini:"):
+                response = self._classify_batch_gemini(prompt)
+                verdicts = self._parse_batch_response(response.text or "", len(batch))
+            else:
+                text, prompt_tokens, completion_tokens = self._classify_batch_ollama(prompt, len(batch))
+                verdicts = self._parse_batch_response(text, len(batch))
+            # The system prompt went out once instead of once per classified paper
+            saved = max(0, (len(verdicts) - 1) * estimate_tokens(SYSTEM_PROMPT) - estimate_tokens(BATCH_INSTRUCTIONS))
+            self.saved_prompt_tokens += saved
+            if model.startswith("gemini:"):
+                self.gemini.record_usage(response, self.model, saved_prompt_tokens=saved)
+            else:
+                db.add_usage(model.split(":", 1)[1], prompt_tokens, completion_tokens, 0.0, saved_prompt_tokens=saved)
+        except Exception as e:
+            msg = f"Batch relevance classification failed ({e}). Falling back to per-paper requests."
+            logger.warning(msg)
+            db.add_event("WARNING", msg)
+
+        self.batch_requests += 1
+        for i, paper in enumerate(batch):
+            if i not in verdicts:
+                self.batch_fallbacks += 1
+                self._check_single(paper)
+                continue
+            self.batched_papers += 1
+            paper.is_relevant, paper.relevance_reason = verdicts[i]
+            if paper.is_relevant:
+                logger.info(f"✅ Paper is relevant: {paper.relevance_reason}")
+            else:
+                logger.info(f"❌ Paper not relevant.")
+            self._store_verdict(paper)
+
+    @staticmethod
+    def _parse_batch_response(text: str, count: int) -> dict[int, tuple[bool, str]]:
+        """Validates a batch answer. Returns index -> (relevant, reason) for the well-formed entries only."""
+        data = json.loads(text)
+        if isinstance(data, dict):
+            data = data.get("results")
+        if not isinstance(data, list):
+            raise ValueError("answer has no 'results' array")
+        verdicts = {}
+        for entry in data:
+            if not isinstance(entry, dict):
+                continue
+            index = entry.get("index")
+            relevant = entry.get("relevant")
+            if type(index) is int and 0 <= index < count and isinstance(relevant, bool) and index not in verdicts:
+                verdicts[index] = (relevant, entry.get("reason") or "No reason provided.")
+        return verdicts
+
+    @retry(Exception, tries=2, delay=5)
+    def _classify_batch_gemini(self, prompt: str):
+        return self.gemini.generate(
+            self.model,
+            f"{SYSTEM_PROMPT}\n{BATCH_INSTRUCTIONS}",
+            prompt,
+            temperature=0.0,
+            response_mime_type="application/json",
+        )
+
+    @retry(requests.exceptions.RequestException, tries=2, delay=5)
+    def _classify_batch_ollama(self, prompt: str, count: int) -> tuple[str, int, int]:
+        model = self.model if self.engine == "ollama" else OLLAMA_FILTER_MODEL
+        payload = {
+            "model": model,
+            "prompt": prompt,
+            "system": f"{SYSTEM_PROMPT}\n{BATCH_INSTRUCTIONS}",
+            "stream": False,
+            "format": "json",
+            "options": {
+                "temperature": 0.0,
+                "num_ctx": RELEVANCE_NUM_CTX,
+                "num_predict": BATCH_OUTPUT_TOKENS_PER_PAPER * count,
+                "stop": ["<think>", "</think>"]
+            }
+        }
+        response = self.http.post(self.ollama_url, json=payload, timeout=300 + 60 * count)
+        response.raise_for_status()
+        data = response.json()
+        return data.get("response", ""), data.get("prompt_eval_count", 0), data.get("eval_count", 0)
 
     @retry(Exception, tries=3, delay=5)
+    def _classify_single_gemini(self, prompt: str):
+        # Using JSON mode for structured output; the fixed prompt is a (cached) system instruction
+        return self.gemini.generate(
+            self.model,
+            SYSTEM_PROMPT,
+            prompt,
+            temperature=0.0,
+            response_mime_type="application/json",
+        )
+
     def _check_relevance_gemini(self, paper: Paper) -> bool:
         if not GEMINI_API_KEY:
             logger.error("GEMINI_API_KEY not found. Falling back to Ollama.")
@@ -201,33 +438,13 @@ class RelevanceFilter:
         prompt = f"Title: {paper.title}\n\nAbstract: {paper.abstract}\n"
         
         try:
-            from google import genai
-            from google.genai import types
-            
-            client = genai.Client(api_key=GEMINI_API_KEY)
-            
-            # Using JSON mode for structured output if supported, or just prompt engineering
-            response = client.models.generate_content(
-                model=self.model,
-                contents=f"{SYSTEM_PROMPT}\n\n{prompt}",
-                config={
-                    "temperature": 0.0,
-                    "response_mime_type": "application/json"
-                }
-            )
+            # Transient API errors are retried in _classify_single_gemini before they land here
+            response = self._classify_single_gemini(prompt)
 
             if response and response.text:
                 # Record usage
                 try:
-                    usage = response.usage_metadata
-                    # Costs for Gemini 1.5 Flash (approximate: Input $0.10/1M, Output $0.40/1M)
-                    # Note: These rates might change, checking official pricing is good but this is an estimate.
-                    # 1.5 Flash prices (Feb 2026): Input $0.075/1M, Output $0.30/1M (<128k context)
-                    # Using the provided rates in synthesizer.py ($0.10/$0.40) for consistency or updating if needed.
-                    # I'll stick to the one used in synthesizer for now or use the generic one.
-                    # Let's use $0.10 and $0.40 as "safe" upper bounds or standard.
-                    cost = (usage.prompt_token_count * 0.10 / 1_000_000) + (usage.candidates_token_count * 0.40 / 1_000_000)
-                    db.add_usage(self.model, usage.prompt_token_count, usage.candidates_token_count, cost)
+                    self.gemini.record_usage(response, self.model)
                 except Exception as e:
                     logger.warning(f"Could not record usage: {e}")
 
@@ -271,7 +488,7 @@ class RelevanceFilter:
         }
 
         try:
-            response = requests.post(self.ollama_url, json=payload, timeout=300)
+            response = self.http.post(self.ollama_url, json=payload, timeout=300)
             response.raise_for_status()
             
             data = response.json()
@@ -0,0 +1,142 @@
+import hashlib
+import threading
+import time
+from src.config import GEMINI_API_KEY, GEMINI_CACHE_TTL_SECONDS
+from src.db import db
+from src.logger import logger
+
+# Approximate Flash pricing per 1M tokens. Cached prompt tokens are billed at a quarter of
+# the input rate, plus storage while the cached-content object is alive.
+INPUT_PRICE = 0.10
+CACHED_INPUT_PRICE = 0.025
+OUTPUT_PRICE = 0.40
+CACHE_STORAGE_PRICE_PER_HOUR = 1.00
+
+# Recreate a cache this long before it expires rather than risk a request on an expired one
+CACHE_REFRESH_MARGIN = 60
+
+def _error_code(e: Exception):
+    """HTTP status of a google-genai APIError (None for other exceptions)."""
+    code = getattr(e, "code", None)
+    return code if isinstance(code, int) else None
+
+def _cache_gone(e: Exception) -> bool:
+    """The cached content referenced by a request no longer exists or is not ours (expired, deleted)."""
+    return _error_code(e) in (403, 404)
+
+def _too_small_to_cache(e: Exception) -> bool:
+    """caches.create refused the instruction for being under the model's minimum cacheable size."""
+    message = str(e).lower()
+    return _error_code(e) == 400 and ("too small" in message or "min_total_token_count" in message)
+
+def usage_cost(prompt_tokens: int, completion_tokens: int, cached_tokens: int = 0) -> float:
+    """Cost of one request. prompt_tokens includes the cached tokens, as reported by the API."""
+    uncached = max(0, prompt_tokens - cached_tokens)
+    return (uncached * INPUT_PRICE + cached_tokens * CACHED_INPUT_PRICE + completion_tokens * OUTPUT_PRICE) / 1_000_000
+
+class GeminiClient:
+    """
+    Shared Google GenAI client for the whole run (the SDK client keeps its HTTP connections).
+
+    Fixed instruction text (the synthesis and relevance prompts) is sent as a system
+    instruction and, when the model accepts it, stored once as a cached-content object that
+    every request references, so it is not re-sent and is billed at the cached-token rate.
+    Prompts below the model's minimum cache size are sent as a plain system instruction
+    (Gemini 2.5 still applies implicit caching to the repeated prefix).
+
+    :param api_key: Gemini API key.
+    :param cache_ttl: Lifetime in seconds of the cached-content objects (0 disables explicit caching).
+    :param client: Pre-built client (tests); by default a genai.Client is created on first use.
+    """
+    def __init__(self, api_key: str = GEMINI_API_KEY, cache_ttl: int = GEMINI_CACHE_TTL_SECONDS, client=None):
+        self.api_key = api_key
+        self.cache_ttl = cache_ttl
+        self._client = client
+        self._lock = threading.Lock()
+        # (model, instruction hash) -> (cache name, expiry timestamp), or None if the model refused it
+        self._caches = {}
+
+    @property
+    def client(self):
+        with self._lock:
+            if self._client is None:
+                from google import genai
+                self._client = genai.Client(api_key=self.api_key)
+            return self._client
+
+    def generate(self, model: str, system_instruction: str, contents: str, **config):
+        """Runs generate_content with the fixed system_instruction served from the context cache when possible."""
+        cache_name = self._cached_content(model, system_instruction)
+        if cache_name:
+            try:
+                return self.client.models.generate_content(model=model, contents=contents, config={**config, "cached_content": cache_name})
+            except Exception as e:
+                # Transient errors (429, 5xx) go to the caller's retry; the cache stays in use
+                if not _cache_gone(e):
+                    raise
+                # Expired or deleted server-side: forget it and send the instruction inline this time
+                logger.warning(f"Gemini cached content {cache_name} unusable ({e}). Sending the instruction inline.")
+                with self._lock:
+                    self._caches.pop(self._cache_key(model, system_instruction), None)
+        return self.client.models.generate_content(model=model, contents=contents, config={**config, "system_instruction": system_instruction})
+
+    def record_usage(self, response, model: str, saved_prompt_tokens: int = 0) -> float:
+        """Records the request in the usage table, pricing cached prompt tokens at the cached rate. Returns the cost."""
+        usage = response.usage_metadata
+        prompt_tokens = usage.prompt_token_count or 0
+        completion_tokens = usage.candidates_token_count or 0
+        cached_tokens = getattr(usage, "cached_content_token_count", None) or 0
+        cost = usage_cost(prompt_tokens, completion_tokens, cached_tokens)
+        db.add_usage(model, prompt_tokens, completion_tokens, cost, saved_prompt_tokens=saved_prompt_tokens, cached_prompt_tokens=cached_tokens)
+        return cost
+
+    def close(self):
+        """Deletes the cached-content objects created by this run, which stops their storage billing."""
+        with self._lock:
+            caches, self._caches = self._caches, {}
+        for entry in caches.values():
+            if not entry:
+                continue
+            try:
+                self._client.caches.delete(name=entry[0])
+            except Exception as e:
+                logger.warning(f"Could not delete Gemini cached content {entry[0]}: {e}")
+
+    @staticmethod
+    def _cache_key(model: str, system_instruction: str) -> tuple:
+        return model, hashlib.sha256(system_instruction.encode("utf-8")).hexdigest()
+
+    def _cached_content(self, model: str, system_instruction: str):
+        """Returns the name of a live cached-content object holding system_instruction, creating it if needed."""
+        if self.cache_ttl <= 0:
+            return None
+        key = self._cache_key(model, system_instruction)
+        client = self.client
+        with self._lock:
+            if key in self._caches:
+                entry = self._caches[key]
+                if entry is None or entry[1] - CACHE_REFRESH_MARGIN > time.time():
+                    return entry and entry[0]
+            try:
+                cache = client.caches.create(model=model, config={
+                    "system_instruction": system_instruction,
+                    "display_name": f"biblioassistant-{key[1][:12]}",
+                    "ttl": f"{self.cache_ttl}s",
+                })
+            except Exception as e:
+                if _too_small_to_cache(e):
+                    logger.info(f"Gemini context caching unavailable for {model} ({e}). Using a plain system instruction.")
+                    self._caches[key] = None
+                else:
+                    # Possibly transient: send the instruction inline this time and try again next request
+                    logger.warning(f"Could not create Gemini cached content for {model} ({e}). Sending the instruction inline.")
+                return None
+            self._caches[key] = (cache.name, time.time() + self.cache_ttl)
+
+        tokens = getattr(getattr(cache, "usage_metadata", None), "total_token_count", None) or 0
+        storage_cost = tokens * CACHE_STORAGE_PRICE_PER_HOUR * self.cache_ttl / 3600 / 1_000_000
+        db.add_usage(model, 0, 0, storage_cost)
+        logger.info(f"Created Gemini cached content {cache.name} ({tokens} tokens, TTL {self.cache_ttl}s).")
+        return cache.name
+
+gemini_client = GeminiClient()
@@ -1,24 +1,131 @@
+import os
 import shutil
 import markdown2
+import hashlib
 import html
 import json
 import sqlite3
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from jinja2 import Environment, FileSystemLoader
 from pathlib import Path
 from typing import List, Dict
-from src.config import TEMPLATES_DIR, PUBLIC_DIR, SUMMARIES_DIR, PAPERS_DIR, SITE_URL, SITE_TITLE, AUTHOR_NORMALIZATION
+from src.config import TEMPLATES_DIR, PUBLIC_DIR, SUMMARIES_DIR, PAPERS_DIR, DATA_DIR, SITE_URL, SITE_TITLE, AUTHOR_NORMALIZATION
 from src.db import db
 from src.logger import logger
+from src.summaries import sidecar_path, read_sidecar, parse_markdown
+
+# Bump to invalidate every entry of the incremental build manifest (e.g. after changing parsing or rendering)
+GENERATOR_VERSION = 2
+MANIFEST_PATH = DATA_DIR / "build_manifest.json"
+
+class PaperRecord:
+    """
+    Compact index entry of one summary, used to build the listing pages. It holds no Markdown
+    or HTML: paper pages are rendered from the summary file one at a time and then dropped.
+    """
+    __slots__ = (
+        'title', 'author', 'journal', 'date_obj', 'added_date_obj', 'preview', 'doi',
+        'db_authors', 'db_journal', 'md_authors', 'first_author_id', 'source_hash',
+        'original_link', 'year', 'filename', 'fingerprint'
+    )
+
+    def __init__(self, **fields):
+        for name, value in fields.items():
+            setattr(self, name, value)
+        # Stands in for the whole record when hashing the inputs of listing pages
+        self.fingerprint = SiteGenerator._hash([fields[name] for name in sorted(fields)])
+
+    @property
+    def date(self) -> str:
+        return self.date_obj.strftime("%Y-%m-%d")
+
+    @property
+    def month(self) -> str:
+        return self.date_obj.strftime("%B")
+
+    @property
+    def rel_path(self) -> str:
+        return f"summaries/{self.year}/{self.filename}.html"
+
+    @property
+    def md_path(self) -> Path:
+        return SUMMARIES_DIR / self.year / f"{self.filename}.md"
+
+def _json_default(obj):
+    if isinstance(obj, PaperRecord):
+        return obj.fingerprint
+    return str(obj)
 
 class SiteGenerator:
-    def __init__(self):
-        self.env = Environment(loader=FileSystemLoader(TEMPLATES_DIR))
-        self.env.filters['slugify'] = self._slugify
+    def __init__(self, jobs: int = 1):
+        self.env = _create_environment()
+        self.jobs = jobs # Processes used to render paper pages
         self.journal_url_map = {} # Name -> URL
         self.urls = [] # List of relative paths for the sitemap
+        self.manifest = {"summaries": {}, "pages": {}} # Previous build
+        self.new_manifest = {"summaries": {}, "pages": {}} # Current build
+        self.rendered_pages = 0
+        self.unchanged_pages = 0
+
+    @staticmethod
+    def _hash(*parts) -> str:
+        """Stable content hash of JSON-serializable inputs (datetimes are stringified)."""
+        payload = json.dumps(parts, sort_keys=True, default=_json_default, ensure_ascii=False)
+        return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+    def _build_key(self) -> str:
+        """Hash of everything that affects every page: templates, site settings and generator version."""
+        template_hashes = {t.name: hashlib.sha1(t.read_bytes()).hexdigest() for t in sorted(TEMPLATES_DIR.glob("*.html"))}
+        return self._hash(GENERATOR_VERSION, SITE_URL, SITE_TITLE, AUTHOR_NORMALIZATION, template_hashes)
+
+    def _load_manifest(self, full_rebuild: bool):
+        """Loads the previous build manifest unless a full rebuild is requested or the build key changed."""
+        build_key = self._build_key()
+        self.new_manifest = {"build_key": build_key, "summaries": {}, "pages": {}}
+        if full_rebuild or not MANIFEST_PATH.exists():
+            return
+        try:
+            with open(MANIFEST_PATH, "r") as f:
+                manifest = json.load(f)
+        except Exception as e:
+            logger.warning(f"Could not read build manifest, rebuilding everything: {e}")
+            return
+        if manifest.get("build_key") != build_key:
+            logger.info("Templates or generator changed since the last build. Rebuilding all pages.")
+            # Parsed summaries stay valid; only rendered pages are invalidated
+            if manifest.get("version") == GENERATOR_VERSION:
+                self.manifest["summaries"] = manifest.get("summaries", {})
+            return
+        self.manifest = manifest
+
+    def _save_manifest(self):
+        self.new_manifest["version"] = GENERATOR_VERSION
+        MANIFEST_PATH.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = MANIFEST_PATH.with_suffix(".tmp")
+        # Streamed to disk: the serialized manifest is never held in memory as one string
+        with open(tmp_path, "w") as f:
+            json.dump(self.new_manifest, f)
+        tmp_path.replace(MANIFEST_PATH)
+
+    def _is_fresh(self, rel_path: str, key: str) -> bool:
+        """Records the inputs of a page and tells whether it is unchanged since the last build."""
+        self.new_manifest["pages"][rel_path] = key
+        if self.manifest["pages"].get(rel_path) == key and (PUBLIC_DIR / rel_path).exists():
+            self.unchanged_pages += 1
+            return True
+        self.rendered_pages += 1
+        return False
+
+    def _render_page(self, rel_path: str, template_name: str, **context):
+        """Renders template_name into PUBLIC_DIR/rel_path, skipping it if its inputs did not change."""
+        if self._is_fresh(rel_path, self._hash(template_name, context)):
+            return
+        output = self.env.get_template(template_name).render(**context)
+        self._write_if_changed(PUBLIC_DIR / rel_path, output)
 
-    def _write_if_changed(self, file_path: Path, content: str):
+    @staticmethod
+    def _write_if_changed(file_path: Path, content: str):
         """Writes content to file_path only if it differs from existing content."""
         if file_path.exists():
             existing_content = file_path.read_text()
@@ -30,8 +137,16 @@ class SiteGenerator:
         with open(file_path, "w") as f:
             f.write(content)
 
-    def build(self):
+    def build(self, full_rebuild: bool = False):
+        """
+        Builds the site incrementally: a manifest (data/build_manifest.json) stores the content hash
+        of each summary and the inputs of each page, so only pages whose inputs changed are re-rendered.
+
+        Two passes keep memory bounded: the first collects compact PaperRecord index entries that
+        drive every listing page, the second renders paper pages one at a time from their Markdown.
+        """
         logger.info("Starting static site generation...")
+        self._load_manifest(full_rebuild)
         
         # Ensure public directory exists
         PUBLIC_DIR.mkdir(parents=True, exist_ok=True)
@@ -74,21 +189,21 @@ class SiteGenerator:
         
         for p in all_papers:
             # Normalize title for comparison: lowercase, alphanumeric only
-            norm_title = re.sub(r'[^a-z0-9]', '', p['title'].lower())
+            norm_title = re.sub(r'[^a-z0-9]', '', p.title.lower())
             
             if norm_title in seen_titles:
                 existing = seen_titles[norm_title]
                 
                 # Preference logic:
                 # 1. Prefer ones with a real DOI (not an OpenAlex URL placeholder)
-                p_has_real_doi = p.get('doi') and not str(p['doi']).startswith('https://openalex.org/')
-                ex_has_real_doi = existing.get('doi') and not str(existing['doi']).startswith('https://openalex.org/')
+                p_has_real_doi = p.doi and not str(p.doi).startswith('https://openalex.org/')
+                ex_has_real_doi = existing.doi and not str(existing.doi).startswith('https://openalex.org/')
                 
                 if p_has_real_doi and not ex_has_real_doi:
                     seen_titles[norm_title] = p
                 elif not (ex_has_real_doi and not p_has_real_doi):
                     # If DOI status is equal, keep the most recently processed one
-                    if p['added_date_obj'] > existing['added_date_obj']:
+                    if p.added_date_obj > existing.added_date_obj:
                         seen_titles[norm_title] = p
                 continue
             
@@ -97,11 +212,10 @@ class SiteGenerator:
         papers = list(seen_titles.values())
         
         # Sort by publication date (descending), then by added date as fallback
-        papers.sort(key=lambda x: (x['date_obj'], x['added_date_obj']), reverse=True)
+        papers.sort(key=lambda x: (x.date_obj, x.added_date_obj), reverse=True)
         
         # Generate individual pages
-        for paper in papers:
-            self._render_paper(paper)
+        self._render_papers(papers)
             
         # Generate Index (Recent 20)
         self._render_index(papers[:20])
@@ -144,13 +258,26 @@ class SiteGenerator:
 
         # Generate Sitemap
         self._generate_sitemap()
-        
-        logger.info("Site generation complete.")
+
+        self._save_manifest()
+        logger.info(f"Site generation complete. Rendered {self.rendered_pages} pages, {self.unchanged_pages} unchanged.")
 
     def _generate_sitemap(self):
         """Generates a sitemap.xml file with all collected URLs."""
         logger.info(f"Generating sitemap for {len(self.urls)} pages...")
         
+        # Ensure robots.txt points to it
+        robots_txt = f"User-agent: *\nAllow: /\n\nSitemap: {SITE_URL.rstrip('/')}/sitemap.xml\n"
+        self._write_if_changed(PUBLIC_DIR / "robots.txt", robots_txt)
+
+        # Add root index manually if not already added
+        if "/" not in self.urls:
+            self.urls.append("/")
+
+        # The sitemap only changes when the set of pages does
+        if self._is_fresh("sitemap.xml", self._hash(sorted(set(self.urls)))):
+            return
+        
         xml_lines = [
             '<?xml version="1.0" encoding="UTF-8"?>',
             '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
@@ -158,9 +285,6 @@ class SiteGenerator:
         
         # Add a unique list of URLs
         seen = set()
-        # Add root index manually if not already added
-        if "/" not in self.urls:
-            self.urls.append("/")
 
         for path in sorted(set(self.urls)):
             if path in seen: continue
@@ -188,28 +312,11 @@ class SiteGenerator:
         xml_lines.append("</urlset>")
         
         self._write_if_changed(PUBLIC_DIR / "sitemap.xml", "\n".join(xml_lines))
-        
-        # Also ensure robots.txt points to it
-        robots_txt = f"User-agent: *\nAllow: /\n\nSitemap: {SITE_URL.rstrip('/')}/sitemap.xml\n"
-        self._write_if_changed(PUBLIC_DIR / "robots.txt", robots_txt)
 
-    def _extract_authors(self, paper):
-        """Extracts a list of clean author names from a paper's raw content."""
-        import re
-        match = re.search(r"-\s+\*\*Authors:\*\*\s+(.*)", paper['raw_content'])
-        authors_to_index = []
-        if match:
-            authors_str = match.group(1).strip()
-            # 1. Prefer semicolon as primary separator if present
-            if ';' in authors_str:
-                authors_to_index = [a.strip() for a in re.split(r";| and ", authors_str) if a.strip()]
-            # 2. Otherwise use comma but avoid the even-parts-swap trap
-            else:
-                # Common pattern: Name Surname, Name Surname
-                authors_to_index = [a.strip() for a in re.split(r",| and ", authors_str) if a.strip()]
-        else:
-            # Fallback to the main author field if no authors block found
-            authors_to_index = [paper['author']]
+    def _extract_authors(self, authors: List[str], fallback_author: str):
+        """Returns the clean, normalized author names of a summary's author list."""
+        # Fallback to the main author field if the summary lists no authors
+        authors_to_index = authors or [fallback_author]
 
         # Final cleanup: remove short strings or institutional names
         clean_authors = [name for name in authors_to_index if len(name) >= 4 and "Geological Survey" not in name]
@@ -230,7 +337,7 @@ class SiteGenerator:
         
         for paper in papers:
             # Use authors from DB
-            authors_data = paper.get('db_authors', [])
+            authors_data = paper.db_authors
             
             if authors_data:
                 for auth in authors_data:
@@ -239,7 +346,7 @@ class SiteGenerator:
                     
                     # If the name is just the ID (fallback in DB), try to get it from Markdown
                     if name == aid:
-                        extracted_names = self._extract_authors(paper)
+                        extracted_names = paper.md_authors
                         if extracted_names:
                             # This is a bit of a guess but better than showing the ID
                             name = extracted_names[0]
@@ -247,33 +354,26 @@ class SiteGenerator:
                     if aid not in author_map:
                         author_map[aid] = {'name': name, 'papers': []}
 
-                    author_map[aid]['papers'].append({
-                        'title': paper['title'],
-                        'year': paper['date_obj'].year,
-                        'rel_path': paper['rel_path'],
-                        'other_authors_count': len(authors_data) - 1
-                    })
-
-        template = self.env.get_template("author.html")
-        out_dir = PUBLIC_DIR / "authors"
-        out_dir.mkdir(exist_ok=True)
+                    # Keep a reference to the index record; the page entries are built per author below
+                    author_map[aid]['papers'].append(paper)
 
         for aid, data in author_map.items():
-            author_papers = data['papers']
-            author_papers.sort(key=lambda x: x['year'], reverse=True)
-            
             # Final safety check: never show raw ID as name to user
             display_name = data['name']
             if display_name.startswith('A') and display_name[1:].isdigit():
                 # If we still have an ID, skip generating this page or use fallback
                 continue
 
-            output = template.render(
-                author_name=display_name,
-                papers=author_papers
-            )
+            author_papers = [{
+                'title': paper.title,
+                'year': paper.date_obj.year,
+                'rel_path': paper.rel_path,
+                'other_authors_count': len(paper.db_authors) - 1
+            } for paper in data['papers']]
+            author_papers.sort(key=lambda x: x['year'], reverse=True)
+
             self.urls.append(f"/authors/{aid}.html")
-            self._write_if_changed(out_dir / f"{aid}.html", output)
+            self._render_page(f"authors/{aid}.html", "author.html", author_name=display_name, papers=author_papers)
 
     def _render_authors_list_page(self, papers):
         """Generates a master list of all authors, sorted alphabetically (Surname, Name)."""
@@ -282,7 +382,7 @@ class SiteGenerator:
         # author_id -> {name: str, count: int}
         author_data_map = {}
         for paper in papers:
-            authors_data = paper.get('db_authors', [])
+            authors_data = paper.db_authors
             
             if authors_data:
                 for auth in authors_data:
@@ -291,7 +391,7 @@ class SiteGenerator:
                     
                     # If the name is just the ID (fallback in DB), try to get it from Markdown
                     if name == aid:
-                        extracted_names = self._extract_authors(paper)
+                        extracted_names = paper.md_authors
                         if extracted_names:
                             name = extracted_names[0]
 
@@ -315,12 +415,8 @@ class SiteGenerator:
         # Sort by Surname, Name using the canonical name
         authors_list.sort(key=lambda x: self._author_sort_key(x['name']))
 
-        template = self.env.get_template("authors.html")
-        output = template.render(
-            authors=authors_list
-        )
         self.urls.append("/authors.html")
-        self._write_if_changed(PUBLIC_DIR / "authors.html", output)
+        self._render_page("authors.html", "authors.html", authors=authors_list)
 
     def _render_journal_pages(self, papers):
         """Generates a separate page for each journal with its list of papers."""
@@ -328,7 +424,7 @@ class SiteGenerator:
         journal_map = {}
         
         for paper in papers:
-            journal_data = paper.get('db_journal')
+            journal_data = paper.db_journal
             if journal_data:
                 jid = journal_data['id']
                 if jid not in journal_map:
@@ -338,25 +434,22 @@ class SiteGenerator:
                         'papers': []
                     }
                 
-                journal_map[jid]['papers'].append({
-                    'title': paper['title'],
-                    'year': paper['date_obj'].year,
-                    'rel_path': paper['rel_path']
-                })
-
-        template = self.env.get_template("journal.html")
-        out_dir = PUBLIC_DIR / "journals"
-        out_dir.mkdir(exist_ok=True)
+                journal_map[jid]['papers'].append(paper)
 
         for jid, data in journal_map.items():
-            data['papers'].sort(key=lambda x: x['year'], reverse=True)
-            output = template.render(
+            journal_papers = [{
+                'title': paper.title,
+                'year': paper.date_obj.year,
+                'rel_path': paper.rel_path
+            } for paper in data['papers']]
+            journal_papers.sort(key=lambda x: x['year'], reverse=True)
+            self.urls.append(f"/journals/{jid}.html")
+            self._render_page(
+                f"journals/{jid}.html", "journal.html",
                 journal_name=data['name'],
                 journal_url=data['url'],
-                papers=data['papers']
+                papers=journal_papers
             )
-            self.urls.append(f"/journals/{jid}.html")
-            self._write_if_changed(out_dir / f"{jid}.html", output)
 
     def _render_journals_list_page(self, papers):
         """Generates a master list of all journals, sorted by name."""
@@ -364,7 +457,7 @@ class SiteGenerator:
         
         journal_stats = {}
         for paper in papers:
-            journal_data = paper.get('db_journal')
+            journal_data = paper.db_journal
             if journal_data:
                 jid = journal_data['id']
                 if jid not in journal_stats:
@@ -381,10 +474,8 @@ class SiteGenerator:
 
         journals_list.sort(key=lambda x: x['name'].lower())
 
-        template = self.env.get_template("journals.html")
-        output = template.render(journals=journals_list)
         self.urls.append("/journals.html")
-        self._write_if_changed(PUBLIC_DIR / "journals.html", output)
+        self._render_page("journals.html", "journals.html", journals=journals_list)
     def _author_sort_key(self, name):
         """Returns a sort key for (Surname, Name) sorting."""
         parts = name.strip().split()
@@ -395,7 +486,8 @@ class SiteGenerator:
         # Last word as surname, rest as name
         return f"{parts[-1]}, {' '.join(parts[:-1])}".lower()
 
-    def _slugify(self, text):
+    @staticmethod
+    def _slugify(text):
         import re
         import unicodedata
         text = str(unicodedata.normalize('NFKD', text).encode('ascii', 'ignore').decode('ascii'))
@@ -414,6 +506,8 @@ class SiteGenerator:
         except Exception as e:
             logger.error(f"Error loading news data for RSS: {e}")
             return
+        if self._is_fresh("news.xml", self._hash(news_data)):
+            return
 
         rss_items = []
         base_url = SITE_URL
@@ -453,67 +547,57 @@ class SiteGenerator:
 '''
         self._write_if_changed(PUBLIC_DIR / "news.xml", rss_feed)
 
-    def _collect_papers(self, added_dates_map: dict) -> List[Dict]:
+    def _load_summary(self, year_dir: Path, md_file: Path) -> tuple[Dict, str, os.stat_result]:
+        """
+        Returns (metadata, content hash, stat) for a summary. Metadata comes from the JSON sidecar
+        written by the Synthesizer, or is scraped from the Markdown for summaries without one.
+        Files whose size and mtime match the manifest are not read at all; otherwise the content
+        hash decides whether the cached metadata can be reused.
+        """
+        key = f"{year_dir.name}/{md_file.name}"
+        stat = md_file.stat()
+        sidecar = sidecar_path(md_file)
+        sidecar_stat = sidecar.stat() if sidecar.exists() else None
+        signature = [stat.st_mtime_ns, stat.st_size]
+        if sidecar_stat:
+            signature += [sidecar_stat.st_mtime_ns, sidecar_stat.st_size]
+
+        cached = self.manifest["summaries"].get(key)
+        if cached and cached["signature"] == signature:
+            entry = cached
+        else:
+            raw_bytes = md_file.read_bytes()
+            sidecar_bytes = sidecar.read_bytes() if sidecar_stat else b""
+            content_hash = hashlib.sha1(raw_bytes + sidecar_bytes).hexdigest()
+            if cached and cached["hash"] == content_hash:
+                metadata = cached["metadata"]
+            else:
+                metadata = read_sidecar(md_file) or parse_markdown(md_file.name, raw_bytes.decode("utf-8"))
+            entry = {"hash": content_hash, "signature": signature, "metadata": metadata}
+        self.new_manifest["summaries"][key] = entry
+        return entry["metadata"], entry["hash"], stat
+
+    def _collect_papers(self, added_dates_map: dict) -> List["PaperRecord"]:
         papers = []
-        # Fetch added dates and journal URLs from DB
-        try:
-            added_dates_map = db.get_all_processed_dates()
-            # Use improved db helper
-            journal_db_urls = db.get_distinct_journal_urls()
-        except Exception as e:
-            logger.warning(f"Could not fetch metadata from DB: {e}")
-            added_dates_map = {}
-            journal_db_urls = {}
 
         # Walk through YYYY directories
         for year_dir in SUMMARIES_DIR.glob("*"):
             if not year_dir.is_dir(): continue
             
             for md_file in year_dir.glob("*.md"):
-                # 1. Parse metadata from content/file
-                with open(md_file, "r") as f:
-                    raw_content = f.read()
-                
-                # Default values
-                title = "Untitled"
-                paper_date_obj = None
-                author = "Unknown"
-                
-                # Parse Title (Assume first line is # Title)
-                lines = raw_content.split('\n')
-                if lines and lines[0].startswith('# '):
-                    title = lines[0][2:].strip()
+                # 1. Sidecar (or scraped) metadata, cached in the build manifest
+                metadata, source_hash, stat = self._load_summary(year_dir, md_file)
+                title = metadata['title']
+                original_link = metadata['original_link']
 
-                # DETERMINISTIC EXTRACTION (Identification Section)
-                import re
-                
-                # Extract original link from metadata comment (needed for DB lookups)
-                original_link = "#"
-                if "<!-- metadata:original_link:" in raw_content:
-                    try:
-                        part = raw_content.split("<!-- metadata:original_link:")[1]
-                        original_link = part.split(" -->")[0].strip()
-                    except IndexError:
-                        pass
-
-                # 1. Journal and Source URL (Now from DB if available)
+                # 2. Journal and Source URL (Now from DB if available)
                 db_journal = self.paper_journals_map.get(original_link)
                 if db_journal:
                     journal = db_journal['name']
                     source_url = db_journal['url']
                 else:
-                    journal = "Unknown"
-                    source_url = None
-                    match = re.search(r"-\s+\*\*Journal:\*\*\s+(.*)", raw_content)
-                    if match:
-                        val = match.group(1).strip()
-                        if val.startswith("[") and "](" in val:
-                            inner_match = re.search(r"\[(.*?)\]\((.*?)\)", val)
-                            if inner_match:
-                                journal = inner_match.group(1)
-                                source_url = inner_match.group(2)
-                        else:
-                            journal = val
+                    journal = metadata['journal'] or "Unknown"
+                    source_url = metadata['source_url']
 
                 # If source_url not in MD, check legacy DB mapping
                 if not source_url and original_link in self.paper_journal_links:
@@ -522,206 +606,110 @@ class SiteGenerator:
                 if journal != "Unknown" and source_url:
                     self.journal_url_map[journal] = source_url
 
-                # 2. Paper Date
-                match = re.search(r"-\s+\*\*Date:\*\*\s+(\d{4}-\d{2}-\d{2})", raw_content)
-                if match:
-                    try:
-                        paper_date_obj = datetime.strptime(match.group(1), "%Y-%m-%d")
-                    except ValueError:
-                        pass
-                
-                # 3. Filename Fallback for Date/Author
-                if not paper_date_obj and len(md_file.name) > 8 and md_file.name[:8].isdigit():
-                    try:
-                        date_str = md_file.name[:8]
-                        paper_date_obj = datetime.strptime(date_str, "%Y%m%d")
-                        author = md_file.name[9:-3]
-                    except ValueError:
-                        pass
-
-                # 4. Authors (Now from DB if available)
+                # 3. Authors (Now from DB if available)
                 db_authors = self.paper_authors_map.get(original_link, [])
                 
-                # Fallback to DOI lookup if link fails
-                if not db_authors and "https://doi.org/" in original_link:
-                    doi = original_link.replace("https://doi.org/", "")
-                
                 author = "Unknown"
                 # Check if we have a valid name in DB (not just an ID)
                 if db_authors and not (db_authors[0]['name'].startswith('A') and db_authors[0]['name'][1:].isdigit()):
                     author = db_authors[0]['name']
-                else:
-                    # Legacy fallback to Regex (used if DB is empty or only has the ID)
-                    match = re.search(r"-\s+\*\*Authors:\*\*\s+(.*)", raw_content)
-                    if match:
-                        authors_str = match.group(1).strip()
-                        # Use same splitting logic as _extract_authors
-                        if ';' in authors_str:
-                            parts = [a.strip() for a in re.split(r";| and ", authors_str) if a.strip()]
-                        else:
-                            parts = [p.strip() for p in re.split(r",| and ", authors_str) if p.strip()]
-                        author = parts[0] if parts else "Unknown"
+                elif metadata['authors']:
+                    # Fallback to the summary's own author list (used if DB is empty or only has the ID)
+                    author = metadata['authors'][0]
 
                 # Determine Added Date (for Sorting/RSS)
                 added_date_obj = added_dates_map.get(original_link)
                 if not added_date_obj:
-                    added_date_obj = datetime.fromtimestamp(md_file.stat().st_mtime)
+                    added_date_obj = datetime.fromtimestamp(stat.st_mtime)
 
-                # Fallback to Year from Identification (using Year-01-01)
-                if not paper_date_obj:
-                    match = re.search(r"-\s+\*\*Year:\*\*\s+(\d{4})", raw_content)
-                    if match:
-                        try:
-                            paper_date_obj = datetime.strptime(f"{match.group(1)}0101", "%Y%m%d")
-                        except ValueError:
-                            pass
-
-                # FINAL FALLBACK: Use DB added_date
+                # 4. Paper Date: Identification date, filename date, Year-01-01, then DB added_date
+                paper_date_obj = None
+                if metadata['date']:
+                    paper_date_obj = datetime.strptime(metadata['date'], "%Y-%m-%d")
+                elif metadata['year']:
+                    paper_date_obj = datetime.strptime(f"{metadata['year']}0101", "%Y%m%d")
                 if not paper_date_obj:
                     paper_date_obj = added_date_obj
 
-                # Parse Short Summary
-                preview = ""
-                clean_for_preview = raw_content
-                if "<!-- warning_start -->" in clean_for_preview:
-                    parts = clean_for_preview.split("<!-- warning_start -->")
-                    after_warning = parts[1].split("<!-- warning_end -->")
-                    if len(after_warning) > 1:
-                        clean_for_preview = parts[0] + after_warning[1]
-
-                if "## Short Summary" in clean_for_preview:
-                    try:
-                        excerpt_part = clean_for_preview.split("## Short Summary")[1].split("##")[0].strip()
-                        preview = excerpt_part
-                    except IndexError:
-                        pass
-                
-                if not preview:
-                    preview = ' '.join(lines[2:5]) + '...'
-
-                # Convert to HTML
-                html_content = markdown2.markdown(
-                    raw_content.replace("<!-- warning_start -->", "").replace("<!-- warning_end -->", ""),
-                    extras=["fenced-code-blocks"]
-                )
-                
-                rel_path = f"summaries/{year_dir.name}/{md_file.stem}.html"
-                
-                papers.append({
-                    'title': title,
-                    'author': author,
-                    'journal': journal,
-                    'source_url': source_url,
-                    'date': paper_date_obj.strftime("%Y-%m-%d"),
-                    'date_obj': paper_date_obj,
-                    'added_date_obj': added_date_obj,
-                    'preview': preview,
-                    'db_authors': db_authors,
-                    'db_journal': db_journal,
-                    'first_author_id': db_authors[0]['id'] if db_authors else self._slugify(author),
-                    'content': html_content,
-                    'raw_content': raw_content,
-                    'rel_path': rel_path,
-                    'original_link': original_link,
-                    'year': year_dir.name,
-                    'month': paper_date_obj.strftime("%B"),
-                    'filename': md_file.stem
-                })
+                papers.append(PaperRecord(
+                    title=title,
+                    author=author,
+                    journal=journal,
+                    date_obj=paper_date_obj,
+                    added_date_obj=added_date_obj,
+                    preview=metadata['preview'],
+                    doi=metadata.get('doi'),
+                    db_authors=db_authors,
+                    db_journal=db_journal,
+                    md_authors=self._extract_authors(metadata['authors'], author),
+                    first_author_id=db_authors[0]['id'] if db_authors else self._slugify(author),
+                    source_hash=source_hash,
+                    original_link=original_link,
+                    year=year_dir.name,
+                    filename=md_file.stem
+                ))
         return papers
 
-    def _render_paper(self, paper):
-        template = self.env.get_template("paper.html")
-        summary_link = f"{SITE_URL}/{paper['rel_path']}"
+    def _paper_job(self, paper):
+        """Returns the render job for a paper page, or None if the page is unchanged since the last build."""
+        self.urls.append(f"/{paper.rel_path}")
 
-        # Post-process content to make authors clickable
-        content_html = paper['content']
-        import re
-        authors_match = re.search(r"<li><strong>Authors:</strong>\s*(.*?)</li>", content_html)
-        if authors_match:
-            original_authors_html = authors_match.group(1)
-
-            # Use the robust extraction method from DB if available
-            authors_data = paper.get('db_authors', [])
-            
-            if authors_data:
-                linked_authors_list = []
-                extracted_names = self._extract_authors(paper)
-                
-                for idx, auth in enumerate(authors_data):
-                    aid = auth['id']
-                    name = auth['name']
-                    
-                    # If the name is just the ID (fallback in DB), try to get it from Markdown by position
-                    if name == aid:
-                        if extracted_names and idx < len(extracted_names):
-                            name = extracted_names[idx]
-                    
-                    # Last resort: if it's still an ID, just use the ID as name without ID link
-                    if name.startswith('A') and name[1:].isdigit():
-                        linked_authors_list.append(name)
-                    else:
-                        linked_authors_list.append(f'<a href="/authors/{aid}.html">{name}</a>')
-
-                linked_authors_html = ", ".join(linked_authors_list)
-
-                # Replace in HTML (only the metadata line to avoid linking names in title/text)
-                new_authors_line = authors_match.group(0).replace(original_authors_html, linked_authors_html)
-                content_html = content_html.replace(authors_match.group(0), new_authors_line)
-
-        # Post-process journal name to be clickable
-        journal_match = re.search(r"<li><strong>Journal:</strong>\s*(.*?)</li>", content_html)
-        if journal_match:
-            original_journal_html = journal_match.group(1).strip()
-            db_journal = paper.get('db_journal')
-            
-            # Decide on the display name for the journal
-            journal_display_name = original_journal_html
-            if db_journal and db_journal['name'] and not (db_journal['name'].startswith('S') and db_journal['name'][1:].isdigit()):
-                journal_display_name = db_journal['name']
-
-            if db_journal:
-                jid = db_journal['id']
-                linked_journal_html = f'<a href="/journals/{jid}.html">{journal_display_name}</a>'
-                # Replace only the metadata line
-                new_journal_line = journal_match.group(0).replace(original_journal_html, linked_journal_html)
-                content_html = content_html.replace(journal_match.group(0), new_journal_line)
-            elif not original_journal_html.startswith("<a"):
-                url = self.journal_url_map.get(original_journal_html)
-                if url:
-                    linked_journal_html = f'<a href="{url}" target="_blank" rel="noopener noreferrer">{original_journal_html}</a>'
-                    # Replace only the metadata line
-                    new_journal_line = journal_match.group(0).replace(original_journal_html, linked_journal_html)
-                    content_html = content_html.replace(journal_match.group(0), new_journal_line)
-
-        output = template.render(
-            title=paper['title'],
-            content=content_html,
-            original_link=paper['original_link'],
-            summary_link=summary_link
+        # A paper page only depends on its Markdown and the DB metadata used to link it
+        key = self._hash(
+            paper.source_hash, paper.db_authors, paper.db_journal,
+            self.journal_url_map.get(paper.journal), paper.title, paper.original_link
         )
-        
-        out_dir = PUBLIC_DIR / "summaries" / paper['year']
-        out_dir.mkdir(parents=True, exist_ok=True)
-        
-        out_path = out_dir / f"{paper['filename']}.html"
-        self.urls.append(f"/{paper['rel_path']}")
-        self._write_if_changed(out_path, output)
+        if self._is_fresh(paper.rel_path, key):
+            return None
+
+        return {
+            'title': paper.title,
+            'original_link': paper.original_link,
+            'rel_path': paper.rel_path,
+            'md_path': str(paper.md_path),
+            'out_path': str(PUBLIC_DIR / paper.rel_path),
+            'db_authors': paper.db_authors,
+            'db_journal': paper.db_journal,
+            'md_authors': paper.md_authors,
+        }
+
+    def _render_papers(self, papers):
+        """
+        Renders the paper pages whose inputs changed. With jobs > 1 the markdown conversion and
+        templating run in a process pool; results are consumed in input order so the build is
+        deterministic regardless of the number of workers.
+        """
+        if self.jobs <= 1:
+            # One page at a time: its Markdown and HTML are dropped before the next one is read
+            _init_paper_worker(self.journal_url_map)
+            for paper in papers:
+                job = self._paper_job(paper)
+                if job:
+                    _render_paper_job(job)
+            return
+
+        jobs = [job for job in (self._paper_job(paper) for paper in papers) if job]
+        if not jobs:
+            return
+
+        workers = min(self.jobs, len(jobs))
+        logger.info(f"Rendering {len(jobs)} paper pages with {workers} processes...")
+        chunksize = max(1, len(jobs) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_paper_worker, initargs=(self.journal_url_map,)) as pool:
+            for _ in pool.map(_render_paper_job, jobs, chunksize=chunksize):
+                pass
 
     def _render_index(self, papers):
-        template = self.env.get_template("index.html")
-        output = template.render(
-            papers=papers
-        )
         self.urls.append("/")
-        self._write_if_changed(PUBLIC_DIR / "index.html", output)
+        self._render_page("index.html", "index.html", papers=papers)
 
     def _render_archive(self, papers):
         # Group by Year -> Month
         archive = {}
         for paper in papers:
-            y = paper['year']
-            m = paper['month']
-            month_num = paper['date_obj'].strftime("%m")
+            y = paper.year
+            m = paper.month
+            month_num = paper.date_obj.strftime("%m")
             
             if y not in archive: archive[y] = {}
             if m not in archive[y]: 
@@ -732,37 +720,26 @@ class SiteGenerator:
             archive[y][m]['papers'].append(paper)
             
         # Render main archive page
-        template = self.env.get_template("archive.html")
-        output = template.render(
-            archive=archive
-        )
         self.urls.append("/archive.html")
-        self._write_if_changed(PUBLIC_DIR / "archive.html", output)
+        self._render_page("archive.html", "archive.html", archive=archive)
             
         # Render individual monthly pages
-        month_template = self.env.get_template("month.html")
         for year, months in archive.items():
-            year_dir = PUBLIC_DIR / "archive" / year
-            year_dir.mkdir(parents=True, exist_ok=True)
-            
             for month_name, data in months.items():
                 # Sort papers in the month by date descending
-                data['papers'].sort(key=lambda x: x['date_obj'], reverse=True)
+                data['papers'].sort(key=lambda x: x.date_obj, reverse=True)
                 
-                output = month_template.render(
+                self.urls.append(f"/archive/{year}/{data['month_num']}.html")
+                self._render_page(
+                    f"archive/{year}/{data['month_num']}.html", "month.html",
                     year=year,
                     month=month_name,
                     papers=data['papers']
                 )
-                month_path = year_dir / f"{data['month_num']}.html"
-                self.urls.append(f"/archive/{year}/{data['month_num']}.html")
-                self._write_if_changed(month_path, output)
 
     def _render_about(self):
-        template = self.env.get_template("about.html")
-        output = template.render()
         self.urls.append("/about.html")
-        self._write_if_changed(PUBLIC_DIR / "about.html", output)
+        self._render_page("about.html", "about.html")
 
     def _render_news(self):
         news_file = Path("data/news.json")
@@ -774,12 +751,8 @@ class SiteGenerator:
             except Exception as e:
                 logger.error(f"Error loading news data: {e}")
         
-        template = self.env.get_template("news.html")
-        output = template.render(
-            news=news_data
-        )
         self.urls.append("/news.html")
-        self._write_if_changed(PUBLIC_DIR / "news.html", output)
+        self._render_page("news.html", "news.html", news=news_data)
 
     def _render_filter_page(self):
         """Generates a page showing recent filtering results for audit (last 7 days)."""
@@ -801,13 +774,8 @@ class SiteGenerator:
                 'date': p['date']
             })
 
-        template = self.env.get_template("filter.html")
-        output = template.render(
-            papers=processed_entries,
-            system_prompt=system_prompt
-        )
         self.urls.append("/filter.html")
-        self._write_if_changed(PUBLIC_DIR / "filter.html", output)
+        self._render_page("filter.html", "filter.html", papers=processed_entries, system_prompt=system_prompt)
 
     def _render_stats(self, papers: List[Dict]):
         from collections import Counter
@@ -815,7 +783,7 @@ class SiteGenerator:
         # 1. Top 10 Journals (Now by ID)
         journal_stats = {}
         for paper in papers:
-            journal_data = paper.get('db_journal')
+            journal_data = paper.db_journal
             if journal_data:
                 jid = journal_data['id']
                 if jid not in journal_stats:
@@ -835,7 +803,7 @@ class SiteGenerator:
         # 2. Top 10 Authors
         author_stats = {} # id -> {name, count}
         for paper in papers:
-            authors_data = paper.get('db_authors', [])
+            authors_data = paper.db_authors
             
             if authors_data:
                 for auth in authors_data:
@@ -844,7 +812,7 @@ class SiteGenerator:
                     
                     # If the name is just the ID (fallback in DB), try to get it from Markdown
                     if name == aid:
-                        extracted_names = self._extract_authors(paper)
+                        extracted_names = paper.md_authors
                         if extracted_names:
                             name = extracted_names[0]
 
@@ -867,33 +835,34 @@ class SiteGenerator:
         top_authors = sorted(authors_list, key=lambda x: x['count'], reverse=True)[:10]
         
         # 3. Articles per Year
-        years = [paper['date_obj'].year for paper in papers]
+        years = [paper.date_obj.year for paper in papers]
         articles_per_year = sorted(Counter(years).items(), reverse=True)
         
-        template = self.env.get_template("stats.html")
-        output = template.render(
+        self.urls.append("/stats.html")
+        self._render_page(
+            "stats.html", "stats.html",
             top_journals=top_journals,
             top_authors=top_authors,
             articles_per_year=articles_per_year
         )
-        self.urls.append("/stats.html")
-        self._write_if_changed(PUBLIC_DIR / "stats.html", output)
 
     def _generate_rss(self, papers):
         # Basic RSS 2.0 generation
+        if self._is_fresh("feed.xml", self._hash([(p.filename, p.year, p.title, p.preview, p.added_date_obj) for p in papers])):
+            return
         rss_items = []
         base_url = SITE_URL
         for paper in papers:
             # Clean title for XML: unescape HTML entities (like &ndash;) then escape for XML
-            clean_title = html.escape(html.unescape(paper['title']))
+            clean_title = html.escape(html.unescape(paper.title))
             
             item = f"""
             <item>
                 <title>{clean_title}</title>
-                <link>{base_url}/summaries/{paper['year']}/{paper['filename']}.html</link>
-                <description><![CDATA[{paper['preview']}]]></description>
-                <pubDate>{paper['added_date_obj'].strftime("%a, %d %b %Y %H:%M:%S +0000")}</pubDate>
-                <guid>{paper['filename']}</guid>
+                <link>{base_url}/summaries/{paper.year}/{paper.filename}.html</link>
+                <description><![CDATA[{paper.preview}]]></description>
+                <pubDate>{paper.added_date_obj.strftime("%a, %d %b %Y %H:%M:%S +0000")}</pubDate>
+                <guid>{paper.filename}</guid>
             </item>
             """
             rss_items.append(item)
@@ -914,6 +883,8 @@ class SiteGenerator:
     def _generate_events_rss(self):
         """Generates a hidden events RSS feed for system monitoring."""
         events = db.get_recent_events(limit=100)
+        if self._is_fresh("events.xml", self._hash(events)):
+            return
         rss_items = []
         for event in events:
             # Parse timestamp (SQLite format)
@@ -948,3 +919,97 @@ class SiteGenerator:
 </rss>
 '''
         self._write_if_changed(PUBLIC_DIR / "events.xml", rss_feed)
+
+# Per-process state for paper rendering, set up by _init_paper_worker in each pool worker
+_worker_env = None
+_worker_journal_urls = {}
+
+def _create_environment() -> Environment:
+    env = Environment(loader=FileSystemLoader(TEMPLATES_DIR))
+    env.filters['slugify'] = SiteGenerator._slugify
+    return env
+
+def _init_paper_worker(journal_url_map: dict):
+    global _worker_env, _worker_journal_urls
+    _worker_env = _create_environment()
+    _worker_journal_urls = journal_url_map
+
+def _render_paper_job(job: dict):
+    """
+    Converts one summary to its HTML page and writes it. Module-level so it can run in a
+    process pool; the job only holds plain data and absolute paths.
+    """
+    import re
+    raw_content = Path(job['md_path']).read_text()
+
+    # Convert to HTML
+    content_html = markdown2.markdown(
+        raw_content.replace("<!-- warning_start -->", "").replace("<!-- warning_end -->", ""),
+        extras=["fenced-code-blocks"]
+    )
+
+    # Post-process content to make authors clickable
+    authors_match = re.search(r"<li><strong>Authors:</strong>\s*(.*?)</li>", content_html)
+    if authors_match:
+        original_authors_html = authors_match.group(1)
+
+        # Use the robust extraction method from DB if available
+        authors_data = job['db_authors']
+
+        if authors_data:
+            linked_authors_list = []
+            extracted_names = job['md_authors']
+
+            for idx, auth in enumerate(authors_data):
+                aid = auth['id']
+                name = auth['name']
+
+                # If the name is just the ID (fallback in DB), try to get it from Markdown by position
+                if name == aid:
+                    if extracted_names and idx < len(extracted_names):
+                        name = extracted_names[idx]
+
+                # Last resort: if it's still an ID, just use the ID as name without ID link
+                if name.startswith('A') and name[1:].isdigit():
+                    linked_authors_list.append(name)
+                else:
+                    linked_authors_list.append(f'<a href="/authors/{aid}.html">{name}</a>')
+
+            linked_authors_html = ", ".join(linked_authors_list)
+
+            # Replace in HTML (only the metadata line to avoid linking names in title/text)
+            new_authors_line = authors_match.group(0).replace(original_authors_html, linked_authors_html)
+            content_html = content_html.replace(authors_match.group(0), new_authors_line)
+
+    # Post-process journal name to be clickable
+    journal_match = re.search(r"<li><strong>Journal:</strong>\s*(.*?)</li>", content_html)
+    if journal_match:
+        original_journal_html = journal_match.group(1).strip()
+        db_journal = job['db_journal']
+
+        # Decide on the display name for the journal
+        journal_display_name = original_journal_html
+        if db_journal and db_journal['name'] and not (db_journal['name'].startswith('S') and db_journal['name'][1:].isdigit()):
+            journal_display_name = db_journal['name']
+
+        if db_journal:
+            jid = db_journal['id']
+            linked_journal_html = f'<a href="/journals/{jid}.html">{journal_display_name}</a>'
+            # Replace only the metadata line
+            new_journal_line = journal_match.group(0).replace(original_journal_html, linked_journal_html)
+            content_html = content_html.replace(journal_match.group(0), new_journal_line)
+        elif not original_journal_html.startswith("<a"):
+            url = _worker_journal_urls.get(original_journal_html)
+            if url:
+                linked_journal_html = f'<a href="{url}" target="_blank" rel="noopener noreferrer">{original_journal_html}</a>'
+                # Replace only the metadata line
+                new_journal_line = journal_match.group(0).replace(original_journal_html, linked_journal_html)
+                content_html = content_html.replace(journal_match.group(0), new_journal_line)
+
+    output = _worker_env.get_template("paper.html").render(
+        title=job['title'],
+        content=content_html,
+        original_link=job['original_link'],
+        summary_link=f"{SITE_URL}/{job['rel_path']}"
+    )
+    SiteGenerator._write_if_changed(Path(job['out_path']), output)
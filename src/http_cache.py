@@ -0,0 +1,198 @@
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from contextlib import contextmanager
+from pathlib import Path
+from urllib.parse import urlparse
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from src.config import HTTP_CACHE_MAX_MB, HTTP_CACHE_PATH, HTTP_CACHE_TTL_DAYS
+from src.http_client import HttpClient, http_client
+from src.logger import logger
+
+# Response headers kept with a cached body (validators for revalidation, and the body's type)
+STORED_HEADERS = ("Content-Type", "ETag", "Last-Modified")
+# After exceeding max_bytes, least recently used entries are evicted down to this share of it
+EVICT_TO_SHARE = 0.9
+
+class HttpCache:
+    """
+    On-disk cache (SQLite) of GET responses from API endpoints whose data rarely changes:
+    OpenAlex sources and authors, DOI -> work ID lookups.
+
+    A fresh entry is served without a request. An expired one is revalidated with
+    If-None-Match / If-Modified-Since when the server sent an ETag or Last-Modified (a 304
+    renews it without a body), otherwise fetched again. If the request fails, the expired
+    entry is served. Only 200 responses are stored; bodies are zlib-compressed and the least
+    recently used entries are evicted once the cache exceeds max_bytes.
+
+    :param path: SQLite file of the cache (created on first use).
+    :param ttls: Freshness in days per endpoint type, i.e. the first path segment of the URL
+                 ("sources", "authors", "works"); other endpoints use the "default" entry.
+    :param max_bytes: Size limit of the stored (compressed) bodies.
+    :param http: HTTP client used for the requests.
+    """
+    def __init__(self, path: Path = HTTP_CACHE_PATH, ttls: dict = HTTP_CACHE_TTL_DAYS,
+                 max_bytes: int = HTTP_CACHE_MAX_MB * 1024 * 1024, http: HttpClient = None):
+        self.path = Path(path)
+        self.ttls = ttls
+        self.max_bytes = max_bytes
+        self.http = http or http_client
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._initialized = False
+
+    def get(self, url: str, params: dict = None, ttl_days: float = None, rate_limiter=None, **kwargs) -> requests.Response:
+        """
+        GET through the cache. Returns a requests.Response (rebuilt from the cache on a hit).
+
+        :param ttl_days: Freshness of this response, instead of the endpoint type's default.
+        :param rate_limiter: Waited on only when a request is actually sent.
+        """
+        request_url = requests.Request("GET", url, params=params).prepare().url
+        # The API key does not change the answer and is not written to disk
+        key = requests.Request("GET", url, params={k: v for k, v in (params or {}).items() if k != "api_key"}).prepare().url
+        entry = self._load(key)
+        now = time.time()
+        if entry and entry["expires_at"] > now:
+            self._count("hits")
+            self._touch(key, now)
+            return self._response(key, entry)
+
+        headers = dict(kwargs.pop("headers", None) or {})
+        if entry and entry["headers"].get("ETag"):
+            headers["If-None-Match"] = entry["headers"]["ETag"]
+        if entry and entry["headers"].get("Last-Modified"):
+            headers["If-Modified-Since"] = entry["headers"]["Last-Modified"]
+        try:
+            if rate_limiter:
+                rate_limiter.wait()
+            response = self.http.get(request_url, headers=headers, **kwargs)
+        except requests.exceptions.RequestException as e:
+            if not entry:
+                raise
+            logger.warning(f"Request failed ({e}). Serving the expired cached response of {key}.")
+            self._count("hits")
+            return self._response(key, entry)
+
+        expires_at = now + 86400 * (ttl_days if ttl_days is not None else self._ttl_days(key))
+        if response.status_code == 304 and entry:
+            self._count("revalidated")
+            self._renew(key, expires_at, now)
+            return self._response(key, entry)
+
+        self._count("misses")
+        if response.status_code == 200:
+            self._store(key, response, expires_at, now)
+        return response
+
+    def log_stats(self):
+        """Logs how many lookups the cache answered."""
+        total = self.hits + self.revalidated + self.misses
+        if total:
+            logger.info(f"HTTP cache: {self.hits}/{total} lookups served from disk, {self.revalidated} revalidated (304), {self.misses} fetched.")
+
+    def clear(self):
+        with self._conn() as conn:
+            conn.execute("DELETE FROM responses")
+
+    def _ttl_days(self, url: str) -> float:
+        segment = urlparse(url).path.strip("/").split("/")[0]
+        return self.ttls.get(segment, self.ttls.get("default", 1))
+
+    def _count(self, name: str):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    @contextmanager
+    def _conn(self):
+        """A new connection per call (threads never share one), committed and closed on exit."""
+        conn = self._connect()
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30)
+        # The table is created on first use, so importing the module creates no file
+        if not self._initialized:
+            with self._lock:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS responses (
+                        url TEXT PRIMARY KEY,
+                        headers TEXT NOT NULL,
+                        body BLOB NOT NULL,
+                        size INTEGER NOT NULL,
+                        fetched_at REAL NOT NULL,
+                        expires_at REAL NOT NULL,
+                        last_used REAL NOT NULL
+                    )
+                """)
+                conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_last_used ON responses (last_used)")
+                conn.commit()
+                self._initialized = True
+        return conn
+
+    def _load(self, key: str) -> dict:
+        with self._conn() as conn:
+            row = conn.execute("SELECT headers, body, expires_at FROM responses WHERE url = ?", (key,)).fetchone()
+        if not row:
+            return None
+        return {"headers": json.loads(row[0]), "body": row[1], "expires_at": row[2]}
+
+    def _touch(self, key: str, now: float):
+        with self._conn() as conn:
+            conn.execute("UPDATE responses SET last_used = ? WHERE url = ?", (now, key))
+
+    def _renew(self, key: str, expires_at: float, now: float):
+        with self._conn() as conn:
+            conn.execute("UPDATE responses SET expires_at = ?, last_used = ? WHERE url = ?", (expires_at, now, key))
+
+    def _store(self, key: str, response: requests.Response, expires_at: float, now: float):
+        headers = {name: response.headers[name] for name in STORED_HEADERS if name in response.headers}
+        body = zlib.compress(response.content)
+        with self._conn() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (url, headers, body, size, fetched_at, expires_at, last_used) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, json.dumps(headers), body, len(body), now, expires_at, now)
+            )
+            total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+            if total > self.max_bytes:
+                self._evict(conn, total - int(self.max_bytes * EVICT_TO_SHARE))
+
+    @staticmethod
+    def _evict(conn: sqlite3.Connection, excess: int):
+        """Deletes the least recently used entries until `excess` bytes are freed."""
+        freed = 0
+        doomed = []
+        for url, size in conn.execute("SELECT url, size FROM responses ORDER BY last_used"):
+            if freed >= excess:
+                break
+            doomed.append((url,))
+            freed += size
+        conn.executemany("DELETE FROM responses WHERE url = ?", doomed)
+        logger.info(f"HTTP cache: evicted {len(doomed)} least recently used responses ({freed / 1024:.0f} KB).")
+
+    @staticmethod
+    def _response(url: str, entry: dict) -> requests.Response:
+        response = requests.Response()
+        response.status_code = 200
+        response.url = url
+        response.headers = CaseInsensitiveDict(entry["headers"])
+        response.encoding = get_encoding_from_headers(response.headers) or "utf-8"
+        response._content = zlib.decompress(entry["body"])
+        return response
+
+# Shared by Discovery and the maintenance scripts
+openalex_cache = HttpCache()
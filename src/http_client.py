@@ -0,0 +1,63 @@
+import requests
+from requests.adapters import HTTPAdapter
+from src.config import HTTP_POOL_CONNECTIONS, HTTP_POOL_MAXSIZE, HTTP_TIMEOUT
+from src.logger import logger
+
+class HttpClient:
+    """
+    Shared HTTP layer for all outbound calls (OpenAlex, Unpaywall, CORE, Elsevier, publishers, Ollama).
+
+    A single requests.Session keeps one keep-alive connection pool per host, so consecutive
+    requests to the same host reuse the TCP+TLS connection instead of handshaking again.
+
+    :param pool_connections: Number of per-host pools kept alive at once.
+    :param pool_maxsize: Maximum connections kept per host (should cover concurrent workers).
+    :param timeout: Default timeout in seconds when the caller does not pass one.
+    """
+    def __init__(self, pool_connections: int = HTTP_POOL_CONNECTIONS, pool_maxsize: int = HTTP_POOL_MAXSIZE, timeout: float = HTTP_TIMEOUT):
+        self.timeout = timeout
+        self.adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+        self.session = requests.Session()
+        self.session.mount("http://", self.adapter)
+        self.session.mount("https://", self.adapter)
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        kwargs.setdefault("timeout", self.timeout)
+        return self.session.request(method, url, **kwargs)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def stats(self) -> dict:
+        """Returns host -> {connections, requests, reused} for the pools currently alive."""
+        results = {}
+        pools = self.adapter.poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            host = pool.host
+            entry = results.setdefault(host, {"connections": 0, "requests": 0, "reused": 0})
+            entry["connections"] += pool.num_connections
+            entry["requests"] += pool.num_requests
+            entry["reused"] += max(0, pool.num_requests - pool.num_connections)
+        return results
+
+    def log_stats(self):
+        """Logs connection reuse per host, i.e. the TLS handshakes saved by pooling."""
+        stats = self.stats()
+        if not stats:
+            return
+        total_requests = sum(s["requests"] for s in stats.values())
+        total_reused = sum(s["reused"] for s in stats.values())
+        logger.info(f"HTTP pool: {total_requests} requests, {total_reused} served over reused connections.")
+        for host, s in sorted(stats.items(), key=lambda item: item[1]["requests"], reverse=True):
+            logger.info(f"  {host}: {s['requests']} requests over {s['connections']} connections ({s['reused']} reused)")
+
+    def close(self):
+        self.session.close()
+
+http_client = HttpClient()
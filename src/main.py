@@ -4,9 +4,12 @@ from src.config import REMOTE_HOST, REMOTE_USER, REMOTE_PATH, PUBLIC_DIR, SUMMAR
 from src.discovery import Discovery
 from src.filter import RelevanceFilter
 from src.extractor import Extractor
-from src.synthesizer import Synthesizer
+from src.pipeline import PaperPipeline, SYNTHESIZED, NO_TEXT, IRRELEVANT, FAILED
 from src.generator import SiteGenerator
 from src.db import db
+from src.gemini_client import gemini_client
+from src.http_cache import openalex_cache
+from src.http_client import http_client
 from src.logger import logger
 
 def deploy():
@@ -37,11 +40,110 @@ def deploy():
     except subprocess.CalledProcessError as e:
         logger.error(f"Deployment failed: {e}")
 
+def promote_sources():
+    """Starts monitoring the journals and authors that reached the relevance threshold."""
+    # Journal Promotion Logic
+    promotable_journals = db.get_promotable_journals(threshold=5)
+    if promotable_journals:
+        # Get existing journal IDs from config to avoid double monitoring
+        from src.config import DISCOVERY_TASKS
+        existing_journal_ids = []
+        for task in DISCOVERY_TASKS:
+            if task['type'] == "journal":
+                existing_journal_ids.extend(task['id'].split('|'))
+        
+        for source_id in promotable_journals:
+            if source_id not in existing_journal_ids:
+                db.add_monitored_journal(source_id)
+                msg = f"Journal {source_id} reached relevance threshold and is now being automatically monitored."
+                logger.info(msg)
+                db.add_event("PROMOTION", msg)
+
+    # Author Promotion Logic
+    promotable_authors = db.get_promotable_authors(threshold=5)
+    if promotable_authors:
+        # Get existing author IDs from config to avoid double monitoring
+        from src.config import DISCOVERY_TASKS
+        existing_author_ids = []
+        for task in DISCOVERY_TASKS:
+            if task['type'] in ["author", "author_citations"]:
+                existing_author_ids.append(task['id'])
+        
+        for author_id in promotable_authors:
+            if author_id not in existing_author_ids:
+                db.add_monitored_author(author_id)
+                msg = f"Author {author_id} reached relevance threshold and is now being automatically monitored."
+                logger.info(msg)
+                db.add_event("PROMOTION", msg)
+
+def select_engine() -> str:
+    """Synthesis engine to start with: SYNTHESIS_ENGINE, or local Ollama once the monthly budget is spent."""
+    from src.config import MAX_MONTHLY_COST, SYNTHESIS_ENGINE
+    current_monthly_cost = db.get_monthly_cost()
+    if current_monthly_cost >= MAX_MONTHLY_COST:
+        logger.warning(f"Monthly budget exceeded ({current_monthly_cost:.2f}€ >= {MAX_MONTHLY_COST:.2f}€). Switching to local Ollama synthesis.")
+        return "ollama"
+    return SYNTHESIS_ENGINE
+
+def process_papers(pipeline: PaperPipeline, papers, backfill_mode: bool = False, check_disk: bool = True) -> dict:
+    """
+    Runs papers through the pipeline and records the outcomes in the DB.
+
+    :param backfill_mode: Set processed_date to the publication date (keeps historical papers out of the RSS feed).
+    :param check_disk: Skip (and mark as seen) papers whose summary already exists on disk.
+    :return: Counts of the papers: discovered, relevant, synthesized, no_text, failed.
+    """
+    counts = {"discovered": 0, "relevant": 0, "synthesized": 0, "no_text": 0, "failed": 0}
+
+    def not_on_disk(papers):
+        """PHYSICAL DISK CHECK: Avoid processing if file exists in any year folder"""
+        year_dirs = list(SUMMARIES_DIR.glob("*"))
+        for paper in papers:
+            counts["discovered"] += 1
+            if not check_disk:
+                yield paper
+                continue
+            filename = paper.to_filename()
+            exists_locally = False
+            for year_dir in year_dirs:
+                if (year_dir / filename).exists():
+                    logger.info(f"Skipping {paper.title}: already exists on disk at {year_dir / filename}")
+                    # Sync DB with reality
+                    p_date = paper.published.strftime("%Y-%m-%d %H:%M:%S") if backfill_mode else None
+                    db.add_seen(paper.link, paper.title, paper.doi, paper.source_id, paper.author_ids, processed_date=p_date, type=paper.type, source_url=paper.source_url, is_relevant=True, relevance_reason="Recovered from existing summary on disk.", authors_data=paper.authors_data, h_index=paper.journal_h_index, impact_factor=paper.journal_impact)
+                    exists_locally = True
+                    break
+            if not exists_locally:
+                yield paper
+
+    for paper, outcome in pipeline.run(not_on_disk(papers)):
+        if paper.is_relevant:
+            counts["relevant"] += 1
+
+        p_date = paper.published.strftime("%Y-%m-%d %H:%M:%S") if backfill_mode else None
+        if outcome == SYNTHESIZED:
+            counts["synthesized"] += 1
+            # Mark as seen in DB only after successful processing
+            db.add_seen(paper.link, paper.title, paper.doi, paper.source_id, paper.author_ids, processed_date=p_date, type=paper.type, source_url=paper.source_url, is_relevant=True, relevance_reason=paper.relevance_reason, authors_data=paper.authors_data, h_index=paper.journal_h_index, impact_factor=paper.journal_impact)
+        elif outcome == NO_TEXT:
+            counts["no_text"] += 1
+            msg = f"Skipping synthesis for {paper.title} due to missing text."
+            logger.warning(msg)
+            db.add_event("WARNING", msg)
+        elif outcome == FAILED:
+            counts["failed"] += 1
+        elif outcome == IRRELEVANT:
+            # Mark irrelevant papers as seen too, so we don't re-check them
+            db.add_seen(paper.link, paper.title, paper.doi, paper.source_id, paper.author_ids, processed_date=p_date, type=paper.type, source_url=paper.source_url, is_relevant=paper.is_relevant, relevance_reason=paper.relevance_reason, authors_data=paper.authors_data, h_index=paper.journal_h_index, impact_factor=paper.journal_impact)
+    return counts
+
 def main():
     parser = argparse.ArgumentParser(description="BiblioAssistant Pipeline (https://github.com/bitic/biblioassistant/)")
     parser.add_argument("--deploy", action="store_true", help="Deploy to remote server after generation")
     parser.add_argument("--force-all", action="store_true", help="Ignore 'seen' DB (use with caution)")
     parser.add_argument("--generate-only", action="store_true", help="Skip fetch/filter/synthesize and only generate the site")
+    parser.add_argument("--full-rebuild", action="store_true", help="Ignore the build manifest and re-render every page")
+    parser.add_argument("--jobs", type=int, default=1, help="Processes used to render paper pages during site generation")
     parser.add_argument("--add-doi", type=str, help="Manually add a single paper by DOI")
     parser.add_argument("--backfill", type=int, help="Number of days to go back for discovery (overrides last run date)")
     parser.add_argument("--to-date", type=str, help="End date for discovery (YYYY-MM-DD)")
@@ -50,8 +152,8 @@ def main():
 
     if args.generate_only:
         logger.info("Skipping fetch/filter/synthesis. Running generator only.")
-        generator = SiteGenerator()
-        generator.build()
+        generator = SiteGenerator(jobs=args.jobs)
+        generator.build(full_rebuild=args.full_rebuild)
         if args.deploy:
             deploy()
         return
@@ -65,10 +167,10 @@ def main():
         from_date_override = (datetime.now() - timedelta(days=args.backfill)).strftime("%Y-%m-%d")
         logger.info(f"Backfill requested: {args.backfill} days (Starting from {from_date_override})")
 
-    discovery = Discovery(from_date=from_date_override, to_date=args.to_date)
+    # Normal runs query each task incrementally from its watermark; explicit windows query all of them
+    discovery = Discovery(from_date=from_date_override, to_date=args.to_date, incremental=not args.force_all and not args.add_doi)
     relevance_filter = RelevanceFilter()
     extractor = Extractor()
-    synthesizer = Synthesizer()
 
     # 1. Fetch & Discover
     papers = []
@@ -88,130 +190,44 @@ def main():
             db.add_event("ERROR", msg)
             return
     else:
-        papers = discovery.run_all_tasks(ignore_seen=args.force_all)
+        # Streamed: filtering and downloads start while later result pages are still arriving.
+        # Every page is checked against seen_papers as it is parsed.
+        papers = discovery.iter_all_tasks()
     
-    if not papers:
-        logger.info("No new papers found.")
-    
-    total_discovered = len(papers)
-    relevant_count = 0
-    processed_count = 0
     start_cost = db.get_monthly_cost()
 
-    from src.config import MAX_MONTHLY_COST, SYNTHESIS_ENGINE
-    current_monthly_cost = start_cost
-    
-    # Check budget before starting
-    active_engine = SYNTHESIS_ENGINE
-    if current_monthly_cost >= MAX_MONTHLY_COST:
-        logger.warning(f"Monthly budget exceeded ({current_monthly_cost:.2f}€ >= {MAX_MONTHLY_COST:.2f}€). Switching to local Ollama synthesis.")
-        active_engine = "ollama"
+    # 2-4. Filter -> Extract -> Synthesize, pipelined (outcomes come back in discovery order)
+    pipeline = PaperPipeline(relevance_filter, extractor, select_engine(), skip_filter=bool(args.add_doi), oa_lookup=discovery.fetch_oa_locations)
+    counts = process_papers(pipeline, papers, backfill_mode=args.backfill_mode, check_disk=not (args.force_all or args.add_doi))
 
-    for paper in papers:
-        # 2. Filter
-        # Check if already seen unless --force-all or --add-doi is used
-        if not args.force_all and not args.add_doi:
-            if db.is_seen(paper.link, paper.doi):
-                continue
-            
-            # PHYSICAL DISK CHECK: Avoid processing if file exists in any year folder
-            filename = paper.to_filename()
-            exists_locally = False
-            for year_dir in SUMMARIES_DIR.glob("*"):
-                if (year_dir / filename).exists():
-                    logger.info(f"Skipping {paper.title}: already exists on disk at {year_dir / filename}")
-                    # Sync DB with reality
-                    p_date = paper.published.strftime("%Y-%m-%d %H:%M:%S") if args.backfill_mode else None
-                    db.add_seen(paper.link, paper.title, paper.doi, paper.source_id, paper.author_ids, processed_date=p_date, type=paper.type, source_url=paper.source_url, is_relevant=True, relevance_reason="Recovered from existing summary on disk.", authors_data=paper.authors_data, h_index=paper.journal_h_index, impact_factor=paper.journal_impact)
-                    exists_locally = True
-                    break
-            if exists_locally:
-                continue
-
-        # Skip filter if manually added or if it passes relevance
-        if args.add_doi or relevance_filter.check_relevance(paper):
-            relevant_count += 1
-            
-            # Check budget during run (if using paid API)
-            if active_engine == "gemini-api" and db.get_monthly_cost() >= MAX_MONTHLY_COST:
-                msg = f"Monthly budget reached during run ({db.get_monthly_cost():.2f}€). Switching to local synthesis for remaining papers."
-                logger.warning(msg)
-                db.add_event("BUDGET_WARNING", msg)
-                active_engine = "ollama"
-
-            # 3. Extract
-            full_text, is_full_text = extractor.process(paper)
-            
-            if full_text:
-                # 4. Synthesize
-                # Temporarily override engine if budget exceeded
-                original_engine = synthesizer.engine
-                synthesizer.engine = active_engine
-                
-                if synthesizer.synthesize(paper, full_text, is_full_text):
-                    processed_count += 1
-                    # Mark as seen in DB only after successful processing
-                    p_date = paper.published.strftime("%Y-%m-%d %H:%M:%S") if args.backfill_mode else None
-                    db.add_seen(paper.link, paper.title, paper.doi, paper.source_id, paper.author_ids, processed_date=p_date, type=paper.type, source_url=paper.source_url, is_relevant=True, relevance_reason=paper.relevance_reason, authors_data=paper.authors_data, h_index=paper.journal_h_index, impact_factor=paper.journal_impact)
-                
-                synthesizer.engine = original_engine
-            else:
-                msg = f"Skipping synthesis for {paper.title} due to missing text."
-                logger.warning(msg)
-                db.add_event("WARNING", msg)
-        else:
-            # Mark irrelevant papers as seen too, so we don't re-check them
-            p_date = paper.published.strftime("%Y-%m-%d %H:%M:%S") if args.backfill_mode else None
-            db.add_seen(paper.link, paper.title, paper.doi, paper.source_id, paper.author_ids, processed_date=p_date, type=paper.type, source_url=paper.source_url, is_relevant=paper.is_relevant, relevance_reason=paper.relevance_reason, authors_data=paper.authors_data, h_index=paper.journal_h_index, impact_factor=paper.journal_impact)
+    if not counts["discovered"]:
+        logger.info("No new papers found.")
     end_cost = db.get_monthly_cost()
     run_cost = end_cost - start_cost
     
-    msg = f"Pipeline finished. Found {total_discovered} papers, {relevant_count} were relevant, {processed_count} successfully synthesized. Run cost: {run_cost:.4f}€. Monthly total: {end_cost:.2f}€."
+    msg = f"Pipeline finished. Found {counts['discovered']} papers, {counts['relevant']} were relevant, {counts['synthesized']} successfully synthesized. Run cost: {run_cost:.4f}€. Monthly total: {end_cost:.2f}€."
     logger.info(msg)
     db.add_event("SUMMARY", msg)
+    relevance_filter.record_run_stats()
+    discovery.log_stats()
+    openalex_cache.log_stats()
+    http_client.log_stats()
+    gemini_client.close()
 
-    # 5. Journal Promotion Logic
-    promotable_journals = db.get_promotable_journals(threshold=5)
-    if promotable_journals:
-        # Get existing journal IDs from config to avoid double monitoring
-        from src.config import DISCOVERY_TASKS
-        existing_journal_ids = []
-        for task in DISCOVERY_TASKS:
-            if task['type'] == "journal":
-                existing_journal_ids.extend(task['id'].split('|'))
-        
-        for source_id in promotable_journals:
-            if source_id not in existing_journal_ids:
-                db.add_monitored_journal(source_id)
-                msg = f"Journal {source_id} reached relevance threshold and is now being automatically monitored."
-                logger.info(msg)
-                db.add_event("PROMOTION", msg)
-
-    # 6. Author Promotion Logic
-    promotable_authors = db.get_promotable_authors(threshold=5)
-    if promotable_authors:
-        # Get existing author IDs from config to avoid double monitoring
-        from src.config import DISCOVERY_TASKS
-        existing_author_ids = []
-        for task in DISCOVERY_TASKS:
-            if task['type'] in ["author", "author_citations"]:
-                existing_author_ids.append(task['id'])
-        
-        for author_id in promotable_authors:
-            if author_id not in existing_author_ids:
-                db.add_monitored_author(author_id)
-                msg = f"Author {author_id} reached relevance threshold and is now being automatically monitored."
-                logger.info(msg)
-                db.add_event("PROMOTION", msg)
+    # 5-6. Journal and Author Promotion Logic
+    promote_sources()
 
     # 7. Update Last Run Date (only for normal runs)
     if not args.backfill and not args.add_doi and not args.to_date:
         db.update_last_run_date()
         logger.info("Updated last run date in database.")
+        # Failed papers and papers without text are not marked as seen: keep the watermarks far
+        # enough back to find them again (an abstract or open-access PDF may appear meanwhile)
+        discovery.save_watermarks(retry_papers=counts["failed"] + counts["no_text"] > 0)
 
     # 8. Generate Site
-    generator = SiteGenerator()
-    generator.build()
+    generator = SiteGenerator(jobs=args.jobs)
+    generator.build(full_rebuild=args.full_rebuild)
 
     # 9. Deploy (Optional)
     if args.deploy:
@@ -16,6 +16,7 @@ class Paper:
     authors_data: dict = field(default_factory=dict) # OpenAlex ID -> Official Name
     doi: Optional[str] = None
     pdf_link: Optional[str] = None
+    oa_pdf_urls: Optional[List[str]] = None # Open-access PDF URLs known to OpenAlex (None: not looked up)
     type: Optional[str] = None # e.g., 'article', 'preprint', 'book'
     topics: List[str] = field(default_factory=list) # OpenAlex Topics/Concepts
     
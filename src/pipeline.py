@@ -0,0 +1,221 @@
+"""
+Staged processing of the papers of a run: relevance filter -> PDF download -> text
+extraction -> synthesis. Each stage has its own worker threads and bounded queues sit
+between stages, so downloads proceed while the LLM is generating (and the other way
+round) without piling up extracted texts in memory.
+
+Outcomes are handed back in input order, so the caller's DB writes (add_seen) happen in
+the same order, and under the same conditions, as with a sequential loop.
+"""
+import queue
+import threading
+from contextlib import nullcontext
+from itertools import islice
+from typing import Callable, Iterable, Iterator
+
+from src.config import MAX_MONTHLY_COST, PIPELINE_DOWNLOAD_WORKERS, PIPELINE_EXTRACT_WORKERS, PIPELINE_QUEUE_SIZE, SYNTHESIS_WORKERS
+from src.db import db
+from src.extractor import Extractor
+from src.filter import RelevanceFilter
+from src.logger import logger
+from src.models import Paper
+from src.synthesizer import Synthesizer
+
+# Outcome of each paper
+IRRELEVANT = "irrelevant"
+SYNTHESIZED = "synthesized"
+NO_TEXT = "no_text"  # Neither full text nor an abstract to synthesize from
+FAILED = "failed"    # Synthesis (or a stage) failed; the paper is retried next run
+
+_STOP = object()
+
+def engine_slots() -> dict:
+    """Synthesis concurrency per engine (SYNTHESIS_WORKERS), as semaphores."""
+    return {name: threading.Semaphore(max(1, n)) for name, n in SYNTHESIS_WORKERS.items()}
+
+class _Stage:
+    """
+    Worker threads applying `handle(*item)` to the items of a bounded inbox.
+    When the last worker stops, the downstream stage (`next`) is closed in turn.
+    """
+    def __init__(self, name: str, handle: Callable, workers: int, queue_size: int, on_error: Callable):
+        self.name = name
+        self.handle = handle
+        self.workers = max(1, workers)
+        self.on_error = on_error
+        self.inbox = queue.Queue(maxsize=queue_size)
+        self.next = None
+        self._running = self.workers
+        self._lock = threading.Lock()
+
+    def start(self):
+        for i in range(self.workers):
+            threading.Thread(target=self._work, name=f"{self.name}-{i}", daemon=True).start()
+
+    def close(self):
+        for _ in range(self.workers):
+            self.inbox.put(_STOP)
+
+    def _work(self):
+        while True:
+            item = self.inbox.get()
+            if item is _STOP:
+                break
+            try:
+                self.handle(*item)
+            except Exception as e:
+                # Every item must produce an outcome, otherwise the in-order results would stall
+                self.on_error(item[0], item[1], f"{self.name} stage error: {e}")
+
+        with self._lock:
+            self._running -= 1
+            last = self._running == 0
+        if last and self.next:
+            self.next.close()
+
+class PaperPipeline:
+    """
+    Runs papers through filter -> download -> extract -> synthesize.
+
+    :param engine: Synthesis engine at the start of the run. Like the sequential loop, it
+                   switches to local Ollama for the remaining papers once MAX_MONTHLY_COST is
+                   reached (checked before every synthesis).
+    :param skip_filter: Do not check relevance (papers added manually are already relevant).
+    :param oa_lookup: Called with the relevant papers of each filter batch before they are
+                      downloaded, to fill in missing open-access PDF URLs in bulk
+                      (Discovery.fetch_oa_locations).
+    :param slots: Synthesis slots per engine (engine_slots()). Pipelines running at the same
+                  time (backfill windows) share one set, so together they stay within
+                  SYNTHESIS_WORKERS; by default each pipeline has its own.
+    """
+    def __init__(self, relevance_filter: RelevanceFilter, extractor: Extractor, engine: str,
+                 skip_filter: bool = False, synthesizer_factory: Callable[[], Synthesizer] = Synthesizer,
+                 download_workers: int = PIPELINE_DOWNLOAD_WORKERS, extract_workers: int = PIPELINE_EXTRACT_WORKERS,
+                 queue_size: int = PIPELINE_QUEUE_SIZE, oa_lookup: Callable[[list[Paper]], None] = None,
+                 slots: dict = None):
+        self.relevance_filter = relevance_filter
+        self.extractor = extractor
+        self.active_engine = engine
+        self.skip_filter = skip_filter
+        self.synthesizer_factory = synthesizer_factory
+        self.oa_lookup = oa_lookup
+        self._engine_lock = threading.Lock()
+        # The pool is sized for the starting engine; after a budget switch the slots keep
+        # each engine within its own concurrency
+        self._engine_slots = slots if slots is not None else engine_slots()
+        self._local = threading.local()
+        self._results = queue.Queue()
+        self._total = None  # Number of papers, known once the input is exhausted
+        self._input_error = None  # Raised by the input iterator; re-raised by run()
+
+        self._download = _Stage("download", self._download_one, download_workers, queue_size, self._fail)
+        self._extract = _Stage("extract", self._extract_one, extract_workers, queue_size, self._fail)
+        self._synthesize = _Stage("synthesize", self._synthesize_one, SYNTHESIS_WORKERS.get(engine, 1), queue_size, self._fail)
+        self._download.next = self._extract
+        self._extract.next = self._synthesize
+
+    def run(self, papers: Iterable[Paper]) -> Iterator[tuple[Paper, str]]:
+        """
+        Yields (paper, outcome) for every paper, in input order, as soon as it and all earlier
+        papers are done. papers may be a stream (Discovery.iter_all_tasks): it is consumed one
+        relevance batch at a time while the earlier papers are being processed. If papers
+        raises, the papers taken before the error are still processed and the error is
+        re-raised once their outcomes have been yielded.
+        """
+        for stage in (self._download, self._extract, self._synthesize):
+            stage.start()
+        feeder = threading.Thread(target=self._filter_all, args=(papers,), name="filter", daemon=True)
+        feeder.start()
+
+        done = {}
+        next_seq = 0
+        while self._total is None or next_seq < self._total:
+            seq, paper, outcome = self._results.get()
+            if seq is _STOP:
+                continue  # The input is exhausted and self._total is set
+            done[seq] = (paper, outcome)
+            while next_seq in done:
+                yield done.pop(next_seq)
+                next_seq += 1
+        feeder.join()
+        if self._input_error is not None:
+            raise self._input_error
+
+    def _fail(self, seq: int, paper: Paper, msg: str):
+        logger.error(f"{msg} ({paper.title})")
+        db.add_event("ERROR", msg)
+        self._results.put((seq, paper, FAILED))
+
+    def _filter_all(self, papers: Iterable[Paper]):
+        """Filter stage: classifies one relevance batch at a time so downloads start after the first batch."""
+        size = max(1, self.relevance_filter.batch_size)
+        stream = iter(papers)
+        start = 0
+        try:
+            while True:
+                chunk = []
+                try:
+                    for paper in islice(stream, size):
+                        chunk.append((start + len(chunk), paper))
+                except Exception as e:
+                    # Stop reading, but give the papers already taken an outcome
+                    logger.error(f"Pipeline input failed: {e}")
+                    self._input_error = e
+                if not chunk:
+                    break
+                start += len(chunk)
+                if not self.skip_filter:
+                    try:
+                        self.relevance_filter.check_relevance_batch([paper for _, paper in chunk])
+                    except Exception as e:
+                        for seq, paper in chunk:
+                            self._fail(seq, paper, f"filter stage error: {e}")
+                        continue
+                relevant = [(seq, paper) for seq, paper in chunk if self.skip_filter or paper.is_relevant]
+                if relevant and self.oa_lookup:
+                    try:
+                        self.oa_lookup([paper for _, paper in relevant])
+                    except Exception as e:
+                        # Only an optimization: the download falls back to the per-DOI lookups
+                        logger.warning(f"Open-access location lookup failed: {e}")
+                for seq, paper in chunk:
+                    if self.skip_filter or paper.is_relevant:
+                        self._download.inbox.put((seq, paper))
+                    else:
+                        self._results.put((seq, paper, IRRELEVANT))
+                if self._input_error is not None:
+                    break
+        finally:
+            self._total = start
+            self._results.put((_STOP, None, None))
+            self._download.close()
+
+    def _download_one(self, seq: int, paper: Paper):
+        self._extract.inbox.put((seq, paper, self.extractor.download(paper)))
+
+    def _extract_one(self, seq: int, paper: Paper, pdf_path):
+        full_text, is_full_text = self.extractor.extract(paper, pdf_path)
+        if not full_text:
+            self._results.put((seq, paper, NO_TEXT))
+            return
+        self._synthesize.inbox.put((seq, paper, full_text, is_full_text))
+
+    def _synthesize_one(self, seq: int, paper: Paper, full_text: str, is_full_text: bool):
+        with self._engine_lock:
+            # Check budget during run (if using paid API)
+            if self.active_engine == "gemini-api" and db.get_monthly_cost() >= MAX_MONTHLY_COST:
+                msg = f"Monthly budget reached during run ({db.get_monthly_cost():.2f}€). Switching to local synthesis for remaining papers."
+                logger.warning(msg)
+                db.add_event("BUDGET_WARNING", msg)
+                self.active_engine = "ollama"
+            engine = self.active_engine
+
+        # One Synthesizer per worker thread, since the engine is set per paper
+        synthesizer = getattr(self._local, "synthesizer", None)
+        if synthesizer is None:
+            synthesizer = self._local.synthesizer = self.synthesizer_factory()
+        synthesizer.engine = engine
+
+        with self._engine_slots.get(engine) or nullcontext():
+            ok = synthesizer.synthesize(paper, full_text, is_full_text)
+        self._results.put((seq, paper, SYNTHESIZED if ok else FAILED))
@@ -0,0 +1,130 @@
+import json
+import re
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Bump when the sidecar fields change; older sidecars are ignored and the Markdown is parsed instead
+SIDECAR_VERSION = 1
+
+def sidecar_path(md_path: Path) -> Path:
+    """Structured metadata of a summary lives next to it: YYYY/<stem>.md -> YYYY/<stem>.json"""
+    return Path(md_path).with_suffix(".json")
+
+def write_sidecar(md_path: Path, metadata: Dict):
+    """Writes the metadata sidecar of a summary (atomically, so the generator never reads a partial file)."""
+    path = sidecar_path(md_path)
+    tmp_path = path.with_suffix(".json.tmp")
+    tmp_path.write_text(json.dumps({"version": SIDECAR_VERSION, **metadata}, ensure_ascii=False, indent=1))
+    tmp_path.replace(path)
+
+def read_sidecar(md_path: Path) -> Optional[Dict]:
+    """Returns the sidecar metadata of a summary, or None if it is missing, unreadable or outdated."""
+    try:
+        metadata = json.loads(sidecar_path(md_path).read_text())
+    except (OSError, ValueError):
+        return None
+    if metadata.get("version") != SIDECAR_VERSION:
+        return None
+    return metadata
+
+def split_authors(authors_str: str) -> List[str]:
+    """Splits an 'Authors' line: semicolons take precedence, otherwise commas (and ' and ')."""
+    if ';' in authors_str:
+        return [a.strip() for a in re.split(r";| and ", authors_str) if a.strip()]
+    return [a.strip() for a in re.split(r",| and ", authors_str) if a.strip()]
+
+def extract_preview(raw_content: str) -> str:
+    """Returns the 'Short Summary' section (ignoring the abstract-only warning), or the first lines as a fallback."""
+    preview = ""
+    clean_for_preview = raw_content
+    if "<!-- warning_start -->" in clean_for_preview:
+        parts = clean_for_preview.split("<!-- warning_start -->")
+        after_warning = parts[1].split("<!-- warning_end -->")
+        if len(after_warning) > 1:
+            clean_for_preview = parts[0] + after_warning[1]
+
+    if "## Short Summary" in clean_for_preview:
+        try:
+            preview = clean_for_preview.split("## Short Summary")[1].split("##")[0].strip()
+        except IndexError:
+            pass
+
+    if not preview:
+        preview = ' '.join(raw_content.split('\n')[2:5]) + '...'
+    return preview
+
+def parse_markdown(filename: str, raw_content: str) -> Dict:
+    """
+    Legacy path: scrapes the sidecar fields from the Markdown of a summary (title line,
+    Identification section and the original_link metadata comment).
+    """
+    metadata = {
+        'title': "Untitled",
+        'original_link': "#",
+        'journal': None,
+        'source_url': None,
+        'date': None,
+        'year': None,
+        'authors': [],
+        'doi': None,
+        'preview': extract_preview(raw_content),
+    }
+
+    # Parse Title (Assume first line is # Title)
+    lines = raw_content.split('\n')
+    if lines and lines[0].startswith('# '):
+        metadata['title'] = lines[0][2:].strip()
+
+    # Extract original link from metadata comment (needed for DB lookups)
+    if "<!-- metadata:original_link:" in raw_content:
+        try:
+            part = raw_content.split("<!-- metadata:original_link:")[1]
+            metadata['original_link'] = part.split(" -->")[0].strip()
+        except IndexError:
+            pass
+
+    # Journal and Source URL
+    match = re.search(r"-\s+\*\*Journal:\*\*\s+(.*)", raw_content)
+    if match:
+        val = match.group(1).strip()
+        if val.startswith("[") and "](" in val:
+            inner_match = re.search(r"\[(.*?)\]\((.*?)\)", val)
+            if inner_match:
+                metadata['journal'] = inner_match.group(1)
+                metadata['source_url'] = inner_match.group(2)
+        else:
+            metadata['journal'] = val
+
+    # Paper Date
+    match = re.search(r"-\s+\*\*Date:\*\*\s+(\d{4}-\d{2}-\d{2})", raw_content)
+    if match:
+        try:
+            datetime.strptime(match.group(1), "%Y-%m-%d")
+            metadata['date'] = match.group(1)
+        except ValueError:
+            pass
+
+    # Filename Fallback for Date
+    if not metadata['date'] and len(filename) > 8 and filename[:8].isdigit():
+        try:
+            metadata['date'] = datetime.strptime(filename[:8], "%Y%m%d").strftime("%Y-%m-%d")
+        except ValueError:
+            pass
+
+    # Year from Identification (used as Year-01-01 if there is no full date)
+    match = re.search(r"-\s+\*\*Year:\*\*\s+(\d{4})", raw_content)
+    if match:
+        metadata['year'] = match.group(1)
+
+    # Authors
+    match = re.search(r"-\s+\*\*Authors:\*\*\s+(.*)", raw_content)
+    if match:
+        metadata['authors'] = split_authors(match.group(1).strip())
+
+    # DOI
+    match = re.search(r"-\s+\*\*DOI:\*\*\s+\[(.*?)\]", raw_content)
+    if match and match.group(1) != "None":
+        metadata['doi'] = match.group(1)
+
+    return metadata
@@ -2,11 +2,15 @@ import subprocess
 import requests
 import json
 from pathlib import Path
-from src.config import SUMMARIES_DIR, SYNTHESIS_ENGINE, OLLAMA_HOST, OLLAMA_MODEL, GEMINI_API_KEY, GEMINI_MODEL
+from src.config import SUMMARIES_DIR, SYNTHESIS_ENGINE, OLLAMA_HOST, OLLAMA_MODEL, GEMINI_API_KEY, GEMINI_MODEL, OLLAMA_SYNTHESIS_NUM_CTX, SYNTHESIS_OUTPUT_TOKENS, GEMINI_SYNTHESIS_TOKEN_BUDGET
 from src.models import Paper
 from src.db import db
+from src.gemini_client import GeminiClient, gemini_client
+from src.http_client import HttpClient, http_client
 from src.logger import logger
-from src.utils import retry
+from src.summaries import write_sidecar, extract_preview
+from src.text_reducer import fit_to_budget
+from src.utils import retry, estimate_tokens
 
 SYNTHESIS_PROMPT = """
 You are an expert scientific synthesizer. Your task is to generate an "Extended Card" for the provided scientific paper.
@@ -46,8 +50,10 @@ You are an expert scientific synthesizer. Your task is to generate an "Extended
 """
 
 class Synthesizer:
-    def __init__(self):
+    def __init__(self, http: HttpClient = None, gemini: GeminiClient = None):
         self.engine = SYNTHESIS_ENGINE
+        self.http = http or http_client
+        self.gemini = gemini or gemini_client
 
     def synthesize(self, paper: Paper, full_text: str, is_full_text: bool) -> bool:
         """
@@ -60,6 +66,12 @@ class Synthesizer:
         
         logger.info(f"Synthesizing summary for: {paper.title} using {self.engine}")
         
+        # Fit the text to the engine instead of letting the model truncate it silently
+        reduced_text = fit_to_budget(full_text, self._token_budget())
+        if len(reduced_text) < len(full_text):
+            logger.info(f"Trimmed paper text to the {self.engine} budget: {estimate_tokens(full_text)} -> {estimate_tokens(reduced_text)} tokens.")
+            full_text = reduced_text
+
         content = ""
         model_display = ""
         
@@ -116,6 +128,9 @@ class Synthesizer:
                 f.write(final_content)
                 # Append metadata for generator
                 f.write(f"\n\n<!-- metadata:original_link:{paper.link} -->")
+
+            # Structured metadata for the generator, so it does not have to scrape the Markdown
+            write_sidecar(save_path, self._summary_metadata(paper, title_line, final_content))
             
             paper.is_processed = True
             paper.summary_path = str(save_path)
@@ -125,6 +140,26 @@ class Synthesizer:
             logger.error(f"Error saving summary: {e}")
             return False
 
+    def _token_budget(self) -> int:
+        """Tokens of paper text the current engine can take."""
+        if self.engine == "ollama":
+            return OLLAMA_SYNTHESIS_NUM_CTX - estimate_tokens(SYNTHESIS_PROMPT) - SYNTHESIS_OUTPUT_TOKENS
+        return GEMINI_SYNTHESIS_TOKEN_BUDGET
+
+    def _summary_metadata(self, paper: Paper, title_line: str, final_content: str) -> dict:
+        """Fields of the JSON sidecar read by the SiteGenerator (see src/summaries.py)."""
+        return {
+            "title": title_line[2:].strip(),
+            "original_link": paper.link,
+            "journal": paper.source,
+            "source_url": paper.source_url,
+            "date": paper.published.strftime("%Y-%m-%d"),
+            "year": paper.published.strftime("%Y"),
+            "authors": paper.authors,
+            "doi": paper.doi,
+            "preview": extract_preview(final_content),
+        }
+
     def _generate_bibtex(self, paper: Paper) -> str:
         """Generates a BibTeX entry for the paper."""
         year = paper.published.strftime("%Y")
@@ -231,26 +266,20 @@ class Synthesizer:
             logger.error("GEMINI_API_KEY not found in environment.")
             return ""
             
+        # The fixed prompt is a (cached) system instruction; only the paper text is sent per request.
+        # API errors are left to @retry (transient ones are retried), then to synthesize()
+        response = self.gemini.generate(
+            GEMINI_MODEL,
+            SYNTHESIS_PROMPT,
+            f"PAPER TEXT:\n{full_text}",
+            temperature=0.2,
+        )
+
         try:
-            from google import genai
-            client = genai.Client(api_key=GEMINI_API_KEY)
-            
-            response = client.models.generate_content(
-                model=GEMINI_MODEL,
-                contents=f"{SYNTHESIS_PROMPT}\n\nPAPER TEXT:\n{full_text}",
-                config={
-                    "temperature": 0.2,
-                }
-            )
-            
             if response and response.text:
                 # Record usage
                 try:
-                    usage = response.usage_metadata
-                    # Costs for Gemini 1.5 Flash (approximate)
-                    # Input: $0.10 / 1M tokens, Output: $0.40 / 1M tokens
-                    cost = (usage.prompt_token_count * 0.10 / 1_000_000) + (usage.candidates_token_count * 0.40 / 1_000_000)
-                    db.add_usage(GEMINI_MODEL, usage.prompt_token_count, usage.candidates_token_count, cost)
+                    self.gemini.record_usage(response, GEMINI_MODEL)
                 except Exception as e:
                     logger.warning(f"Could not record usage: {e}")
 
@@ -270,13 +299,13 @@ class Synthesizer:
             "prompt": prompt,
             "stream": False,
             "options": {
-                "num_ctx": 12288, # Increased context for long papers
+                "num_ctx": OLLAMA_SYNTHESIS_NUM_CTX, # Paper text is trimmed to fit (see _token_budget)
                 "temperature": 0.3
             }
         }
 
         try:
-            response = requests.post(url, json=payload, timeout=900) # 15 min timeout for synthesis
+            response = self.http.post(url, json=payload, timeout=900) # 15 min timeout for synthesis
             response.raise_for_status()
             
             data = response.json()
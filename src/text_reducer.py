@@ -0,0 +1,136 @@
+"""
+Full-text reduction before synthesis.
+
+clean_pages() turns the page texts of a PDF into the body of the paper: running headers and
+footers and bare page numbers are removed, words hyphenated across line breaks are joined,
+and back matter (references, supplementary material, appendices) is dropped.
+Acknowledgements and funding statements are kept, since the summary card has a Funding section.
+
+fit_to_budget() then trims the result to the token budget of the synthesis engine, keeping
+the beginning (title, affiliations, introduction, methods) and the end (conclusions).
+"""
+import re
+from collections import Counter
+from src.logger import logger
+from src.utils import estimate_tokens
+
+# Lines inspected at the top and bottom of every page when looking for running headers/footers
+EDGE_LINES = 3
+# A normalized edge line repeated on this share of the pages (and at least 3) is a running header/footer
+RUNNING_LINE_MIN_SHARE = 0.5
+# Section headings are short lines; back matter is only looked for after this share of the text
+MAX_HEADING_CHARS = 80
+BACK_MATTER_START_SHARE = 0.3
+# Share of the budget kept from the beginning of the text when trimming (the rest comes from the end)
+HEAD_SHARE = 0.75
+TRIM_MARKER = "\n\n[... text omitted to fit the context window ...]\n\n"
+# Smallest budget trimmed to: a budget below it (e.g. a context window that leaves no room
+# after the prompt and the answer) is a misconfiguration, not a reason to send the whole text
+MIN_TOKEN_BUDGET = 1000
+
+_NUMBERING = r"(?-i:(?:\d+(?:\.\d+)*|[IVXLC]+|[A-Z])\.?\s+)?"
+_BACK_MATTER = (
+    r"(?:references(?: and notes)?|bibliography|literature cited|works cited|cited literature"
+    r"|supplementary (?:materials?|information|data|figures|tables)|supporting information"
+    r"|appendix(?:es)?|appendices)"
+)
+# Heading title: capitalized words, lowercase only for short function words in between
+_TITLE_WORD = r"[A-Z0-9][\w'’()/\-–]*"
+_TITLE = rf"(?-i:{_TITLE_WORD}(?:\s+(?:(?:a|an|and|at|by|for|from|in|of|on|or|the|to|vs|with)\s+)*{_TITLE_WORD})*)"
+DROP_HEADING = re.compile(
+    _NUMBERING + _BACK_MATTER
+    # Optional label ("Appendix B1", "Appendix S2") and title ("Appendix B: Model Derivation",
+    # "Appendix A. Supplementary data"), but not a wrapped line of prose ("Appendix A. The model is")
+    + r"(?:\s+(?-i:[A-Z]{1,2}\d{0,2}|\d{1,2}))?"
+    + rf"(?:\s*[:.\-–]\s*(?:{_BACK_MATTER}|{_TITLE})|[:.])?",
+    re.IGNORECASE,
+)
+KEEP_HEADING = re.compile(
+    _NUMBERING + r"(?:acknowledge?ments?|funding(?: information| sources)?|financial support)\s*:?",
+    re.IGNORECASE,
+)
+PAGE_NUMBER = re.compile(r"(?:page\s+)?\d{1,4}(?:\s*(?:/|of)\s*\d{1,4})?", re.IGNORECASE)
+
+def _normalize(line: str) -> str:
+    """Page-independent form of a line (digits vary between pages: page numbers, dates)."""
+    return re.sub(r"\d+", "#", " ".join(line.split()).lower())
+
+def _running_lines(pages: list[list[str]]) -> set[str]:
+    """Normalized lines that recur at the top or bottom of many pages."""
+    counts = Counter()
+    for lines in pages:
+        content = [l for l in lines if l.strip()]
+        edges = content[:EDGE_LINES] + content[-EDGE_LINES:]
+        counts.update({_normalize(l) for l in edges})
+    threshold = max(3, RUNNING_LINE_MIN_SHARE * len(pages))
+    return {line for line, count in counts.items() if count >= threshold and line.strip("# ")}
+
+def _strip_page_edges(lines: list[str], running: set[str]) -> list[str]:
+    """Removes running headers/footers and page numbers from the edges of a page."""
+    content = [i for i, l in enumerate(lines) if l.strip()]
+    edges = set(content[:EDGE_LINES] + content[-EDGE_LINES:])
+    return [
+        l for i, l in enumerate(lines)
+        if i not in edges or not (_normalize(l) in running or PAGE_NUMBER.fullmatch(l.strip()))
+    ]
+
+def _dehyphenate(text: str) -> str:
+    """Joins words split across line breaks ("hydro-\\nlogical" -> "hydrological"), keeping real compounds ("land-\\nUse")."""
+    return re.sub(r"(\w)-[ \t]*\n\s*([a-z])", r"\1\2", text)
+
+def _is_drop_heading(lines: list[str], i: int) -> bool:
+    """Whether line i is a back-matter heading on its own, not a line wrapped out of a sentence."""
+    if not DROP_HEADING.fullmatch(lines[i].strip()):
+        return False
+    previous = next((l.strip() for l in reversed(lines[:i]) if l.strip()), "")
+    following = next((l.strip() for l in lines[i + 1:] if l.strip()), "")
+    # "... as listed in the" / "References" / "of the basin ..." is running prose
+    return not (re.search(r"[a-z,\-]$", previous) or following[:1].islower())
+
+def _drop_back_matter(lines: list[str]) -> list[str]:
+    """Drops references/supplementary/appendix sections, up to the next acknowledgements/funding heading."""
+    first_candidate = int(len(lines) * BACK_MATTER_START_SHARE)
+    kept = []
+    dropping = False
+    for i, line in enumerate(lines):
+        heading = line.strip()
+        if i >= first_candidate and len(heading) <= MAX_HEADING_CHARS:
+            if KEEP_HEADING.fullmatch(heading):
+                dropping = False
+            elif _is_drop_heading(lines, i):
+                dropping = True
+        if not dropping:
+            kept.append(line)
+    return kept
+
+def clean_pages(pages: list[str]) -> str:
+    """Returns the cleaned, whitespace-normalized body text of a document given the text of each page."""
+    page_lines = [page.splitlines() for page in pages]
+    running = _running_lines(page_lines) if len(pages) >= 3 else set()
+    lines = []
+    for page in page_lines:
+        lines.extend(_strip_page_edges(page, running))
+    lines = _dehyphenate("\n".join(lines)).split("\n")
+    body = _drop_back_matter(lines)
+    return " ".join(" ".join(body).split())
+
+def fit_to_budget(text: str, max_tokens: int) -> str:
+    """Trims text to about max_tokens, keeping its beginning and end and cutting at sentence boundaries."""
+    if max_tokens < MIN_TOKEN_BUDGET:
+        logger.warning(f"Token budget of {max_tokens} is below {MIN_TOKEN_BUDGET}; check OLLAMA_SYNTHESIS_NUM_CTX, SYNTHESIS_OUTPUT_TOKENS and GEMINI_SYNTHESIS_TOKEN_BUDGET. Trimming to {MIN_TOKEN_BUDGET}.")
+        max_tokens = MIN_TOKEN_BUDGET
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    max_chars = max_tokens * 4 - len(TRIM_MARKER)
+    head_chars = int(max_chars * HEAD_SHARE)
+    tail_chars = max_chars - head_chars
+
+    head = text[:head_chars]
+    cut = head.rfind(". ")
+    if cut > head_chars * 0.9:
+        head = head[:cut + 1]
+    tail = text[-tail_chars:] if tail_chars > 0 else ""
+    cut = tail.find(". ")
+    if 0 <= cut < tail_chars * 0.1:
+        tail = tail[cut + 2:]
+    return head + TRIM_MARKER + tail
@@ -1,5 +1,6 @@
 import time
 import functools
+import threading
 from src.logger import logger
 
 def retry(exceptions, tries=3, delay=1, backoff=2, logger_obj=logger):
@@ -40,3 +41,31 @@ def retry(exceptions, tries=3, delay=1, backoff=2, logger_obj=logger):
             return func(*args, **kwargs)
         return wrapper
     return decorator
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token), good enough to size prompts and batches."""
+    return len(text) // 4 + 1
+
+class RateLimiter:
+    """
+    Thread-safe limiter that spaces calls to at most `rate` per second,
+    shared by every thread that calls wait().
+    
+    :param rate: Maximum calls per second (0 or less disables limiting).
+    """
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def wait(self):
+        """Blocks until the caller is allowed to issue its next request."""
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)